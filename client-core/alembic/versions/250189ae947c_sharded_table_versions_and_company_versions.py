@@ -0,0 +1,158 @@
+"""Shard table_versions and add per-company profile versions
+
+Revision ID: 250189ae947c
+Revises: 355d2f89db48
+Create Date: 2026-10-18 20:41:07.512398
+
+``table_versions`` had one row per table, so every writer to companies,
+projects or blogs held the same row lock until commit. Each table now has
+up to 16 shard rows picked by ``pg_backend_pid() % 16``; readers sum them.
+
+Profile validators used max(updated_at) over the company's children, which
+a delete never moves forward, so If-Modified-Since could answer 304 after a
+project or blog was removed. ``company_versions`` keeps a counter and a
+modified_at per company instead. Statement-level triggers with transition
+tables bump it once per statement for every company the statement touched,
+deletes included. Rows are locked in company_id order so two multi-company
+statements cannot deadlock on them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '250189ae947c'
+down_revision: Union[str, Sequence[str], None] = '355d2f89db48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SHARDS = 16
+COMPANY_CHILD_TABLES = ['clients', 'services', 'projects', 'blogs']
+# A trigger with transition tables can only fire on one event
+EVENTS = {
+    'INSERT': 'REFERENCING NEW TABLE AS new_rows',
+    'UPDATE': 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'table_versions',
+        sa.Column('shard', sa.SmallInteger(), server_default='0', nullable=False),
+        schema='public',
+    )
+    op.execute("ALTER TABLE public.table_versions DROP CONSTRAINT table_versions_pkey")
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['table_name', 'shard'], schema='public')
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION public.bump_table_version()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO public.table_versions (table_name, shard, version, modified_at)
+            VALUES (TG_TABLE_NAME, pg_backend_pid() % {SHARDS}, 1, clock_timestamp())
+            ON CONFLICT (table_name, shard) DO UPDATE
+            SET version = public.table_versions.version + 1, modified_at = excluded.modified_at;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+
+    op.create_table(
+        'company_versions',
+        sa.Column('company_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('modified_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('company_id'),
+        schema='public',
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.bump_company_versions()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        DECLARE
+            touched uuid[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(DISTINCT company_id) INTO touched FROM new_rows WHERE company_id IS NOT NULL;
+            ELSIF TG_OP = 'UPDATE' THEN
+                SELECT array_agg(DISTINCT company_id) INTO touched
+                FROM (SELECT company_id FROM old_rows UNION SELECT company_id FROM new_rows) AS moved
+                WHERE company_id IS NOT NULL;
+            ELSE
+                SELECT array_agg(DISTINCT company_id) INTO touched FROM old_rows WHERE company_id IS NOT NULL;
+            END IF;
+            IF touched IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_TABLE_NAME = 'companies' AND TG_OP = 'DELETE' THEN
+                DELETE FROM public.company_versions WHERE company_id = ANY (touched);
+            ELSIF TG_TABLE_NAME = 'companies' AND TG_OP = 'INSERT' THEN
+                INSERT INTO public.company_versions (company_id, version, modified_at)
+                SELECT company_id, 1, clock_timestamp() FROM unnest(touched) AS company_id ORDER BY company_id
+                ON CONFLICT (company_id) DO NOTHING;
+            ELSE
+                -- Children of a company deleted in the same statement have no row left to bump
+                PERFORM 1 FROM public.company_versions
+                WHERE company_id = ANY (touched) ORDER BY company_id FOR UPDATE;
+                UPDATE public.company_versions
+                SET version = version + 1, modified_at = clock_timestamp()
+                WHERE company_id = ANY (touched);
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        "INSERT INTO public.company_versions (company_id, version, modified_at) "
+        "SELECT company_id, 1, now() FROM public.companies"
+    )
+    for table in ['companies', *COMPANY_CHILD_TABLES]:
+        for event, referencing in EVENTS.items():
+            op.execute(
+                f"CREATE TRIGGER trg_{table}_company_version_{event.lower()} "
+                f"AFTER {event} ON public.{table} {referencing} "
+                "FOR EACH STATEMENT EXECUTE FUNCTION public.bump_company_versions()"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ['companies', *COMPANY_CHILD_TABLES]:
+        for event in EVENTS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_company_version_{event.lower()} ON public.{table}")
+    op.execute("DROP FUNCTION IF EXISTS public.bump_company_versions()")
+    op.drop_table('company_versions', schema='public')
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.bump_table_version()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE public.table_versions
+            SET version = version + 1, modified_at = clock_timestamp()
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    # Fold the shards into shard 0, the row each table had before, so versions never go backwards
+    op.execute(
+        "UPDATE public.table_versions AS shard_row SET version = total.version, modified_at = total.modified_at "
+        "FROM (SELECT table_name, sum(version) AS version, max(modified_at) AS modified_at "
+        "FROM public.table_versions GROUP BY table_name) AS total "
+        "WHERE shard_row.table_name = total.table_name AND shard_row.shard = 0"
+    )
+    op.execute("DELETE FROM public.table_versions WHERE shard <> 0")
+    op.execute("ALTER TABLE public.table_versions DROP CONSTRAINT table_versions_pkey")
+    op.create_primary_key('table_versions_pkey', 'table_versions', ['table_name'], schema='public')
+    op.drop_column('table_versions', 'shard', schema='public')
@@ -0,0 +1,73 @@
+"""NOT NULL keyset sort columns and the remaining descending keyset indexes
+
+Revision ID: 355d2f89db48
+Revises: d9a23c3b183b
+Create Date: 2026-10-18 19:12:40.218734
+
+A nullable sort column needs an ``OR sort IS NULL`` branch in the keyset
+predicate, which rules out an index range scan. The sort columns all have
+a now() default, so any NULLs are filled from updated_at and the columns
+become NOT NULL. Each one is validated through a NOT VALID check
+constraint first, so SET NOT NULL does not scan the table under an ACCESS
+EXCLUSIVE lock.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '355d2f89db48'
+down_revision: Union[str, Sequence[str], None] = 'd9a23c3b183b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SORT_COLUMNS = [
+    ('companies', 'created_at'),
+    ('projects', 'created_at'),
+    ('blogs', 'created_at'),
+    ('notifications', 'notification_timestamp'),
+]
+
+INDEXES = [
+    (
+        'ix_public_companies_company_name_desc_company_id',
+        'companies',
+        'company_name DESC NULLS LAST, company_id DESC',
+    ),
+    (
+        'ix_public_notifications_to_timestamp_desc_id',
+        'notifications',
+        'notification_to, notification_timestamp DESC NULLS LAST, notification_id DESC',
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in SORT_COLUMNS:
+        constraint = f'ck_{table}_{column}_not_null'
+        op.execute(
+            f"UPDATE public.{table} SET {column} = coalesce(updated_at, now()) WHERE {column} IS NULL"
+        )
+        op.execute(
+            f"ALTER TABLE public.{table} ADD CONSTRAINT {constraint} CHECK ({column} IS NOT NULL) NOT VALID"
+        )
+        # VALIDATE takes SHARE UPDATE EXCLUSIVE, so writes continue while it scans
+        op.execute(f"ALTER TABLE public.{table} VALIDATE CONSTRAINT {constraint}")
+        op.execute(f"ALTER TABLE public.{table} ALTER COLUMN {column} SET NOT NULL")
+        op.execute(f"ALTER TABLE public.{table} DROP CONSTRAINT {constraint}")
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON public.{table} ({columns})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{name}")
+    for table, column in reversed(SORT_COLUMNS):
+        op.execute(f"ALTER TABLE public.{table} ALTER COLUMN {column} DROP NOT NULL")
@@ -0,0 +1,38 @@
+"""Add otp_codes table
+
+Revision ID: 3908a6e8e63b
+Revises: 2b7ebe0a0e95
+Create Date: 2026-10-18 09:12:41.208316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3908a6e8e63b'
+down_revision: Union[str, Sequence[str], None] = '2b7ebe0a0e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('otp_codes',
+    sa.Column('subject', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('otp_digest', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('subject'),
+    schema='public'
+    )
+    op.create_index(op.f('ix_public_otp_codes_expires_at'), 'otp_codes', ['expires_at'], unique=False, schema='public')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_public_otp_codes_expires_at'), table_name='otp_codes', schema='public')
+    op.drop_table('otp_codes', schema='public')
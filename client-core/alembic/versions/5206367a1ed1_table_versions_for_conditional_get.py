@@ -0,0 +1,82 @@
+"""Table write versions and per-company indexes for conditional GET
+
+Revision ID: 5206367a1ed1
+Revises: fbb29a85dcf8
+Create Date: 2026-10-18 16:58:41.730952
+
+Public list endpoints derive their ETag from ``table_versions``. A
+statement-level trigger bumps the row for companies, projects or blogs on
+every INSERT, UPDATE, DELETE or TRUNCATE, so a revalidation costs one
+primary-key read. The bump takes that table's version row lock until
+commit, which serializes writers to the same table. That is acceptable at
+the write rates these tables see.
+
+Profile ETags use per-company (count, max updated_at) over clients,
+services, projects and blogs, served by the new (company_id, updated_at)
+indexes.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5206367a1ed1'
+down_revision: Union[str, Sequence[str], None] = 'fbb29a85dcf8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+VERSIONED_TABLES = ['companies', 'projects', 'blogs']
+COMPANY_CHILD_TABLES = ['clients', 'services', 'projects', 'blogs']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'table_versions',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.Column('modified_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('table_name'),
+        schema='public',
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.bump_table_version()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE public.table_versions
+            SET version = version + 1, modified_at = clock_timestamp()
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO public.table_versions (table_name) VALUES ('{table}')")
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON public.{table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION public.bump_table_version()"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in COMPANY_CHILD_TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_public_{table}_company_id_updated_at "
+                f"ON public.{table} (company_id, updated_at)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in COMPANY_CHILD_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.ix_public_{table}_company_id_updated_at")
+    for table in VERSIONED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_version ON public.{table}")
+    op.execute("DROP FUNCTION IF EXISTS public.bump_table_version()")
+    op.drop_table('table_versions', schema='public')
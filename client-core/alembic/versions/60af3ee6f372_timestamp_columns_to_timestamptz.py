@@ -0,0 +1,192 @@
+"""Convert string timestamp columns to timestamptz
+
+Revision ID: 60af3ee6f372
+Revises: 6dd0a3c7ae61
+Create Date: 2026-10-18 11:26:08.913542
+
+Each column is converted through a shadow ``<column>__tz`` column that is
+backfilled in committed batches, so a large table never sits under one long
+lock and an interrupted run picks up where it stopped. A row trigger fills
+the shadow column on every insert and on every update of the original, from
+before the backfill starts until the swap, so writes made while it runs are
+not lost. Values that do not parse as timestamps become NULL. Once every
+batch is done the trigger is dropped, the shadow column replaces the
+original and its index is rebuilt concurrently.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '60af3ee6f372'
+down_revision: Union[str, Sequence[str], None] = '6dd0a3c7ae61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 10000
+
+# table -> (primary key, [(column, indexed, default now())])
+TIMESTAMP_COLUMNS = {
+    'companies': ('company_id', [('created_at', True, True), ('updated_at', True, True)]),
+    'clients': ('client_id', [('created_at', True, True), ('updated_at', True, True)]),
+    'services': ('service_id', [('created_at', True, True), ('updated_at', True, True)]),
+    'projects': ('project_id', [
+        ('created_at', True, True), ('updated_at', True, True),
+        ('start_date', False, False), ('end_date', False, False),
+    ]),
+    'blogs': ('blog_id', [('created_at', True, True), ('updated_at', True, True)]),
+    'chats': ('chat_id', [
+        ('chat_timestamp', True, True), ('created_at', True, True), ('updated_at', True, True),
+    ]),
+    'collaborations': ('collaboration_id', [('created_at', True, True), ('updated_at', True, True)]),
+    'notifications': ('notification_id', [
+        ('notification_timestamp', True, True), ('notification_read_at', True, False),
+        ('created_at', True, True), ('updated_at', True, True),
+    ]),
+}
+
+
+def _column_type(table: str, column: str) -> str | None:
+    return op.get_bind().execute(
+        sa.text(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_schema = 'public' AND table_name = :table AND column_name = :column"
+        ),
+        {'table': table, 'column': column},
+    ).scalar()
+
+
+def _create_sync_trigger(table: str, column: str) -> None:
+    """Keep ``<column>__tz`` in step with writes to ``column`` until the swap."""
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION public.sync_{table}_{column}__tz()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.{column}__tz = public.try_timestamptz(NEW.{column});
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+    op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{column}__tz ON public.{table}")
+    op.execute(
+        f"CREATE TRIGGER trg_{table}_{column}__tz BEFORE INSERT OR UPDATE OF {column} ON public.{table} "
+        f"FOR EACH ROW EXECUTE FUNCTION public.sync_{table}_{column}__tz()"
+    )
+
+
+def _drop_sync_trigger(table: str, column: str) -> None:
+    op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{column}__tz ON public.{table}")
+    op.execute(f"DROP FUNCTION IF EXISTS public.sync_{table}_{column}__tz()")
+
+
+def _backfill(table: str, pk: str, column: str) -> None:
+    """
+    Walk the table in primary-key order, one committed batch at a time.
+
+    Each batch is a range scan of the primary key index starting after the
+    previous batch, so the whole backfill reads the table once, and each
+    value is parsed once. A rerun after an interruption walks again but
+    skips rows whose shadow column is already filled.
+    """
+    bind = op.get_bind()
+
+    def statement(after_last: bool) -> sa.TextClause:
+        return sa.text(
+            f"WITH batch AS ("
+            f"SELECT {pk}, {column} FROM public.{table} "
+            f"{f'WHERE {pk} > :last ' if after_last else ''}"
+            f"ORDER BY {pk} LIMIT :batch_size"
+            f"), updated AS ("
+            f"UPDATE public.{table} t SET {column}__tz = public.try_timestamptz(batch.{column}) "
+            f"FROM batch WHERE t.{pk} = batch.{pk} "
+            f"AND batch.{column} IS NOT NULL AND t.{column}__tz IS NULL"
+            # max() has no uuid overload, so take the last key by ordering instead
+            f") SELECT {pk} FROM batch ORDER BY {pk} DESC LIMIT 1"
+        )
+
+    last = bind.execute(statement(after_last=False), {'batch_size': BATCH_SIZE}).scalar()
+    while last is not None:
+        last = bind.execute(
+            statement(after_last=True), {'batch_size': BATCH_SIZE, 'last': last}
+        ).scalar()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.try_timestamptz(value text)
+        RETURNS timestamptz LANGUAGE plpgsql STABLE AS $$
+        BEGIN
+            RETURN value::timestamptz;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.set_updated_at()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$
+        """
+    )
+
+    for table, (pk, columns) in TIMESTAMP_COLUMNS.items():
+        for column, indexed, with_default in columns:
+            if _column_type(table, column) == 'timestamp with time zone':
+                continue  # converted by an earlier, interrupted run
+
+            op.execute(f"ALTER TABLE public.{table} ADD COLUMN IF NOT EXISTS {column}__tz timestamptz")
+            _create_sync_trigger(table, column)
+            # Each batch commits on its own so progress survives an interruption
+            with op.get_context().autocommit_block():
+                _backfill(table, pk, column)
+
+            # The swap's DROP COLUMN waits for in-flight writers, which the trigger still covers
+            _drop_sync_trigger(table, column)
+            op.execute(f"DROP INDEX IF EXISTS public.ix_public_{table}_{column}")
+            op.execute(f"ALTER TABLE public.{table} DROP COLUMN {column}")
+            op.execute(f"ALTER TABLE public.{table} RENAME COLUMN {column}__tz TO {column}")
+            if with_default:
+                op.execute(f"ALTER TABLE public.{table} ALTER COLUMN {column} SET DEFAULT now()")
+
+        for column, indexed, _ in columns:
+            if indexed:
+                with op.get_context().autocommit_block():
+                    op.execute(
+                        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_public_{table}_{column} "
+                        f"ON public.{table} ({column})"
+                    )
+
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON public.{table}")
+        op.execute(
+            f"CREATE TRIGGER trg_{table}_updated_at BEFORE UPDATE ON public.{table} "
+            f"FOR EACH ROW EXECUTE FUNCTION public.set_updated_at()"
+        )
+
+    op.execute("DROP FUNCTION IF EXISTS public.try_timestamptz(text)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, (pk, columns) in TIMESTAMP_COLUMNS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON public.{table}")
+        for column, indexed, with_default in columns:
+            if with_default:
+                op.execute(f"ALTER TABLE public.{table} ALTER COLUMN {column} DROP DEFAULT")
+            op.execute(
+                f"ALTER TABLE public.{table} ALTER COLUMN {column} TYPE varchar "
+                f"USING to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD\"T\"HH24:MI:SS.US\"+00:00\"')"
+            )
+    op.execute("DROP FUNCTION IF EXISTS public.set_updated_at()")
@@ -0,0 +1,66 @@
+"""Publish new notifications with NOTIFY for the live stream
+
+Revision ID: 6b5480276efc
+Revises: 78826c3957fc
+Create Date: 2026-10-18 15:52:06.771450
+
+Each inserted notification is sent on the ``notifications`` channel when its
+transaction commits, whichever code path inserted it. Messages over 1000
+characters are cut short in the payload to stay under the NOTIFY size limit,
+and ``truncated`` tells subscribers to fetch the full row. The
+(notification_to, notification_id) index serves Last-Event-ID replay.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b5480276efc'
+down_revision: Union[str, Sequence[str], None] = '78826c3957fc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.notify_notification_insert()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.notification_to IS NOT NULL THEN
+                PERFORM pg_notify('notifications', json_build_object(
+                    'notification_id', NEW.notification_id,
+                    'notification_to', NEW.notification_to,
+                    'notification_from', NEW.notification_from,
+                    'notification_type', NEW.notification_type,
+                    'notification_status', NEW.notification_status,
+                    'notification_priority', NEW.notification_priority,
+                    'notification_timestamp', NEW.notification_timestamp,
+                    'notification_message', left(NEW.notification_message, 1000),
+                    'truncated', length(NEW.notification_message) > 1000
+                )::text);
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER trg_notifications_notify AFTER INSERT ON public.notifications "
+        "FOR EACH ROW EXECUTE FUNCTION public.notify_notification_insert()"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_public_notifications_to_id "
+            "ON public.notifications (notification_to, notification_id)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS public.ix_public_notifications_to_id")
+    op.execute("DROP TRIGGER IF EXISTS trg_notifications_notify ON public.notifications")
+    op.execute("DROP FUNCTION IF EXISTS public.notify_notification_insert()")
@@ -0,0 +1,34 @@
+"""Unique case-insensitive index on clients.client_email
+
+Revision ID: 6dd0a3c7ae61
+Revises: d981b00ef383
+Create Date: 2026-10-18 10:41:55.170233
+
+Existing rows that differ only by email case must be merged before upgrading,
+otherwise the unique index cannot be built.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6dd0a3c7ae61'
+down_revision: Union[str, Sequence[str], None] = 'd981b00ef383'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build without locking out writes on clients
+    with op.get_context().autocommit_block():
+        op.create_index('ux_public_clients_client_email_lower', 'clients', [sa.text('lower(client_email)')], unique=True, schema='public', postgresql_concurrently=True)
+    op.drop_index(op.f('ix_public_clients_client_email'), table_name='clients', schema='public')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_public_clients_client_email'), 'clients', ['client_email'], unique=False, schema='public')
+    op.drop_index('ux_public_clients_client_email_lower', table_name='clients', schema='public')
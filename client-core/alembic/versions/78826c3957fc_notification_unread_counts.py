@@ -0,0 +1,110 @@
+"""Per-recipient unread notification counters and a partial unread index
+
+Revision ID: 78826c3957fc
+Revises: 79aaa806ace3
+Create Date: 2026-10-18 15:20:44.093611
+
+Statement-level triggers with transition tables keep
+notification_unread_counts exact in the same transaction as the change. A
+bulk "mark read" UPDATE adjusts each recipient's counter once, not once per
+row. Counter rows are upserted in company_id order so concurrent bulk
+updates cannot deadlock on them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '78826c3957fc'
+down_revision: Union[str, Sequence[str], None] = '79aaa806ace3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+UPSERT_DELTAS = """
+    INSERT INTO public.notification_unread_counts AS c (company_id, unread_count)
+    SELECT company_id, sum(delta) FROM deltas
+    WHERE company_id IS NOT NULL
+    GROUP BY company_id HAVING sum(delta) <> 0
+    ORDER BY company_id
+    ON CONFLICT (company_id) DO UPDATE SET unread_count = c.unread_count + EXCLUDED.unread_count
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'notification_unread_counts',
+        sa.Column('company_id', sa.Uuid(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['company_id'], ['public.companies.company_id']),
+        sa.PrimaryKeyConstraint('company_id'),
+        schema='public',
+    )
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION public.count_unread_notifications()
+        RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH deltas AS (
+                    SELECT notification_to AS company_id, 1 AS delta
+                    FROM new_rows WHERE notification_status = 'unread'
+                ){UPSERT_DELTAS};
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH deltas AS (
+                    SELECT notification_to AS company_id, -1 AS delta
+                    FROM old_rows WHERE notification_status = 'unread'
+                ){UPSERT_DELTAS};
+            ELSE
+                WITH deltas AS (
+                    SELECT notification_to AS company_id, 1 AS delta
+                    FROM new_rows WHERE notification_status = 'unread'
+                    UNION ALL
+                    SELECT notification_to, -1
+                    FROM old_rows WHERE notification_status = 'unread'
+                ){UPSERT_DELTAS};
+            END IF;
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+
+    # Block writers while the triggers go in and the counters are backfilled
+    op.execute("LOCK TABLE public.notifications IN SHARE MODE")
+    for event, tables in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'OLD TABLE AS old_rows NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    ):
+        op.execute(
+            f"CREATE TRIGGER trg_notifications_unread_{event.lower()} AFTER {event} "
+            f"ON public.notifications REFERENCING {tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION public.count_unread_notifications()"
+        )
+    op.execute(
+        "INSERT INTO public.notification_unread_counts (company_id, unread_count) "
+        "SELECT notification_to, count(*) FROM public.notifications "
+        "WHERE notification_status = 'unread' AND notification_to IS NOT NULL "
+        "GROUP BY notification_to"
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_public_notifications_unread "
+            "ON public.notifications (notification_to, notification_timestamp) "
+            "WHERE notification_status = 'unread'"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS public.ix_public_notifications_unread")
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_notifications_unread_{event} ON public.notifications")
+    op.execute("DROP FUNCTION IF EXISTS public.count_unread_notifications()")
+    op.drop_table('notification_unread_counts', schema='public')
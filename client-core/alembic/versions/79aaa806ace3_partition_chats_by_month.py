@@ -0,0 +1,197 @@
+"""Conversation key on chats and monthly range partitioning
+
+Revision ID: 79aaa806ace3
+Revises: d2f9aee884b4
+Create Date: 2026-10-18 14:48:30.517264
+
+``chats`` is rebuilt as a table partitioned by RANGE (chat_id). Chat ids are
+UUIDv7, so each monthly partition covers the ids minted in that month, and
+the primary key stays (chat_id) instead of having to include a timestamp.
+Ids that fall outside every monthly range, such as legacy random UUIDs, land
+in chats_default.
+
+public.ensure_chat_partitions(n) creates the current month's partition and
+the next n; the application calls it on startup and daily with
+CHAT_PARTITION_MONTHS_AHEAD, so a month's partition exists long before its
+first chat. Creating a partition scans chats_default for rows in the new
+range under lock, which stays cheap only while the default partition holds
+just legacy ids. If it already holds rows for that range the function
+raises instead; move those rows out before retrying.
+
+An old month can be archived without rewriting anything. DETACH ...
+CONCURRENTLY is rejected while a DEFAULT partition exists, so use the plain
+form, which briefly takes an ACCESS EXCLUSIVE lock on chats:
+
+    ALTER TABLE public.chats DETACH PARTITION public.chats_y2025m01;
+
+The copy runs under an EXCLUSIVE lock on the old table, so chat writes wait
+for the migration to finish.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '79aaa806ace3'
+down_revision: Union[str, Sequence[str], None] = 'd2f9aee884b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = (
+    'chat_id, chat_to, chat_from, chat_message, chat_timestamp, chat_status, '
+    'created_at, updated_at'
+)
+TIMESTAMP_INDEXES = ['chat_timestamp', 'created_at', 'updated_at']
+
+
+def _create_chats_table(partitioned: bool) -> None:
+    conversation_key = (
+        "conversation_key text GENERATED ALWAYS AS ("
+        "least(chat_from, chat_to)::text || ':' || greatest(chat_from, chat_to)::text"
+        ") STORED,"
+        if partitioned
+        else ""
+    )
+    op.execute(
+        f"""
+        CREATE TABLE public.chats (
+            chat_id uuid NOT NULL,
+            chat_to uuid REFERENCES public.companies (company_id),
+            chat_from uuid REFERENCES public.companies (company_id),
+            chat_message varchar NOT NULL,
+            chat_timestamp timestamptz DEFAULT now(),
+            chat_status varchar(50),
+            created_at timestamptz DEFAULT now(),
+            updated_at timestamptz DEFAULT now(),
+            {conversation_key}
+            PRIMARY KEY (chat_id)
+        ) {'PARTITION BY RANGE (chat_id)' if partitioned else ''}
+        """
+    )
+
+
+def _create_indexes_and_trigger() -> None:
+    for column in TIMESTAMP_INDEXES:
+        op.execute(f"CREATE INDEX ix_public_chats_{column} ON public.chats ({column})")
+    op.execute(
+        "CREATE TRIGGER trg_chats_updated_at BEFORE UPDATE ON public.chats "
+        "FOR EACH ROW EXECUTE FUNCTION public.set_updated_at()"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.uuid7_lower_bound(ts timestamptz)
+        RETURNS uuid LANGUAGE sql IMMUTABLE AS $$
+            SELECT (lpad(to_hex((extract(epoch FROM ts) * 1000)::bigint), 12, '0')
+                    || '00000000000000000000')::uuid
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION public.ensure_chat_partitions(months_ahead int)
+        RETURNS void LANGUAGE plpgsql AS $$
+        DECLARE
+            month_start timestamptz;
+            partition_name text;
+            lower_bound uuid;
+            upper_bound uuid;
+        BEGIN
+            -- Serialize workers racing to create the same partition
+            PERFORM pg_advisory_xact_lock(hashtext('public.ensure_chat_partitions'));
+            FOR i IN 0..months_ahead LOOP
+                month_start := date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+                               + make_interval(months => i);
+                partition_name := 'chats_' || to_char(month_start AT TIME ZONE 'UTC', '"y"YYYY"m"MM');
+                CONTINUE WHEN to_regclass('public.' || partition_name) IS NOT NULL;
+                lower_bound := public.uuid7_lower_bound(month_start);
+                upper_bound := public.uuid7_lower_bound(month_start + interval '1 month');
+                -- A primary-key range probe, instead of failing after the attach scans the default
+                IF EXISTS (
+                    SELECT 1 FROM public.chats_default
+                    WHERE chat_id >= lower_bound AND chat_id < upper_bound
+                ) THEN
+                    RAISE EXCEPTION 'chats_default holds rows for %, move them out before creating it',
+                        partition_name;
+                END IF;
+                EXECUTE format(
+                    'CREATE TABLE public.%I PARTITION OF public.chats FOR VALUES FROM (%L) TO (%L)',
+                    partition_name, lower_bound, upper_bound
+                );
+            END LOOP;
+        END;
+        $$
+        """
+    )
+
+    op.execute("LOCK TABLE public.chats IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE public.chats RENAME TO chats_unpartitioned")
+    for column in TIMESTAMP_INDEXES:
+        op.execute(f"ALTER INDEX IF EXISTS public.ix_public_chats_{column} RENAME TO ix_public_chats_unpartitioned_{column}")
+    op.execute("ALTER TABLE public.chats_unpartitioned RENAME CONSTRAINT chats_pkey TO chats_unpartitioned_pkey")
+    op.execute("DROP TRIGGER IF EXISTS trg_chats_updated_at ON public.chats_unpartitioned")
+
+    _create_chats_table(partitioned=True)
+    op.execute("CREATE TABLE public.chats_default PARTITION OF public.chats DEFAULT")
+    # Monthly partitions for every month that already has UUIDv7 chats, then the next three
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            first_month timestamptz;
+            month_start timestamptz;
+        BEGIN
+            SELECT date_trunc('month', min(chat_timestamp) AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+            INTO first_month FROM public.chats_unpartitioned;
+            month_start := coalesce(
+                first_month, date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+            );
+            WHILE month_start < date_trunc('month', now() AT TIME ZONE 'UTC') AT TIME ZONE 'UTC' LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS public.%I PARTITION OF public.chats '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'chats_' || to_char(month_start AT TIME ZONE 'UTC', '"y"YYYY"m"MM'),
+                    public.uuid7_lower_bound(month_start),
+                    public.uuid7_lower_bound(month_start + interval '1 month')
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END;
+        $$
+        """
+    )
+    op.execute("SELECT public.ensure_chat_partitions(3)")
+
+    op.execute(f"INSERT INTO public.chats ({COLUMNS}) SELECT {COLUMNS} FROM public.chats_unpartitioned")
+    op.execute("DROP TABLE public.chats_unpartitioned")
+
+    _create_indexes_and_trigger()
+    # History pages walk one conversation backwards by chat_id
+    op.execute(
+        "CREATE INDEX ix_public_chats_conversation_key_chat_id "
+        "ON public.chats (conversation_key, chat_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("LOCK TABLE public.chats IN EXCLUSIVE MODE")
+    op.execute("ALTER TABLE public.chats RENAME TO chats_partitioned")
+    for column in TIMESTAMP_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS public.ix_public_chats_{column}")
+    op.execute("DROP INDEX IF EXISTS public.ix_public_chats_conversation_key_chat_id")
+    op.execute("ALTER TABLE public.chats_partitioned RENAME CONSTRAINT chats_pkey TO chats_partitioned_pkey")
+    op.execute("DROP TRIGGER IF EXISTS trg_chats_updated_at ON public.chats_partitioned")
+
+    _create_chats_table(partitioned=False)
+    op.execute(f"INSERT INTO public.chats ({COLUMNS}) SELECT {COLUMNS} FROM public.chats_partitioned")
+    op.execute("DROP TABLE public.chats_partitioned CASCADE")
+    _create_indexes_and_trigger()
+
+    op.execute("DROP FUNCTION IF EXISTS public.ensure_chat_partitions(int)")
+    op.execute("DROP FUNCTION IF EXISTS public.uuid7_lower_bound(timestamptz)")
@@ -0,0 +1,40 @@
+"""Composite indexes for keyset pagination
+
+Revision ID: c24de92ac5d6
+Revises: 60af3ee6f372
+Create Date: 2026-10-18 12:14:36.402871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c24de92ac5d6'
+down_revision: Union[str, Sequence[str], None] = '60af3ee6f372'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_public_companies_created_at_company_id', 'companies', ['created_at', 'company_id']),
+    ('ix_public_companies_company_name_company_id', 'companies', ['company_name', 'company_id']),
+    ('ix_public_projects_created_at_project_id', 'projects', ['created_at', 'project_id']),
+    ('ix_public_blogs_created_at_blog_id', 'blogs', ['created_at', 'blog_id']),
+    ('ix_public_notifications_to_timestamp_id', 'notifications', ['notification_to', 'notification_timestamp', 'notification_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, schema='public', postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, schema='public', postgresql_concurrently=True, if_exists=True)
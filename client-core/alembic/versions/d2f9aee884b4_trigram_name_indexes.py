@@ -0,0 +1,43 @@
+"""pg_trgm indexes for fuzzy name lookups
+
+Revision ID: d2f9aee884b4
+Revises: f7d49b2e2999
+Create Date: 2026-10-18 14:05:12.840117
+
+Typeahead serves prefixes from memory and falls back to trigram similarity
+on lower(name) for misspellings.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f9aee884b4'
+down_revision: Union[str, Sequence[str], None] = 'f7d49b2e2999'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_public_companies_company_name_trgm', 'companies', 'company_name'),
+    ('ix_public_clients_client_name_trgm', 'clients', 'client_name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON public.{table} USING gin (lower({column}) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{name}")
@@ -0,0 +1,42 @@
+"""Add client_sessions table
+
+Revision ID: d981b00ef383
+Revises: 3908a6e8e63b
+Create Date: 2026-10-18 10:03:17.544902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd981b00ef383'
+down_revision: Union[str, Sequence[str], None] = '3908a6e8e63b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('client_sessions',
+    sa.Column('session_id', sa.Uuid(), nullable=False),
+    sa.Column('client_id', sa.Uuid(), nullable=False),
+    sa.Column('refresh_jti', sa.Uuid(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['client_id'], ['public.clients.client_id'], ),
+    sa.PrimaryKeyConstraint('session_id'),
+    schema='public'
+    )
+    op.create_index(op.f('ix_public_client_sessions_client_id'), 'client_sessions', ['client_id'], unique=False, schema='public')
+    op.create_index(op.f('ix_public_client_sessions_revoked_at'), 'client_sessions', ['revoked_at'], unique=False, schema='public')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_public_client_sessions_revoked_at'), table_name='client_sessions', schema='public')
+    op.drop_index(op.f('ix_public_client_sessions_client_id'), table_name='client_sessions', schema='public')
+    op.drop_table('client_sessions', schema='public')
@@ -0,0 +1,44 @@
+"""Descending NULLS LAST keyset indexes for newest-first pages
+
+Revision ID: d9a23c3b183b
+Revises: 5206367a1ed1
+Create Date: 2026-10-18 18:02:11.514286
+
+Keyset pages sort NULL created_at values last in both directions. The
+ascending (created_at, pk) indexes already match ASC NULLS LAST; the default
+DESC NULLS LAST order needs its own index to stay a range scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9a23c3b183b'
+down_revision: Union[str, Sequence[str], None] = '5206367a1ed1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_public_companies_created_at_desc_company_id', 'companies', 'company_id'),
+    ('ix_public_projects_created_at_desc_project_id', 'projects', 'project_id'),
+    ('ix_public_blogs_created_at_desc_blog_id', 'blogs', 'blog_id'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, pk in INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON public.{table} (created_at DESC NULLS LAST, {pk} DESC)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{name}")
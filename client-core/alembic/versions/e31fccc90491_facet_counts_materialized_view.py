@@ -0,0 +1,51 @@
+"""Materialized view of filter facet counts
+
+Revision ID: e31fccc90491
+Revises: c24de92ac5d6
+Create Date: 2026-10-18 12:52:19.611084
+
+One row per (table, column, value) with the number of rows carrying that
+value. The unique index lets the view be refreshed CONCURRENTLY so readers
+are never blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e31fccc90491'
+down_revision: Union[str, Sequence[str], None] = 'c24de92ac5d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keep in sync with app.services.facets.FACETED_MODELS
+FACET_COLUMNS = [
+    ('companies', 'country'),
+    ('projects', 'status'),
+    ('projects', 'domain'),
+    ('notifications', 'notification_type'),
+    ('notifications', 'notification_status'),
+    ('notifications', 'notification_priority'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    selects = '\nUNION ALL\n'.join(
+        f"SELECT '{table}'::text AS table_name, '{column}'::text AS column_name, "
+        f"{column}::text AS value, count(*) AS value_count "
+        f"FROM public.{table} WHERE {column} IS NOT NULL GROUP BY {column}"
+        for table, column in FACET_COLUMNS
+    )
+    op.execute(f"CREATE MATERIALIZED VIEW public.facet_counts AS\n{selects}")
+    op.execute(
+        "CREATE UNIQUE INDEX ux_public_facet_counts "
+        "ON public.facet_counts (table_name, column_name, value)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS public.facet_counts")
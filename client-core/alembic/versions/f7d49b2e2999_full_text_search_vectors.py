@@ -0,0 +1,56 @@
+"""Generated tsvector columns and GIN indexes for full-text search
+
+Revision ID: f7d49b2e2999
+Revises: e31fccc90491
+Create Date: 2026-10-18 13:31:47.205318
+
+Adding a STORED generated column rewrites the table under an exclusive lock,
+so run this in a maintenance window on large tables. The GIN indexes are then
+built concurrently.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7d49b2e2999'
+down_revision: Union[str, Sequence[str], None] = 'e31fccc90491'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Keep in sync with the add_search_vector calls in app.models.company_db_tables
+SEARCH_VECTORS = {
+    'companies': {'company_name': 'A', 'bio': 'B', 'about': 'C', 'vision': 'C'},
+    'projects': {'title': 'A', 'description': 'B', 'tools': 'C'},
+    'blogs': {'title': 'A', 'description': 'B', 'content': 'C'},
+    'services': {'name': 'A', 'domain': 'B', 'description': 'B'},
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, weighted_columns in SEARCH_VECTORS.items():
+        expression = ' || '.join(
+            f"setweight(to_tsvector('english', coalesce({column}, '')), '{weight}')"
+            for column, weight in weighted_columns.items()
+        )
+        op.execute(
+            f"ALTER TABLE public.{table} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({expression}) STORED"
+        )
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_VECTORS:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_public_{table}_search_vector "
+                f"ON public.{table} USING gin (search_vector)"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in SEARCH_VECTORS:
+        op.execute(f"DROP INDEX IF EXISTS public.ix_public_{table}_search_vector")
+        op.execute(f"ALTER TABLE public.{table} DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,45 @@
+"""Partial indexes over active collaborations in both directions
+
+Revision ID: fbb29a85dcf8
+Revises: 6b5480276efc
+Create Date: 2026-10-18 16:30:12.204417
+
+Partner, mutual-partner and suggestion lookups are served from an in-memory
+graph. Until it has loaded, they fall back to a recursive CTE that walks
+active collaborations from either end. These two partial indexes keep each
+step of that walk an index range scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fbb29a85dcf8'
+down_revision: Union[str, Sequence[str], None] = '6b5480276efc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    'ix_public_collaborations_active_from_to': 'collaboration_from, collaboration_to',
+    'ix_public_collaborations_active_to_from': 'collaboration_to, collaboration_from',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON public.collaborations ({columns}) "
+                "WHERE collaboration_status = 'active'"
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{name}")
@@ -0,0 +1,348 @@
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable
+
+from pydantic import TypeAdapter
+
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from app.core.config import settings
+from app.core.database import RoutingSession
+from app.core.pubsub import pg_listener
+
+logger = logging.getLogger(__name__)
+
+CACHE_CHANNEL = "cache_invalidation"
+_MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "tags", "generations")
+
+    def __init__(self, value, expires_at: float, tags: tuple[str, ...], generations: tuple[int, ...]):
+        self.value = value
+        self.expires_at = expires_at
+        self.tags = tags
+        self.generations = generations
+
+
+class RedisBackend:
+    """
+    Shared second tier. Keys embed the current generation of each tag, so
+    invalidating a tag (INCR) makes every older entry unreachable; they then
+    age out by TTL. Values are stored as JSON, never pickled, so a shared
+    Redis cannot execute code in the workers. Needs the ``redis`` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "cache"):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+
+    async def generations(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        if not tags:
+            return ()
+        values = await self._client.mget([f"{self._prefix}:tag:{tag}" for tag in tags])
+        return tuple(int(v or 0) for v in values)
+
+    def _key(self, key: str, generations: tuple[int, ...]) -> str:
+        return f"{self._prefix}:{key}:{'.'.join(map(str, generations))}"
+
+    async def get(self, key: str, generations: tuple[int, ...]) -> bytes | None:
+        return await self._client.get(self._key(key, generations))
+
+    async def set(self, key: str, generations: tuple[int, ...], value: bytes, ttl: float) -> None:
+        await self._client.set(self._key(key, generations), value, px=int(ttl * 1000))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(f"{self._prefix}:tag:{tag}")
+            await pipe.execute()
+
+
+class AppCache:
+    """
+    Read-through cache with TTL, LRU eviction, tags and single-flight loads.
+
+    Each tag has a generation number; an entry remembers the generations of
+    its tags when it was loaded and is treated as gone once any of them
+    moves. That also covers a load that raced an invalidation: its result is
+    returned but not stored. Concurrent misses on one key share a single
+    load. Coalescing is per worker, so a cold key costs at most one query
+    per worker. Only loads that declare a ``schema`` use the shared tier,
+    since that is what decodes the JSON back.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl: float,
+        enabled: bool = True,
+        backend: RedisBackend | None = None,
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        self.backend = backend
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._background: set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.loads = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.backend_hits = 0
+        self.backend_errors = 0
+
+    def _current(self, tags: tuple[str, ...]) -> tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def _lookup(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return _MISSING
+        if entry.generations != self._current(entry.tags):
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def _store(self, key: str, value, ttl: float, tags: tuple[str, ...], generations: tuple[int, ...]) -> None:
+        if generations != self._current(tags):
+            return
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, tags, generations)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: float | None = None,
+        tags: Iterable[str] = (),
+        schema: Any = None,
+    ):
+        """
+        Return the cached value for ``key``, calling ``loader`` (sync or async) on a miss.
+
+        ``schema`` is the loader's return type, used to share the value through
+        the backend: ``bytes`` are stored as is, anything else as pydantic JSON.
+        """
+        if not self.enabled:
+            return await _call(loader)
+        ttl = self.default_ttl if ttl is None else ttl
+        tags = tuple(tags)
+
+        while True:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The leading request was cancelled, not this one: take over the load
+                if not inflight.cancelled():
+                    raise
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        # Nobody may be waiting; mark a failure as retrieved so it is not logged twice
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            value = await self._load(key, loader, ttl, tags, schema)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def _load(self, key: str, loader, ttl: float, tags: tuple[str, ...], schema):
+        generations = self._current(tags)
+        shared_generations = None
+        if self.backend is not None and schema is not None:
+            try:
+                shared_generations = await self.backend.generations(tags)
+                raw = await self.backend.get(key, shared_generations)
+                if raw is not None:
+                    self.backend_hits += 1
+                    value = _decode(schema, raw)
+                    self._store(key, value, ttl, tags, generations)
+                    return value
+            except Exception as e:
+                self.backend_errors += 1
+                shared_generations = None
+                logger.warning(f"Shared cache read failed: {e}")
+
+        value = await _call(loader)
+        self.loads += 1
+        self._store(key, value, ttl, tags, generations)
+        if shared_generations is not None:
+            try:
+                await self.backend.set(key, shared_generations, _encode(schema, value), ttl)
+            except Exception as e:
+                self.backend_errors += 1
+                logger.warning(f"Shared cache write failed: {e}")
+        return value
+
+    def invalidate(self, tags: Iterable[str], shared: bool = False) -> None:
+        """Drop every entry carrying one of ``tags``; ``shared`` also bumps them in Redis."""
+        tags = set(tags)
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+        self.invalidations += len(tags)
+        if shared and self.backend is not None and tags:
+            task = asyncio.get_running_loop().create_task(self._invalidate_shared(tags))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _invalidate_shared(self, tags: set[str]) -> None:
+        try:
+            await self.backend.invalidate(tags)
+        except Exception as e:
+            self.backend_errors += 1
+            logger.warning(f"Shared cache invalidation failed: {e}")
+
+    def handle_notification(self, payload: str) -> None:
+        # One tag per notification
+        self.invalidate([payload])
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "shared": self.backend is not None,
+            "size": len(self._entries),
+            "max_size": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "backend_hits": self.backend_hits,
+            "backend_errors": self.backend_errors,
+        }
+
+
+@functools.lru_cache
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _encode(schema, value) -> bytes:
+    return value if schema is bytes else _adapter(schema).dump_json(value)
+
+
+def _decode(schema, raw: bytes):
+    return raw if schema is bytes else _adapter(schema).validate_json(raw)
+
+
+async def _call(loader):
+    result = loader()
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+app_cache = AppCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+    backend=RedisBackend(settings.CACHE_REDIS_URL) if settings.CACHE_REDIS_URL else None,
+)
+# Writes in any worker invalidate the in-process tier of every worker
+pg_listener.subscribe(CACHE_CHANNEL, app_cache.handle_notification)
+
+
+def cached(namespace: str, ttl: float | None = None, tags: Iterable[str] = (), schema: Any = None):
+    """
+    Cache an async function's result in ``app_cache``.
+
+    The key is the namespace plus every argument except ``session``. Tags
+    are format strings over the same arguments, e.g. ``"company:{company_id}"``.
+    ``schema`` is the return type, needed for the shared tier. Cached values
+    are shared between requests and must not be mutated.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {k: v for k, v in bound.arguments.items() if k != "session"}
+            key = ":".join([namespace, *(f"{k}={v}" for k, v in arguments.items())])
+            return await app_cache.get_or_load(
+                key,
+                lambda: fn(*args, **kwargs),
+                ttl=ttl,
+                tags=[tag.format(**arguments) for tag in tags],
+                schema=schema,
+            )
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_on_write(model, tags_for: Callable[[Any], Iterable[str]]) -> None:
+    """
+    Invalidate ``tags_for(row)`` whenever a row of ``model`` is written.
+
+    Flushes only collect the tags on the session. Once the transaction
+    commits, this worker drops them and every other worker gets one NOTIFY
+    per distinct tag, however many rows carried it.
+    """
+
+    def record(mapper, connection, target):
+        session = object_session(target)
+        if session is not None:
+            session.info.setdefault("cache_tags", set()).update(
+                tag for tag in tags_for(target) if tag is not None
+            )
+
+    for name in ("after_insert", "after_update", "after_delete"):
+        event.listen(model, name, record)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _invalidate_committed_tags(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        app_cache.invalidate(tags, shared=True)
+        pg_listener.publish(CACHE_CHANNEL, sorted(tags))
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_cache_tags(session):
+    session.info.pop("cache_tags", None)
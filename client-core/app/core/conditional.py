@@ -0,0 +1,74 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Validator:
+    """Strong ETag and Last-Modified for one representation of a resource."""
+
+    etag: str
+    last_modified: datetime | None
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={settings.PUBLIC_CACHE_MAX_AGE_SECONDS}",
+        }
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(
+                self.last_modified.astimezone(timezone.utc), usegmt=True
+            )
+        return headers
+
+
+def make_validator(request: Request, version, last_modified: datetime | None) -> Validator:
+    """
+    Derive a validator from a resource version and the request URL.
+
+    The path and query string are part of the hash, so each page, filter and
+    limit gets its own ETag for the same underlying version.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(version).encode())
+    digest.update(request.url.path.encode())
+    digest.update(str(sorted(request.query_params.multi_items())).encode())
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return Validator(etag=f'"{digest.hexdigest()}"', last_modified=last_modified)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes added by proxies still match
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def is_not_modified(request: Request, validator: Validator) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins; If-Modified-Since only applies without it."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validator.etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or validator.last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have whole-second precision
+    return validator.last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(validator: Validator) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validator.headers())
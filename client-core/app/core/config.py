@@ -25,6 +25,12 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # 30 minutes
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 1440  # 1 day
+    SESSION_REVOCATION_SYNC_SECONDS: int = 5
+    FACET_REFRESH_SECONDS: int = 300
+    TYPEAHEAD_REFRESH_SECONDS: int = 300
+    COLLABORATION_GRAPH_REFRESH_SECONDS: int = 600
+    # Cache-Control max-age on public company, project and blog reads
+    PUBLIC_CACHE_MAX_AGE_SECONDS: int = 60
 
     ENVIRONMENT: Literal["development", "staging", "production"] = "production"
 
@@ -50,6 +56,36 @@ class Settings(BaseSettings):
 
     POSTGRES_DB_OWNER: str = "postgres"
 
+    # Connection pool
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000
+    DB_ECHO: bool = False
+
+    # Read replicas (comma separated URLs); reads fall back to the primary when empty
+    DATABASE_REPLICA_URLS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    REPLICA_ROUTING: Literal["round_robin", "least_connections"] = "round_robin"
+    # After a client writes, their reads stay on the primary for this long
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Warn when one statement runs more than this many times in a single request (likely N+1)
+    SQL_REPEAT_THRESHOLD: int = 5
+
+    # Chat WebSocket: frames queued per connection before it is dropped as a slow consumer
+    CHAT_SEND_QUEUE_SIZE: int = 100
+    CHAT_MAX_MESSAGE_BYTES: int = 4000
+    CHAT_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Notification event stream (SSE)
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_HEARTBEAT_SECONDS: int = 15
+    NOTIFICATION_STREAM_REPLAY_LIMIT: int = 500
+    # How long an insert may take to commit after its id is drawn; replay looks back this far
+    NOTIFICATION_STREAM_REPLAY_GRACE_SECONDS: int = 5
+
     CHAT_COMPLETIONS_API_URL: str = ""
     CHAT_DEFAULT_MODEL: str = "gpt-3.5-turbo"
     CHAT_TEMPERATURE: float = 0.7
@@ -59,9 +95,33 @@ class Settings(BaseSettings):
     # Internal API
     # REPORTS_BASE_URL: str = "http://host.docker.internal:5001"
 
+    # Verified-token cache
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_SIZE: int = 10000
+
+    # Shared secret for /internal endpoints (X-Internal-Token); they return 404 when unset
+    INTERNAL_API_TOKEN: str | None = None
+
+    # Read cache: in-process LRU, plus a shared Redis tier when CACHE_REDIS_URL is set
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_DEFAULT_TTL_SECONDS: int = 60
+    CACHE_REDIS_URL: str | None = None
+
+    # Password hashing
+    HASHING_POOL_SIZE: int = 4
+    HASHING_QUEUE_SIZE: int = 64
+    # Fixed bcrypt cost; when unset it is calibrated at startup to the latency budget
+    PASSWORD_HASH_ROUNDS: int | None = None
+    PASSWORD_HASH_TARGET_MS: int = 250
+    PASSWORD_HASH_MIN_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_ROUNDS: int = 16
+
     # OTP
     OTP_EXPIRE_MINUTES: int = 3
     OTP_ATTEMPTS: int = 3
+    # "memory" keeps codes in the issuing process, so it only works with a single worker
+    OTP_STORE_BACKEND: Literal["memory", "database"] = "database"
 
     # DEFAULT IDs
     # DEFAULT_PG_CLUSTER_ID: UUID = "600e8b20-588c-49e6-b0c4-dcdae573fc22"
@@ -79,6 +139,18 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def ASYNC_DATABASE_URL(self) -> PostgresDsn:
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_SERVER,
+            port=self.POSTGRES_PORT,
+            path=self.POSTGRES_DB,
+        )
+
 
     @computed_field  # type: ignore[prop-decorator]
     @property
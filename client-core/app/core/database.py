@@ -1,16 +1,164 @@
+import itertools
+import time
 from sqlmodel import Session, SQLModel, create_engine
-from fastapi import Depends, FastAPI
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import Select, event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from fastapi import Depends, FastAPI, Request
 import os
 from dotenv import load_dotenv
+from app.core.config import settings
+from app.core.pool_metrics import InstrumentedAsyncQueuePool, pool_metrics
+from app.core.query_stats import instrument_engine
+from app.core.security import decode_token
 load_dotenv()
 
+# Sync engine, only used by Alembic and create_db_and_tables
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL, echo=True)
+engine = create_engine(DATABASE_URL, echo=settings.DB_ECHO)
+
+engine_options = dict(
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args={
+        "server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    },
+)
+
+# Async engine used by the request path
+async_engine = create_async_engine(
+    str(settings.ASYNC_DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    **engine_options,
+)
+pool_metrics.attach(async_engine.sync_engine.pool)
+instrument_engine(async_engine.sync_engine)
+
+
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url.removeprefix("postgresql://")
+    return url
+
+
+class ReplicaRouter:
+    """
+    Picks a read replica for read-only sessions.
+
+    Replicas are chosen round-robin or by fewest checked-out connections. A
+    client that wrote recently is kept on the primary for
+    READ_YOUR_WRITES_SECONDS so it does not read its own stale data. Recent
+    writers are tracked per worker.
+    """
+
+    def __init__(self, replicas: list[AsyncEngine], strategy: str, window_seconds: int):
+        self.replicas = replicas
+        self.strategy = strategy
+        self.window_seconds = window_seconds
+        self._round_robin = itertools.cycle(replicas) if replicas else None
+        self._recent_writers: dict[str, float] = {}
+
+    def record_write(self, subject: str) -> None:
+        now = time.monotonic()
+        self._recent_writers[subject] = now + self.window_seconds
+        if len(self._recent_writers) > 10000:
+            self._recent_writers = {
+                key: until for key, until in self._recent_writers.items() if until > now
+            }
+
+    def choose(self, subject: str | None) -> AsyncEngine | None:
+        if not self.replicas:
+            return None
+        if subject is not None:
+            until = self._recent_writers.get(subject)
+            if until is not None and until > time.monotonic():
+                return None
+        if self.strategy == "least_connections":
+            return min(self.replicas, key=lambda replica: replica.pool.checkedout())
+        return next(self._round_robin)
+
+
+replica_router = ReplicaRouter(
+    [create_async_engine(_async_url(url), **engine_options) for url in settings.DATABASE_REPLICA_URLS],
+    strategy=settings.REPLICA_ROUTING,
+    window_seconds=settings.READ_YOUR_WRITES_SECONDS,
+)
+for replica in replica_router.replicas:
+    instrument_engine(replica.sync_engine)
+
+
+class RoutingSession(Session):
+    """
+    Session that sends plain SELECTs to the replica stored in ``info["replica"]``.
+
+    Everything else goes to the primary: flushes, DML and SELECT ... FOR UPDATE.
+    Once the session writes, it stays on the primary for the rest of its life.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if (
+            replica is not None
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return replica.sync_engine
+        return async_engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _track_orm_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+        orm_execute_state.session.info["replica"] = None
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _track_flush_writes(session, flush_context):
+    session.info["wrote"] = True
+    session.info["replica"] = None
+
+
+async_session_maker = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+)
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
 
 
-def get_session():
-    with Session(engine) as session:
-        yield session
\ No newline at end of file
+def _request_subject(request: Request) -> str | None:
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = decode_token(token)
+    except Exception:
+        return None
+    return payload.get("sub") if payload else None
+
+
+async def get_session(request: Request):
+    async with async_session_maker() as session:
+        yield session
+        if session.sync_session.info.get("wrote"):
+            subject = _request_subject(request)
+            if subject is not None:
+                replica_router.record_write(subject)
+
+
+async def get_read_session(request: Request):
+    """Session for read-only endpoints; routed to a replica when one is configured."""
+    async with async_session_maker() as session:
+        session.sync_session.info["replica"] = replica_router.choose(
+            _request_subject(request)
+        )
+        yield session
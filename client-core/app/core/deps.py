@@ -0,0 +1,70 @@
+import hmac
+from uuid import UUID
+from fastapi import Depends, Header, HTTPException, status
+from fastapi.requests import HTTPConnection
+from fastapi.security import OAuth2PasswordBearer
+from app.core.config import settings
+from app.core.security import decode_token
+from app.services.session_store import revoked_sessions
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login")
+
+
+def verify_access_token(token: str) -> dict | None:
+    payload = decode_token(token)
+    if payload is None or revoked_sessions.is_revoked(payload.get("sid")):
+        return None
+    # Refresh tokens share iss/aud with access tokens; they are only good at /refresh
+    if payload.get("type") == "refresh":
+        return None
+    return payload
+
+
+def verify_connection_token(connection: HTTPConnection) -> dict | None:
+    """
+    Verify the bearer token of a WebSocket or event-stream connection.
+
+    Browsers cannot set headers on WebSocket handshakes or EventSource
+    requests, so the token may also come as a ``?token=`` query parameter.
+    """
+    token = connection.query_params.get("token")
+    scheme, _, header_token = connection.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and header_token:
+        token = header_token
+    if not token:
+        return None
+    try:
+        return verify_access_token(token)
+    except HTTPException:
+        return None
+
+
+def get_token_payload(token: str = Depends(oauth2_scheme)) -> dict:
+    payload = verify_access_token(token)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    return payload
+
+
+def get_current_company_id(payload: dict = Depends(get_token_payload)) -> UUID:
+    if not payload.get("company_id"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Client is not linked to a company",
+        )
+    return UUID(payload["company_id"])
+
+
+def require_internal_token(x_internal_token: str | None = Header(default=None)) -> None:
+    """Guard for operational endpoints; hides them entirely unless a token is configured."""
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if x_internal_token is None or not hmac.compare_digest(x_internal_token, expected):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal token",
+        )
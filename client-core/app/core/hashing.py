@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class HashingExecutor:
+    """
+    Bounded worker pool for password/OTP hashing.
+
+    bcrypt releases the GIL while it works, so a thread pool is enough to keep
+    hashing off the event loop. Once ``max_workers + max_queue`` jobs are
+    pending, new jobs are rejected with a 503 instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="hashing"
+        )
+        self._max_workers = max_workers
+        self._max_pending = max_workers + max_queue
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+
+        def job() -> T:
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self._in_flight += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+                    self._completed += 1
+
+        future = self._executor.submit(job)
+        # Release the slot when the job finishes (or is cancelled before it starts),
+        # not when the awaiting request goes away while the thread keeps hashing
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            started = self._completed + self._in_flight
+            return {
+                "workers": self._max_workers,
+                "max_pending": self._max_pending,
+                "queue_depth": self._pending - self._in_flight,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_avg_ms": (self._wait_total / started * 1000) if started else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_executor = HashingExecutor(
+    max_workers=settings.HASHING_POOL_SIZE, max_queue=settings.HASHING_QUEUE_SIZE
+)
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+
+class PoolMetrics:
+    """Counters for connection checkout latency and pool pressure."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.overflow_connections = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._pool: Pool | None = None
+
+    def record_checkout(self, waited: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def record_overflow(self) -> None:
+        with self._lock:
+            self.overflow_connections += 1
+
+    def attach(self, pool: Pool) -> None:
+        self._pool = pool
+
+        @event.listens_for(pool, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            if pool.overflow() > 0:
+                self.record_overflow()
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "overflow_connections": self.overflow_connections,
+                "checkout_wait_avg_ms": (
+                    self._wait_total / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "checkout_wait_max_ms": self._wait_max * 1000,
+            }
+        if self._pool is not None:
+            data.update(
+                {
+                    "pool_size": self._pool.size(),
+                    "in_use": self._pool.checkedout(),
+                    "idle": self._pool.checkedin(),
+                    "overflow": max(self._pool.overflow(), 0),
+                }
+            )
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that times every checkout, including waits for a free slot."""
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_metrics.record_timeout()
+            raise
+        finally:
+            pool_metrics.record_checkout(time.perf_counter() - started)
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Callable, Iterable
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD_BYTES = 7999
+
+
+class PgListener:
+    """
+    One dedicated LISTEN connection per worker, shared by every channel.
+
+    It stays outside the SQLAlchemy pool, so long-lived subscriptions never
+    hold a request connection. Handlers run on the event loop and must not
+    block. Notifications sent while the connection is down are lost, so
+    subscribers should tolerate gaps, e.g. by refetching on reconnect.
+
+    ``publish`` sends on the same connection, for notifications that are
+    only sent once the data they describe has committed.
+    """
+
+    def __init__(self, dsn: str, reconnect_seconds: float = 2.0):
+        self._dsn = dsn
+        self._reconnect_seconds = reconnect_seconds
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._connection = None
+        # asyncpg runs one query at a time per connection
+        self._send_lock = asyncio.Lock()
+        self._background: set[asyncio.Task] = set()
+        self.connected = False
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel: str, payloads: Iterable[str]) -> None:
+        """Send one NOTIFY per payload in the background, in a single round trip."""
+        payloads = list(payloads)
+        if not payloads:
+            return
+        task = asyncio.get_running_loop().create_task(self._publish(channel, payloads))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _publish(self, channel: str, payloads: list[str]) -> None:
+        connection = self._connection
+        if connection is None or connection.is_closed():
+            logger.warning(f"NOTIFY on {channel} dropped: LISTEN connection is down")
+            return
+        try:
+            async with self._send_lock:
+                await connection.execute(
+                    "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+                    channel,
+                    payloads,
+                )
+        except Exception as e:
+            logger.warning(f"NOTIFY on {channel} failed: {e}")
+
+    def _dispatch(self, connection, pid, channel, payload) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.warning(f"Handler for {channel} failed: {e}")
+
+    async def run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self._dsn)
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _: closed.set())
+                for channel in self._handlers:
+                    await connection.add_listener(channel, self._dispatch)
+                self._connection = connection
+                self.connected = True
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"LISTEN connection failed: {e}")
+            finally:
+                self.connected = False
+                self._connection = None
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self._reconnect_seconds)
+
+
+pg_listener = PgListener(str(settings.DATABASE_URL))
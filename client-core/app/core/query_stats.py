@@ -0,0 +1,96 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Queries issued while serving one request."""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach cursor hooks that feed the current request's QueryStats."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _current_stats.get()
+        starts = conn.info.get("query_start")
+        if stats is not None and starts:
+            stats.record(statement, time.perf_counter() - starts.pop())
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that collects per-request query counts and DB time.
+
+    Totals are always logged. Outside production they are also returned in
+    ``X-DB-Query-Count``/``X-DB-Time-Ms`` headers. Any statement that runs more
+    than SQL_REPEAT_THRESHOLD times in one request is logged as a likely N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.expose_headers = settings.ENVIRONMENT != "production"
+        self.repeat_threshold = settings.SQL_REPEAT_THRESHOLD
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.expose_headers:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append(
+                    (b"x-db-time-ms", f"{stats.duration * 1000:.2f}".encode())
+                )
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            if stats.count:
+                logger.info(
+                    f"{scope['method']} {scope['path']}: {stats.count} queries, "
+                    f"{stats.duration * 1000:.2f} ms in DB"
+                )
+            for shape, n in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    f"Possible N+1 on {scope['method']} {scope['path']}: "
+                    f"statement ran {n} times: {shape}"
+                )
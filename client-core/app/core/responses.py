@@ -0,0 +1,27 @@
+import orjson
+from fastapi.responses import JSONResponse
+
+# UTC datetimes end in "Z", matching what pydantic emits for response models
+JSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content) -> bytes:
+    """orjson encoding; UUIDs, datetimes and enums are handled natively."""
+    return orjson.dumps(content, option=JSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson. ``bytes`` content is taken as already
+    encoded JSON and sent as is.
+
+    Routes with a response_model should keep the default response class:
+    FastAPI then serializes them to bytes in pydantic-core, which a custom
+    class would switch off. This is for everything that builds its own
+    response: error handlers, untyped payloads and pre-encoded pages.
+    """
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
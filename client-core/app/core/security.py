@@ -1,11 +1,16 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
+import hmac
 import secrets
+import time
 from uuid import UUID
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 import jwt
 from pydantic import ValidationError
 from app.core.config import settings
+from app.core.hashing import hashing_executor
+from app.core.token_cache import token_cache
 
 # Configuration
 SECRET_KEY = settings.SECRET_KEY
@@ -24,12 +29,64 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+def benchmark_password_hashing(rounds: int, samples: int = 3) -> dict:
+    """Measure bcrypt at the given cost; reports ms per hash and hashes/second per core."""
+    handler = pwd_context.handler("bcrypt").using(rounds=rounds)
+    started = time.perf_counter()
+    for _ in range(samples):
+        handler.hash("calibration-password")
+    ms_per_hash = (time.perf_counter() - started) / samples * 1000
+    return {
+        "rounds": rounds,
+        "ms_per_hash": round(ms_per_hash, 2),
+        "hashes_per_second": round(1000 / ms_per_hash, 2),
+    }
+
+
+def calibrate_password_hashing() -> int:
+    """
+    Pick the bcrypt cost for this host and make it the context default.
+
+    Uses PASSWORD_HASH_ROUNDS when set. Otherwise the cheapest allowed cost is
+    timed and extrapolated (each extra round doubles the work) to the highest
+    cost that stays within PASSWORD_HASH_TARGET_MS. Stored hashes below the
+    chosen cost are then reported by ``needs_rehash``.
+    """
+    rounds = settings.PASSWORD_HASH_ROUNDS
+    if rounds is None:
+        min_rounds = settings.PASSWORD_HASH_MIN_ROUNDS
+        ms_per_hash = benchmark_password_hashing(min_rounds)["ms_per_hash"]
+        rounds = min_rounds
+        while (
+            rounds < settings.PASSWORD_HASH_MAX_ROUNDS
+            and ms_per_hash * 2 <= settings.PASSWORD_HASH_TARGET_MS
+        ):
+            rounds += 1
+            ms_per_hash *= 2
+
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+    return rounds
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await hashing_executor.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_executor.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(
     sub: str,
     client_id: UUID | None,
     role_id: UUID | None,
     jti: UUID,
     sid: UUID,
+    company_id: UUID | None = None,
 ) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode = {
@@ -43,16 +100,23 @@ def create_access_token(
         # if None then don't serialize
         "role_id": str(role_id) if role_id else None,
         "client_id": str(client_id) if client_id else None,
+        "company_id": str(company_id) if company_id else None,
     }
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def create_refresh_token(
-    sub: str, jti: UUID, expiry: datetime, client_id: UUID | None, role_id: UUID | None
+    sub: str,
+    jti: UUID,
+    expiry: datetime,
+    client_id: UUID | None,
+    role_id: UUID | None,
+    sid: UUID | None = None,
 ) -> str:
     to_encode = {
         "jti": str(jti),
+        "sid": str(sid) if sid else None,
         "sub": str(sub),
         "type": "refresh",
         "iat": datetime.now(timezone.utc),
@@ -69,6 +133,11 @@ def create_refresh_token(
 
 
 def decode_token(token: str):
+    # Tokens that already passed verification are served from the cache until their exp
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         # TODO: Add issuer and audience validation
         payload = jwt.decode(
@@ -78,9 +147,11 @@ def decode_token(token: str):
             audience="client-web",
             issuer="client-core",
         )
-        return payload if payload.get("exp") >= datetime.now(timezone.utc).timestamp() else None
-    
-    
+        if payload.get("exp") < datetime.now(timezone.utc).timestamp():
+            return None
+        token_cache.put(token, payload)
+        return payload
+
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -130,11 +201,12 @@ def generate_otp(length: int = 6) -> str:
 
 
 # Hash OTP
-def hash_otp(otp: str) -> str:
-    return pwd_context.hash(otp)
+def hash_otp(otp: str, subject: str) -> str:
+    """HMAC-SHA256 digest of the OTP, bound to the subject it was issued for."""
+    message = f"{subject}:{otp}".encode()
+    return hmac.new(SECRET_KEY.encode(), message, hashlib.sha256).hexdigest()
 
 
 # Verify OTP
-def verify_otp(otp: str, hashed_otp: str) -> bool:
-    return pwd_context.verify(otp, hashed_otp)
-
+def verify_otp(otp: str, subject: str, hashed_otp: str) -> bool:
+    return hmac.compare_digest(hash_otp(otp, subject), hashed_otp)
@@ -1,5 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
 import uvicorn
 from app.core.config import settings
 from fastapi.middleware.cors import CORSMiddleware
@@ -11,6 +12,16 @@ from starlette.status import (
     HTTP_500_INTERNAL_SERVER_ERROR,
 )
 from app.schemas.common import APIError
+from app.core.hashing import hashing_executor
+from app.core.pubsub import pg_listener
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.security import calibrate_password_hashing
+from app.services.chat import run_chat_partition_maintenance
+from app.services.collaboration_graph import collaboration_index
+from app.services.facets import facet_cache
+from app.services.session_store import revoked_sessions
+from app.services.typeahead import run_typeahead_refresh
 import logging
 
 
@@ -35,8 +46,35 @@ redoc_url = (
     f"{settings.API_V1_STR}/redoc" if settings.ENVIRONMENT != "production" else None
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    rounds = await asyncio.to_thread(calibrate_password_hashing)
+    logger.info(f"Password hashing: bcrypt rounds={rounds}")
+    revocation_sync = asyncio.create_task(
+        revoked_sessions.run(settings.SESSION_REVOCATION_SYNC_SECONDS)
+    )
+    facet_refresh = asyncio.create_task(facet_cache.run(settings.FACET_REFRESH_SECONDS))
+    typeahead_refresh = asyncio.create_task(
+        run_typeahead_refresh(settings.TYPEAHEAD_REFRESH_SECONDS)
+    )
+    listener = asyncio.create_task(pg_listener.run())
+    partition_maintenance = asyncio.create_task(run_chat_partition_maintenance())
+    collaboration_refresh = asyncio.create_task(
+        collaboration_index.run(settings.COLLABORATION_GRAPH_REFRESH_SECONDS)
+    )
+    yield
+    collaboration_refresh.cancel()
+    partition_maintenance.cancel()
+    listener.cancel()
+    typeahead_refresh.cancel()
+    facet_refresh.cancel()
+    revocation_sync.cancel()
+    hashing_executor.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
+    lifespan=lifespan,
 )
 
 # Set all CORS enabled origins
@@ -50,6 +88,8 @@ if settings.all_cors_origins:
         expose_headers=["Content-Disposition"],
     )
 
+app.add_middleware(QueryStatsMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
@@ -57,7 +97,7 @@ app.include_router(api_router, prefix=settings.API_V1_STR)
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     logger.warning(f"Validation error: {exc.errors()}")
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=HTTP_422_UNPROCESSABLE_ENTITY,
         content=APIError(
             code="VALIDATION_ERROR",
@@ -77,7 +117,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 
     # If Internal Server Error, return 500
     if exc.status_code == 500:
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
             content=APIError(
                 code="INTERNAL_ERROR",
@@ -92,17 +132,19 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
         and "code" in exc.detail
         and "message" in exc.detail
     ):
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=exc.status_code,
             content=exc.detail,  # Already structured
+            headers=getattr(exc, "headers", None),
         )
 
     # Fallback to generic HTTP error
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=exc.status_code,
         content=APIError(
             code="ERROR", message=str(exc.detail), details=None
         ).model_dump(),
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -110,7 +152,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 @app.exception_handler(Exception)
 async def internal_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=HTTP_500_INTERNAL_SERVER_ERROR,
         content=APIError(
             code="INTERNAL_ERROR", message="An unexpected error occurred", details=None
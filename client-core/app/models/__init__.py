@@ -1,4 +1,8 @@
 from .company_db_tables import Company, Service, Project, Blog, Chat, Collaboration, Notification
 from .client_db_tables import Client
+from .notification_db_tables import NotificationUnreadCount
+from .otp_db_tables import OTPCode
+from .session_db_tables import ClientSession
+from .version_db_tables import CompanyVersion, TableVersion
 
-__all__ = ["Company", "Client", "Service", "Project", "Blog", "Chat", "Collaboration", "Notification"]
\ No newline at end of file
+__all__ = ["Company", "Client", "Service", "Project", "Blog", "Chat", "Collaboration", "Notification", "NotificationUnreadCount", "OTPCode", "ClientSession", "TableVersion", "CompanyVersion"]
\ No newline at end of file
@@ -1,6 +1,9 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 from uuid import UUID
+from sqlalchemy import Index, func
 from sqlmodel import Field, Relationship, SQLModel
+from app.models.fields import id_field, timestamp_field
 
 if TYPE_CHECKING:
     from app.models.company_db_tables import Company
@@ -8,18 +11,37 @@ if TYPE_CHECKING:
 class Client(SQLModel, table=True):
     __tablename__ = "clients"
     __table_args__ = {"schema": "public"}
-    client_id: Optional[UUID] = Field(default=None, primary_key=True)
+    client_id: Optional[UUID] = id_field()
     client_name: str = Field(index=True, max_length=100)
     client_username: str = Field(index=True, max_length=100)
-    client_email: str = Field(index=True, max_length=100)
+    client_email: str = Field(max_length=100)
     client_phone: Optional[str] = Field(default=None, max_length=15)
     client_address: Optional[str] = Field(default=None, max_length=255)
     role: str = Field(default="user", max_length=50)
     client_role_in_company: Optional[str] = Field(default=None, max_length=50)
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
     country: Optional[str] = Field(default=None, max_length=50)
     hashed_password: str = Field(nullable=False)
     company_id: Optional[UUID] = Field( foreign_key="public.companies.company_id")
 
-    company: Optional["Company"] = Relationship(back_populates="owner")
\ No newline at end of file
+    company: Optional["Company"] = Relationship(back_populates="owner")
+
+
+# Emails are unique case-insensitively; registration and login both go through lower(client_email)
+Index(
+    "ux_public_clients_client_email_lower",
+    func.lower(Client.client_email),
+    unique=True,
+)
+
+# Owner lookups by company
+Index("ix_public_clients_company_id_updated_at", Client.company_id, Client.updated_at)
+
+# Trigram index for the typeahead's fuzzy fallback (needs the pg_trgm extension)
+Index(
+    "ix_public_clients_client_name_trgm",
+    func.lower(Client.client_name).label("client_name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"client_name_lower": "gin_trgm_ops"},
+)
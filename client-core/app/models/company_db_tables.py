@@ -1,8 +1,11 @@
+from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
 from uuid import UUID
 # from app.models.client_db_tables import Client
+from sqlalchemy import Column, Computed, Index, Text, func
 from sqlmodel import Field, Relationship, SQLModel
+from app.models.fields import add_search_vector, id_field, timestamp_field
 
 if TYPE_CHECKING:
     from app.models.client_db_tables import Client
@@ -10,13 +13,13 @@ if TYPE_CHECKING:
 class Company(SQLModel, table=True):
     __tablename__ = "companies"
     __table_args__ = {"schema": "public"}
-    company_id: Optional[UUID] = Field(default=None, primary_key=True)
+    company_id: Optional[UUID] = id_field()
     company_name: str = Field(index=True, max_length=100)
     company_email: str = Field(index=True, max_length=100)
     company_phone: Optional[str] = Field(default=None, max_length=15)
     company_address: Optional[str] = Field(default=None, max_length=255)
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True, nullable=False)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
     country: Optional[str] = Field(default=None, max_length=50)
     logo_url: Optional[str] = None
     website_url: Optional[str] = None
@@ -28,48 +31,55 @@ class Company(SQLModel, table=True):
     # owner_id: int = Field( foreign_key="public.clients.client_id",)
 
 
-    services: List["Service"] = Relationship(back_populates="companies")
-    projects: List["Project"] = Relationship(back_populates="companies")
-    blogs: List["Blog"] = Relationship(back_populates="companies")
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
-
     # One-to-many reverse relation
     blogs: list["Blog"] = Relationship(back_populates="company")
-    owner: Optional["Client"] = Relationship(back_populates="company")
+    owner: Optional["Client"] = Relationship(
+        back_populates="company", sa_relationship_kwargs={"uselist": False}
+    )
     services: list["Service"] = Relationship(back_populates="company")
     projects: list["Project"] = Relationship(back_populates="company")
-    chats: list["Chat"] = Relationship(back_populates="company")
-    collaborations: list["Collaboration"] = Relationship(back_populates="company")
+    # Chats and collaborations link two companies; these are the ones this company started
+    chats: list["Chat"] = Relationship(
+        back_populates="company",
+        sa_relationship_kwargs={"foreign_keys": "[Chat.chat_from]"},
+    )
+    collaborations: list["Collaboration"] = Relationship(
+        back_populates="company",
+        sa_relationship_kwargs={"foreign_keys": "[Collaboration.collaboration_from]"},
+    )
+    notifications: list["Notification"] = Relationship(
+        back_populates="company",
+        sa_relationship_kwargs={"foreign_keys": "[Notification.company_id]"},
+    )
 
 class Service(SQLModel, table=True):
     __tablename__ = "services"
     __table_args__ = {"schema": "public"}
-    service_id:Optional[UUID] = Field(default=None, primary_key=True)
+    service_id: Optional[UUID] = id_field()
     name: str = Field(nullable=False)
     description: Optional[str] = None
     domain: Optional[str] = None
     company_id: Optional[UUID] = Field(foreign_key="public.companies.company_id")
     company: Optional[Company] = Relationship(back_populates="services")
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
 
 
 class Project(SQLModel, table=True):
     __tablename__ = "projects"
     __table_args__ = {"schema": "public"}
-    project_id: Optional[UUID] = Field(default=None, primary_key=True)
+    project_id: Optional[UUID] = id_field()
     title: str = Field(nullable=False)
     image: Optional[str] = None
     description: Optional[str] = None
     domain: Optional[str] = None
     website_url: Optional[str] = None
     tools: Optional[str] = None
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True, nullable=False)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
     status: Optional[str] = Field(default="active", max_length=50)
-    start_date: Optional[str] = Field(default=None)
-    end_date: Optional[str] = Field(default=None)
+    start_date: Optional[datetime] = timestamp_field()
+    end_date: Optional[datetime] = timestamp_field()
     metrics: Optional[str] = None
     company_id: Optional[UUID] = Field(foreign_key="public.companies.company_id")
     company: Optional[Company] = Relationship(back_populates="projects")
@@ -77,7 +87,7 @@ class Project(SQLModel, table=True):
 class Blog(SQLModel, table=True):
     __tablename__ = "blogs"
     __table_args__ = {"schema": "public"}
-    blog_id: Optional[UUID] = Field(default=None, primary_key=True)
+    blog_id: Optional[UUID] = id_field()
     title: str = Field(nullable=False)
     description: Optional[str] = None
     image: Optional[str] = None
@@ -85,47 +95,146 @@ class Blog(SQLModel, table=True):
 
     company_id: Optional[UUID] = Field(foreign_key="public.companies.company_id")
     company: Optional[Company] = Relationship(back_populates="blogs")
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True, nullable=False)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
 
 class Chat(SQLModel, table=True):
     __tablename__ = "chats"
-    __table_args__ = {"schema": "public"}
-    chat_id: Optional[UUID] = Field(default=None, primary_key=True)
+    # chat_id is UUIDv7, so ranges of it are months; see ensure_chat_partitions
+    __table_args__ = {"schema": "public", "postgresql_partition_by": "RANGE (chat_id)"}
+    chat_id: Optional[UUID] = id_field()
     chat_to: Optional[UUID] = Field(foreign_key="public.companies.company_id")
     chat_from:Optional[UUID] = Field(foreign_key="public.companies.company_id")
+    # Ordered pair of the two company ids, the same for both directions of a conversation
+    conversation_key: Optional[str] = Field(
+        default=None,
+        sa_column=Column(
+            "conversation_key",
+            Text,
+            Computed(
+                "least(chat_from, chat_to)::text || ':' || greatest(chat_from, chat_to)::text",
+                persisted=True,
+            ),
+        ),
+    )
     chat_message: str = Field(nullable=False)
-    chat_timestamp: Optional[str] = Field(default=None, index=True)
+    chat_timestamp: Optional[datetime] = timestamp_field(index=True, server_default=True)
     chat_status: Optional[str] = Field(default="active", max_length=50)
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
-    company: Optional[Company] = Relationship(back_populates="chats")
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    company: Optional[Company] = Relationship(
+        back_populates="chats",
+        sa_relationship_kwargs={"foreign_keys": "[Chat.chat_from]"},
+    )
 
 class Notification(SQLModel, table=True):
     __tablename__ = "notifications"
     __table_args__ = {"schema": "public"}
-    notification_id: Optional[UUID] = Field(default=None, primary_key=True)
+    notification_id: Optional[UUID] = id_field()
     notification_type: str = Field(nullable=False, max_length=50)
     notification_message: str = Field(nullable=False)
     notification_status: Optional[str] = Field(default="unread", max_length=50)
     notification_from: Optional[UUID] = Field(foreign_key="public.companies.company_id")
     notification_to: Optional[UUID] = Field(foreign_key="public.companies.company_id")
-    notification_timestamp: Optional[str] = Field(default=None, index=True)
-    notification_read_at: Optional[str] = Field(default=None, index=True)
+    notification_timestamp: Optional[datetime] = timestamp_field(index=True, server_default=True, nullable=False)
+    notification_read_at: Optional[datetime] = timestamp_field(index=True)
     notification_priority: Optional[str] = Field(default="normal", max_length=50)
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
 
     company_id: Optional[UUID] = Field(foreign_key="public.companies.company_id")
-    company: Optional[Company] = Relationship(back_populates="notifications")
+    company: Optional[Company] = Relationship(
+        back_populates="notifications",
+        sa_relationship_kwargs={"foreign_keys": "[Notification.company_id]"},
+    )
 
 class Collaboration(SQLModel, table=True):
     __tablename__ = "collaborations"
     __table_args__ = {"schema": "public"}
-    collaboration_id: Optional[UUID] = Field(default=None, primary_key=True)
+    collaboration_id: Optional[UUID] = id_field()
     collaboration_from: Optional[UUID] = Field(foreign_key="public.companies.company_id")
     collaboration_to: Optional[UUID] =Field(foreign_key="public.companies.company_id")
     collaboration_status: Optional[str] = Field(default="active", max_length=50)
-    created_at: Optional[str] = Field(default=None, index=True)
-    updated_at: Optional[str] = Field(default=None, index=True)
-    company: Optional[Company] = Relationship(back_populates="collaborations")
\ No newline at end of file
+    created_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    updated_at: Optional[datetime] = timestamp_field(index=True, server_default=True)
+    company: Optional[Company] = Relationship(
+        back_populates="collaborations",
+        sa_relationship_kwargs={"foreign_keys": "[Collaboration.collaboration_from]"},
+    )
+
+
+# Keyset pagination indexes: (sort column, primary key) so every page is one index range scan
+Index("ix_public_companies_created_at_company_id", Company.created_at, Company.company_id)
+Index("ix_public_companies_company_name_company_id", Company.company_name, Company.company_id)
+Index("ix_public_projects_created_at_project_id", Project.created_at, Project.project_id)
+Index("ix_public_blogs_created_at_blog_id", Blog.created_at, Blog.blog_id)
+# Descending pages order DESC NULLS LAST, which the ascending indexes cannot serve
+Index(
+    "ix_public_companies_company_name_desc_company_id",
+    Company.company_name.desc().nulls_last(),
+    Company.company_id.desc(),
+)
+Index(
+    "ix_public_companies_created_at_desc_company_id",
+    Company.created_at.desc().nulls_last(),
+    Company.company_id.desc(),
+)
+Index(
+    "ix_public_projects_created_at_desc_project_id",
+    Project.created_at.desc().nulls_last(),
+    Project.project_id.desc(),
+)
+Index("ix_public_blogs_created_at_desc_blog_id", Blog.created_at.desc().nulls_last(), Blog.blog_id.desc())
+Index("ix_public_chats_conversation_key_chat_id", Chat.conversation_key, Chat.chat_id)
+# Trigram index for the typeahead's fuzzy fallback (needs the pg_trgm extension)
+Index(
+    "ix_public_companies_company_name_trgm",
+    func.lower(Company.company_name).label("company_name_lower"),
+    postgresql_using="gin",
+    postgresql_ops={"company_name_lower": "gin_trgm_ops"},
+)
+Index(
+    "ix_public_notifications_to_timestamp_id",
+    Notification.notification_to,
+    Notification.notification_timestamp,
+    Notification.notification_id,
+)
+Index(
+    "ix_public_notifications_to_timestamp_desc_id",
+    Notification.notification_to,
+    Notification.notification_timestamp.desc().nulls_last(),
+    Notification.notification_id.desc(),
+)
+# Last-Event-ID replay for the notification stream
+Index("ix_public_notifications_to_id", Notification.notification_to, Notification.notification_id)
+# Unread rows only: stays small however many notifications have been read
+Index(
+    "ix_public_notifications_unread",
+    Notification.notification_to,
+    Notification.notification_timestamp,
+    postgresql_where=Notification.notification_status == "unread",
+)
+# Per-company lookups for profiles and their child counts
+Index("ix_public_services_company_id_updated_at", Service.company_id, Service.updated_at)
+Index("ix_public_projects_company_id_updated_at", Project.company_id, Project.updated_at)
+Index("ix_public_blogs_company_id_updated_at", Blog.company_id, Blog.updated_at)
+# Both directions of the active collaboration graph, for the recursive-CTE fallback
+Index(
+    "ix_public_collaborations_active_from_to",
+    Collaboration.collaboration_from,
+    Collaboration.collaboration_to,
+    postgresql_where=Collaboration.collaboration_status == "active",
+)
+Index(
+    "ix_public_collaborations_active_to_from",
+    Collaboration.collaboration_to,
+    Collaboration.collaboration_from,
+    postgresql_where=Collaboration.collaboration_status == "active",
+)
+
+
+# Full-text search: weighted, generated tsvector columns behind GIN indexes
+add_search_vector(Company, {"company_name": "A", "bio": "B", "about": "C", "vision": "C"})
+add_search_vector(Project, {"title": "A", "description": "B", "tools": "C"})
+add_search_vector(Blog, {"title": "A", "description": "B", "content": "C"})
+add_search_vector(Service, {"name": "A", "domain": "B", "description": "B"})
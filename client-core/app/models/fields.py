@@ -0,0 +1,66 @@
+import os
+import time
+from typing import Any
+from uuid import UUID
+from sqlalchemy import Column, Computed, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlmodel import Field, SQLModel
+
+# Text search configuration for generated tsvector columns and their queries
+SEARCH_CONFIG = "english"
+
+
+def uuid7() -> UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7).
+
+    The leading 48 bits are the Unix time in milliseconds and the rest is
+    random. New keys therefore land on the right-most pages of the primary key
+    index instead of being scattered across it like UUIDv4.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return UUID(int=value)
+
+
+def id_field() -> Any:
+    """UUIDv7 primary key, generated for ORM objects and Core inserts alike."""
+    return Field(
+        default_factory=uuid7,
+        primary_key=True,
+        sa_column_kwargs={"default": uuid7},
+    )
+
+
+def timestamp_field(index: bool = False, server_default: bool = False, nullable: bool = True) -> Any:
+    """timestamptz column; ``server_default`` fills it with now() on insert."""
+    return Field(
+        default=None,
+        index=index,
+        nullable=nullable,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()} if server_default else {},
+    )
+
+
+def add_search_vector(model: type[SQLModel], weighted_columns: dict[str, str]) -> Column:
+    """
+    Add a generated ``search_vector`` tsvector column with a GIN index.
+
+    ``weighted_columns`` maps column name to ts_rank weight (A-D). The column
+    is left unmapped, so ``select(model)`` never loads it.
+    """
+    expression = " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({name}, '')), '{weight}')"
+        for name, weight in weighted_columns.items()
+    )
+    column = Column("search_vector", TSVECTOR, Computed(expression, persisted=True))
+    model.__table__.append_column(column)
+    Index(
+        f"ix_public_{model.__tablename__}_search_vector",
+        column,
+        postgresql_using="gin",
+    )
+    return column
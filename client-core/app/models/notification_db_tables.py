@@ -0,0 +1,11 @@
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+
+class NotificationUnreadCount(SQLModel, table=True):
+    """Unread notifications per recipient, kept exact by triggers on notifications."""
+
+    __tablename__ = "notification_unread_counts"
+    __table_args__ = {"schema": "public"}
+    company_id: UUID = Field(primary_key=True, foreign_key="public.companies.company_id")
+    unread_count: int = Field(default=0, nullable=False)
@@ -0,0 +1,14 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+
+class OTPCode(SQLModel, table=True):
+    __tablename__ = "otp_codes"
+    __table_args__ = {"schema": "public"}
+    subject: str = Field(primary_key=True, max_length=100)
+    otp_digest: str = Field(nullable=False, max_length=64)
+    attempts: int = Field(default=0, nullable=False)
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True)
+    )
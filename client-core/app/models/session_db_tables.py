@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+from app.models.fields import id_field
+
+
+class ClientSession(SQLModel, table=True):
+    __tablename__ = "client_sessions"
+    __table_args__ = {"schema": "public"}
+    session_id: UUID = id_field()
+    client_id: UUID = Field(foreign_key="public.clients.client_id", index=True)
+    refresh_jti: UUID = Field(nullable=False)
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    expires_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False)
+    )
+    revoked_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True, index=True)
+    )
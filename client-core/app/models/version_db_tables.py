@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import BigInteger, SmallInteger
+from sqlmodel import Field, SQLModel
+from app.models.fields import timestamp_field
+
+# table_versions rows per table; writers on different backends bump different rows
+TABLE_VERSION_SHARDS = 16
+
+
+class TableVersion(SQLModel, table=True):
+    """
+    Write counter per table, bumped by statement-level triggers; backs list ETags.
+
+    Each table's counter is split over TABLE_VERSION_SHARDS rows picked by
+    backend pid, so concurrent writers rarely wait on the same row lock. The
+    table's version is the sum of its shards.
+    """
+
+    __tablename__ = "table_versions"
+    __table_args__ = {"schema": "public"}
+    table_name: str = Field(primary_key=True, max_length=63)
+    shard: int = Field(default=0, primary_key=True, sa_type=SmallInteger)
+    version: int = Field(default=0, nullable=False, sa_type=BigInteger)
+    modified_at: Optional[datetime] = timestamp_field(server_default=True)
+
+
+class CompanyVersion(SQLModel, table=True):
+    """
+    Write counter per company over the company and its owner, services,
+    projects and blogs; backs profile ETags and Last-Modified.
+
+    Deletes bump it too, so Last-Modified moves forward when a child goes.
+    """
+
+    __tablename__ = "company_versions"
+    __table_args__ = {"schema": "public"}
+    company_id: UUID = Field(primary_key=True)
+    version: int = Field(default=0, nullable=False, sa_type=BigInteger)
+    modified_at: Optional[datetime] = timestamp_field(server_default=True)
@@ -1,65 +1,114 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlmodel import Session, select
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.models import Client
-from app.schemas.client import ClientCreate
-from app.core.security import create_access_token, generate_otp, get_password_hash, verify_password
+from app.schemas.client import ClientCreate, RefreshRequest
+from app.core.security import decode_refresh_token, generate_otp, get_password_hash_async, needs_rehash, verify_password_async
 from app.core.database import get_session  # Make sure to provide DB session dependency
+from app.core.deps import get_token_payload
+from app.services.otp_store import OTPVerifyResult, otp_store
+from app.services.passwords import rehash_password
+from app.services.session_store import create_session, revoke_session, rotate_session
+from app.services.typeahead import client_typeahead
 
 router = APIRouter()
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register_user(user_create: ClientCreate, session: Session = Depends(get_session)):
-    existing_user = session.exec(select(Client).where(Client.client_email == user_create.client_email)).first()
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Email already registered")
+async def register_user(user_create: ClientCreate, session: AsyncSession = Depends(get_session)):
+    hashed_pw = await get_password_hash_async(user_create.hashed_password)
 
-    hashed_pw = get_password_hash(user_create.hashed_password)
-    db_user = Client(
-        client_email=user_create.client_email,
-        client_name=user_create.client_name,
-        client_username=user_create.client_username,
-        hashed_password=hashed_pw,
-        client_role="user",
-        client_role_in_company=user_create.client_role_in_company,
-        country=user_create.country,
-        client_phone=user_create.client_phone,
-        client_address=user_create.client_address,
-        company_id=user_create.company_id,
+    # Single round trip: the unique lower(client_email) index rejects duplicates atomically
+    statement = (
+        insert(Client)
+        .values(
+            client_email=user_create.client_email,
+            client_name=user_create.client_name,
+            client_username=user_create.client_username,
+            hashed_password=hashed_pw,
+            role="user",
+            client_role_in_company=user_create.client_role_in_company,
+            country=user_create.country,
+            client_phone=user_create.client_phone,
+            client_address=user_create.client_address,
+            company_id=user_create.company_id,
+        )
+        .on_conflict_do_nothing(index_elements=[func.lower(Client.client_email)])
+        .returning(Client.client_id)
     )
-    session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    client_id = (await session.execute(statement)).scalar_one_or_none()
+    await session.commit()
+    if client_id is None:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    # Core inserts bypass the ORM events; apply() also queues it if a refresh is rebuilding the index
+    client_typeahead.apply(client_id, user_create.client_name)
     return {"msg": "User registered successfully"}
 
 
 @router.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
-    user = session.exec(select(Client).where(Client.client_email == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+async def login(
+    background_tasks: BackgroundTasks,
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    session: AsyncSession = Depends(get_session),
+):
+    user = (await session.exec(select(Client).where(func.lower(Client.client_email) == form_data.username.lower()))).first()
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    
-    access_token = create_access_token({"sub": user.client_email})
-    return {"access_token": access_token, "token_type": "bearer"}
+
+    # Upgrade hashes made at an older cost without delaying the response
+    if needs_rehash(user.hashed_password):
+        background_tasks.add_task(rehash_password, user.client_id, form_data.password, user.hashed_password)
+
+    return await create_session(session, user)
 
 
 @router.post("/login/otp/request")
-def request_otp(email: str, session: Session = Depends(get_session)):
-    user = session.exec(select(Client).where(Client.client_email == email)).first()
+async def request_otp(email: str, session: AsyncSession = Depends(get_session)):
+    user = (await session.exec(select(Client).where(func.lower(Client.client_email) == email.lower()))).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
     otp = generate_otp()
-    
-    # Save OTP and expiry in DB or in-memory cache keyed by user (not shown)
+    await otp_store.issue(email.lower(), otp)
+
     # Trigger email or SMS send with the OTP here
-    
+
     return {"msg": "OTP sent"}
 
 @router.post("/login/otp/verify")
-def verify_otp(email: str, otp: str):
-    # Verify OTP against stored value and expiry
-    
-    # If valid, create and return JWT token
-    access_token = create_access_token({"sub": email})
-    return {"access_token": access_token, "token_type": "bearer"}
+async def verify_otp(email: str, otp: str, session: AsyncSession = Depends(get_session)):
+    result = await otp_store.verify(email.lower(), otp)
+    if result == OTPVerifyResult.EXPIRED:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="OTP expired or not requested")
+    if result == OTPVerifyResult.LOCKED:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Too many invalid attempts, request a new OTP")
+    if result != OTPVerifyResult.VALID:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid OTP")
+
+    user = (await session.exec(select(Client).where(func.lower(Client.client_email) == email.lower()))).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return await create_session(session, user)
+
+
+@router.post("/refresh")
+async def refresh(body: RefreshRequest, session: AsyncSession = Depends(get_session)):
+    # In the body, not the query string, so the token never lands in access logs
+    payload = decode_refresh_token(body.refresh_token)
+    if payload.get("type") != "refresh" or not payload.get("sid"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    tokens = await rotate_session(session, payload)
+    if tokens is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token has been revoked")
+    return tokens
+
+
+@router.post("/logout")
+async def logout(payload: dict = Depends(get_token_payload), session: AsyncSession = Depends(get_session)):
+    if payload.get("sid"):
+        await revoke_session(session, UUID(payload["sid"]))
+    return {"msg": "Logged out"}
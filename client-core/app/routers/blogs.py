@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.conditional import is_not_modified, make_validator, not_modified
+from app.core.database import get_read_session
+from app.core.responses import FastJSONResponse
+from app.models import Blog
+from app.schemas.common import Page
+from app.schemas.company import BlogFilters, BlogRead
+from app.services.utils import create_filter_deps, get_cached_page
+from app.services.versions import get_table_version
+
+router = APIRouter(prefix="/blogs", tags=["blogs"])
+
+
+@router.get("", response_model=Page[BlogRead])
+async def list_blogs(
+    request: Request,
+    filters: BlogFilters = Depends(create_filter_deps(BlogFilters)),
+    session: AsyncSession = Depends(get_read_session),
+):
+    headers = {}
+    version = await get_table_version(session, Blog)
+    if version is not None:
+        validator = make_validator(request, version[0], version[1])
+        if is_not_modified(request, validator):
+            return not_modified(validator)
+        headers = validator.headers()
+    # Already-encoded JSON, so response_model only documents the shape
+    body = await get_cached_page(request, session, Blog, filters, BlogRead, version)
+    return FastJSONResponse(body, headers=headers)
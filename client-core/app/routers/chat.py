@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+from uuid import UUID
+from typing import Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    Query,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.config import settings
+from app.core.database import async_session_maker, get_read_session
+from app.core.deps import get_current_company_id, verify_connection_token
+from app.schemas.common import Page
+from app.schemas.company import ChatMessageIn, ChatRead
+from app.services.chat import (
+    ChatConnection,
+    chat_registry,
+    get_conversation_page,
+    message_too_large,
+    send_chat_message,
+)
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+
+def _error_frame(code: str, ref: str | None = None, details=None) -> str:
+    return json.dumps({"type": "error", "code": code, "ref": ref, "details": details}, default=str)
+
+
+async def _receive(websocket: WebSocket, connection: ChatConnection) -> None:
+    while True:
+        raw = await websocket.receive_text()
+        try:
+            incoming = ChatMessageIn.model_validate_json(raw)
+        except ValidationError as e:
+            connection.offer(_error_frame("INVALID_MESSAGE", details=e.errors(include_url=False)))
+            continue
+        if message_too_large(incoming.chat_message):
+            connection.offer(_error_frame("MESSAGE_TOO_LARGE", incoming.ref))
+            continue
+
+        # One short transaction per message; the socket never pins a pooled connection
+        try:
+            async with async_session_maker() as session:
+                chat = await send_chat_message(
+                    session, connection.company_id, incoming.chat_to, incoming.chat_message
+                )
+        except IntegrityError:
+            connection.offer(_error_frame("UNKNOWN_RECIPIENT", incoming.ref))
+            continue
+        connection.offer(
+            json.dumps({"type": "ack", "chat_id": str(chat.chat_id), "ref": incoming.ref})
+        )
+
+
+@router.websocket("/ws")
+async def chat_socket(websocket: WebSocket):
+    payload = verify_connection_token(websocket)
+    if payload is None or not payload.get("company_id"):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    connection = ChatConnection(
+        websocket, UUID(payload["company_id"]), settings.CHAT_SEND_QUEUE_SIZE
+    )
+    chat_registry.add(connection)
+    tasks = [
+        asyncio.create_task(_receive(websocket, connection)),
+        asyncio.create_task(connection.pump()),
+        asyncio.create_task(connection.overflowed.wait()),
+    ]
+    try:
+        # The socket is closed when the access token it was opened with expires
+        done, _ = await asyncio.wait(
+            tasks,
+            timeout=max(payload["exp"] - time.time(), 0),
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        if not done:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="token expired")
+        elif connection.overflowed.is_set():
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="slow consumer")
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        chat_registry.remove(connection)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.get("/conversations/{other_company_id}", response_model=Page[ChatRead])
+async def get_conversation_history(
+    other_company_id: UUID,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    company_id: UUID = Depends(get_current_company_id),
+    session: AsyncSession = Depends(get_read_session),
+):
+    return await get_conversation_page(session, company_id, other_company_id, cursor, limit)
@@ -0,0 +1,45 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_read_session
+from app.schemas.company import CollaborationPartners, CollaborationSuggestion
+from app.services.collaboration_graph import (
+    get_mutual_partners,
+    get_partners,
+    get_suggestions,
+)
+
+router = APIRouter(prefix="/collaborations", tags=["collaborations"])
+
+
+@router.get("/{company_id}/partners", response_model=CollaborationPartners)
+async def list_partners(
+    company_id: UUID,
+    session: AsyncSession = Depends(get_read_session),
+):
+    partners = await get_partners(session, company_id)
+    return CollaborationPartners(company_id=company_id, partners=partners)
+
+
+@router.get("/{company_id}/mutual/{other_company_id}", response_model=CollaborationPartners)
+async def list_mutual_partners(
+    company_id: UUID,
+    other_company_id: UUID,
+    session: AsyncSession = Depends(get_read_session),
+):
+    partners = await get_mutual_partners(session, company_id, other_company_id)
+    return CollaborationPartners(company_id=company_id, partners=partners)
+
+
+@router.get("/{company_id}/suggestions", response_model=List[CollaborationSuggestion])
+async def list_suggestions(
+    company_id: UUID,
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_session),
+):
+    suggestions = await get_suggestions(session, company_id, limit)
+    return [
+        CollaborationSuggestion(company_id=suggested, mutual_count=count)
+        for suggested, count in suggestions
+    ]
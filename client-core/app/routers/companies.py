@@ -0,0 +1,64 @@
+from typing import List
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.conditional import is_not_modified, make_validator, not_modified
+from app.core.database import get_read_session
+from app.core.responses import FastJSONResponse
+from app.models import Company
+from app.schemas.common import FilterOption, Page
+from app.schemas.company import CompanyFilters, CompanyProfile, CompanyRead
+from app.services.companies import get_company_profile
+from app.services.utils import (
+    create_filter_deps,
+    get_cached_page,
+    get_filter_metadata,
+)
+from app.services.versions import get_company_profile_version, get_table_version
+
+router = APIRouter(prefix="/companies", tags=["companies"])
+
+
+@router.get("", response_model=Page[CompanyRead])
+async def list_companies(
+    request: Request,
+    filters: CompanyFilters = Depends(create_filter_deps(CompanyFilters)),
+    session: AsyncSession = Depends(get_read_session),
+):
+    headers = {}
+    version = await get_table_version(session, Company)
+    if version is not None:
+        validator = make_validator(request, version[0], version[1])
+        if is_not_modified(request, validator):
+            return not_modified(validator)
+        headers = validator.headers()
+    # Already-encoded JSON, so response_model only documents the shape
+    body = await get_cached_page(request, session, Company, filters, CompanyRead, version)
+    return FastJSONResponse(body, headers=headers)
+
+
+@router.get("/facets", response_model=List[FilterOption])
+async def get_company_facets():
+    return get_filter_metadata(Company, CompanyFilters)
+
+
+@router.get("/{company_id}/profile", response_model=CompanyProfile)
+async def get_profile(
+    request: Request,
+    response: Response,
+    company_id: UUID,
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_session),
+):
+    version = await get_company_profile_version(session, company_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    validator = make_validator(request, *version)
+    if is_not_modified(request, validator):
+        return not_modified(validator)
+
+    profile = await get_company_profile(session, company_id, limit, version[0])
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    response.headers.update(validator.headers())
+    return profile
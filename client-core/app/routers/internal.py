@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from app.core.cache import app_cache
+from app.core.deps import require_internal_token
+from app.core.hashing import hashing_executor
+from app.core.pool_metrics import pool_metrics
+from app.core.pubsub import pg_listener
+from app.core.responses import FastJSONResponse
+from app.core.token_cache import token_cache
+from app.services.chat import chat_registry
+from app.services.collaboration_graph import collaboration_index
+from app.services.notifications import notification_hub
+from app.services.session_store import revoked_sessions
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    include_in_schema=False,
+    dependencies=[Depends(require_internal_token)],
+    default_response_class=FastJSONResponse,
+)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    return {
+        "db_pool": pool_metrics.stats(),
+        "hashing": hashing_executor.stats(),
+        "token_cache": token_cache.stats(),
+        "cache": app_cache.stats(),
+        "revoked_sessions": len(revoked_sessions),
+        "chat": {**chat_registry.stats(), "listening": pg_listener.connected},
+        "notification_streams": notification_hub.stats(),
+        "collaboration_graph": collaboration_index.stats(),
+    }
@@ -2,8 +2,25 @@ from fastapi import APIRouter
 from app.services.utils import common_error_responses
 from app.routers import (
     auth,
-    
+    blogs,
+    chat,
+    collaborations,
+    companies,
+    internal,
+    notifications,
+    projects,
+    search,
+    typeahead,
 )
 
 api_router = APIRouter(responses=common_error_responses)
 api_router.include_router(auth.router)
+api_router.include_router(companies.router)
+api_router.include_router(projects.router)
+api_router.include_router(blogs.router)
+api_router.include_router(notifications.router)
+api_router.include_router(chat.router)
+api_router.include_router(collaborations.router)
+api_router.include_router(search.router)
+api_router.include_router(typeahead.router)
+api_router.include_router(internal.router)
@@ -0,0 +1,104 @@
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_read_session, get_session
+from app.core.deps import get_current_company_id, verify_connection_token
+from app.models import Notification
+from app.schemas.common import FilterOption, Page
+from app.schemas.company import (
+    NotificationFilters,
+    NotificationMarkRead,
+    NotificationRead,
+    NotificationUnreadSummary,
+)
+from app.services.notifications import get_unread_count, mark_read, notification_events
+from app.services.utils import (
+    create_filter_deps,
+    get_filter_metadata,
+    get_paginated_page,
+)
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+@router.get("", response_model=Page[NotificationRead])
+async def list_notifications(
+    filters: NotificationFilters = Depends(create_filter_deps(NotificationFilters)),
+    company_id: UUID = Depends(get_current_company_id),
+    session: AsyncSession = Depends(get_read_session),
+):
+    return await get_paginated_page(
+        session,
+        Notification,
+        filters,
+        custom_where=[Notification.notification_to == company_id],
+    )
+
+
+@router.get("/facets", response_model=List[FilterOption])
+async def get_notification_facets(
+    company_id: UUID = Depends(get_current_company_id),
+):
+    # The cached counts span every company, so only the option values are exposed
+    return get_filter_metadata(Notification, NotificationFilters, include_counts=False)
+
+
+@router.get("/unread-count", response_model=NotificationUnreadSummary)
+async def get_notification_unread_count(
+    company_id: UUID = Depends(get_current_company_id),
+    session: AsyncSession = Depends(get_read_session),
+):
+    return NotificationUnreadSummary(unread=await get_unread_count(session, company_id))
+
+
+@router.post("/mark-read", response_model=NotificationUnreadSummary)
+async def mark_notifications_read(
+    body: NotificationMarkRead,
+    company_id: UUID = Depends(get_current_company_id),
+    session: AsyncSession = Depends(get_session),
+):
+    updated = await mark_read(session, company_id, body.notification_ids)
+    return NotificationUnreadSummary(
+        unread=await get_unread_count(session, company_id), updated=updated
+    )
+
+
+@router.post("/mark-all-read", response_model=NotificationUnreadSummary)
+async def mark_all_notifications_read(
+    company_id: UUID = Depends(get_current_company_id),
+    session: AsyncSession = Depends(get_session),
+):
+    updated = await mark_read(session, company_id)
+    return NotificationUnreadSummary(
+        unread=await get_unread_count(session, company_id), updated=updated
+    )
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
+    payload = verify_connection_token(request)
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+        )
+    if not payload.get("company_id"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Client is not linked to a company",
+        )
+    try:
+        resume_from = UUID(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    return StreamingResponse(
+        notification_events(UUID(payload["company_id"]), resume_from, payload["exp"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
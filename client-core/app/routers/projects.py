@@ -0,0 +1,40 @@
+from typing import List
+from fastapi import APIRouter, Depends, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.conditional import is_not_modified, make_validator, not_modified
+from app.core.database import get_read_session
+from app.core.responses import FastJSONResponse
+from app.models import Project
+from app.schemas.common import FilterOption, Page
+from app.schemas.company import ProjectFilters, ProjectRead
+from app.services.utils import (
+    create_filter_deps,
+    get_cached_page,
+    get_filter_metadata,
+)
+from app.services.versions import get_table_version
+
+router = APIRouter(prefix="/projects", tags=["projects"])
+
+
+@router.get("", response_model=Page[ProjectRead])
+async def list_projects(
+    request: Request,
+    filters: ProjectFilters = Depends(create_filter_deps(ProjectFilters)),
+    session: AsyncSession = Depends(get_read_session),
+):
+    headers = {}
+    version = await get_table_version(session, Project)
+    if version is not None:
+        validator = make_validator(request, version[0], version[1])
+        if is_not_modified(request, validator):
+            return not_modified(validator)
+        headers = validator.headers()
+    # Already-encoded JSON, so response_model only documents the shape
+    body = await get_cached_page(request, session, Project, filters, ProjectRead, version)
+    return FastJSONResponse(body, headers=headers)
+
+
+@router.get("/facets", response_model=List[FilterOption])
+async def get_project_facets():
+    return get_filter_metadata(Project, ProjectFilters)
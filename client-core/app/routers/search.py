@@ -0,0 +1,21 @@
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_read_session
+from app.schemas.common import Page
+from app.schemas.search import SearchEntityType, SearchHit, SearchQuery
+from app.services.search import search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=Page[SearchHit])
+async def search_everything(
+    q: str = Query(min_length=1, max_length=200),
+    types: Optional[List[SearchEntityType]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: AsyncSession = Depends(get_read_session),
+):
+    params = SearchQuery(q=q, types=types, limit=limit, cursor=cursor)
+    return await search(session, params)
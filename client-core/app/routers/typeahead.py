@@ -0,0 +1,30 @@
+from typing import List
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.database import get_read_session
+from app.core.deps import get_token_payload
+from app.schemas.search import TypeaheadMatch
+from app.services.typeahead import client_typeahead, company_typeahead
+
+router = APIRouter(prefix="/typeahead", tags=["search"])
+
+
+@router.get("/companies", response_model=List[TypeaheadMatch])
+async def suggest_companies(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    session: AsyncSession = Depends(get_read_session),
+):
+    matches = await company_typeahead.suggest(session, q, limit)
+    return [TypeaheadMatch(id=i, name=name, fuzzy=fuzzy) for i, name, fuzzy in matches]
+
+
+@router.get("/clients", response_model=List[TypeaheadMatch])
+async def suggest_clients(
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=25),
+    payload: dict = Depends(get_token_payload),
+    session: AsyncSession = Depends(get_read_session),
+):
+    matches = await client_typeahead.suggest(session, q, limit)
+    return [TypeaheadMatch(id=i, name=name, fuzzy=fuzzy) for i, name, fuzzy in matches]
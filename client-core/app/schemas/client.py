@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
 class ClientBase(BaseModel):
@@ -11,7 +13,7 @@ class ClientBase(BaseModel):
     client_role: Optional[str] = "user"
     client_role_in_company: Optional[str] = None
     country: Optional[str] = None
-    company_id: Optional[str]  # UUID as string for input/output
+    company_id: Optional[UUID] = None
 
 
 class ClientCreate(ClientBase):
@@ -19,9 +21,12 @@ class ClientCreate(ClientBase):
 
 
 class ClientRead(ClientBase):
-    client_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    client_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
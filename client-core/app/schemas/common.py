@@ -1,4 +1,9 @@
-from pydantic import BaseModel
+from datetime import datetime
+from enum import Enum
+from typing import Any, ClassVar, Generic, List, Literal, Optional, TypeVar
+from pydantic import BaseModel, ConfigDict, Field
+
+T = TypeVar("T")
 
 
 class APIError(BaseModel):
@@ -6,3 +11,93 @@ class APIError(BaseModel):
     message: str
     details: dict | list | None = None
 
+
+class SortDirection(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+
+class FilterType(str, Enum):
+    SINGLE_SELECT = "single_select"
+    MULTI_SELECT = "multi_select"
+    DATE_RANGE = "date_range"
+
+
+class FilterOption(BaseModel):
+    key: str
+    label: str
+    options: List[Any]
+    filter_type: FilterType
+    # Rows per option value, for facets served from the facet cache
+    counts: Optional[dict[str, int]] = None
+
+
+class DateRange(BaseModel):
+    from_date: Optional[datetime] = None
+    to_date: Optional[datetime] = None
+
+
+class FilterModelWithFields(BaseModel):
+    """
+    Base for list-endpoint filters.
+
+    Subclasses declare their filter fields as regular model fields (lists for
+    multi-select) and ``<field>_from``/``<field>_to`` pairs for every entry in
+    ``date_range_fields``. Paging is keyset based: ``cursor`` is the opaque
+    ``next_cursor`` from the previous page.
+    """
+
+    search: Optional[str] = None
+    sort_by: Optional[str] = None
+    sort_direction: SortDirection = SortDirection.DESC
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = None
+    # "exact" runs count(*), "estimate" reads the planner's table size, "none" skips it
+    count: Literal["none", "exact", "estimate"] = "none"
+
+    searchable_fields: ClassVar[List[str]] = []
+    # Keyset sort keys: NOT NULL columns with ASC and DESC NULLS LAST (column, pk) indexes
+    valid_sort_fields: ClassVar[List[str]] = ["created_at"]
+    default_sort_field: ClassVar[str] = "created_at"
+    date_range_fields: ClassVar[List[str]] = []
+    # field -> "sql" (cached facet, the default), a static list, an Enum, or None for no options
+    filter_sources: ClassVar[dict[str, Any]] = {}
+
+    @property
+    def filterable_fields(self) -> List[str]:
+        base_fields = FilterModelWithFields.model_fields
+        range_fields = {
+            f"{field}_{bound}"
+            for field in self.date_range_fields
+            for bound in ("from", "to")
+        }
+        return [
+            field
+            for field in type(self).model_fields
+            if field not in base_fields and field not in range_fields
+        ]
+
+    @property
+    def date_range_filter_fields(self) -> dict[str, DateRange]:
+        return {
+            field: DateRange(
+                from_date=getattr(self, f"{field}_from", None),
+                to_date=getattr(self, f"{field}_to", None),
+            )
+            for field in self.date_range_fields
+        }
+
+    @property
+    def effective_sort_field(self) -> str:
+        if self.sort_by and self.sort_by in self.valid_sort_fields:
+            return self.sort_by
+        return self.default_sort_field
+
+
+class Page(BaseModel, Generic[T]):
+    model_config = ConfigDict(from_attributes=True)
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
@@ -1,5 +1,8 @@
-from typing import List, Optional
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import ClassVar, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from app.schemas.common import FilterModelWithFields
 
 
 # -------------------
@@ -20,15 +23,14 @@ class CompanyBase(BaseModel):
     about: Optional[str] = None
 
 class CompanyCreate(CompanyBase):
-    owner_id: int
+    owner_id: Optional[UUID] = None
 
 class CompanyRead(CompanyBase):
-    company_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    company_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # -------------------
@@ -39,18 +41,17 @@ class ServiceBase(BaseModel):
     name: str
     description: Optional[str] = None
     domain: Optional[str] = None
-    company_id: int
+    company_id: Optional[UUID] = None
 
 class ServiceCreate(ServiceBase):
     pass
 
 class ServiceRead(ServiceBase):
-    service_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    service_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # -------------------
@@ -65,21 +66,20 @@ class ProjectBase(BaseModel):
     website_url: Optional[str] = None
     tools: Optional[str] = None
     status: Optional[str] = "active"
-    start_date: Optional[str] = None
-    end_date: Optional[str] = None
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
     metrics: Optional[str] = None
-    company_id: int
+    company_id: Optional[UUID] = None
 
 class ProjectCreate(ProjectBase):
     pass
 
 class ProjectRead(ProjectBase):
-    project_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    project_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # -------------------
@@ -91,18 +91,39 @@ class BlogBase(BaseModel):
     description: Optional[str] = None
     image: Optional[str] = None
     content: str
-    company_id: int
+    company_id: Optional[UUID] = None
 
 class BlogCreate(BlogBase):
     pass
 
 class BlogRead(BlogBase):
-    id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    blog_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+# -------------------
+# Company Profile Schemas
+# -------------------
+
+class CompanyOwner(BaseModel):
+    client_id: UUID
+    client_name: str
+    client_role_in_company: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CompanyProfile(CompanyRead):
+    owner: Optional[CompanyOwner] = None
+    # Newest first, capped by the request's limit; the totals count every row
+    services: List[ServiceRead] = []
+    projects: List[ProjectRead] = []
+    blogs: List[BlogRead] = []
+    services_total: int = 0
+    projects_total: int = 0
+    blogs_total: int = 0
 
 
 # -------------------
@@ -110,22 +131,28 @@ class BlogRead(BlogBase):
 # -------------------
 
 class ChatBase(BaseModel):
-    chat_to: Optional[str] = None
-    chat_from: Optional[str] = None
+    chat_to: Optional[UUID] = None
+    chat_from: Optional[UUID] = None
     chat_message: str
-    chat_timestamp: Optional[str] = None
+    chat_timestamp: Optional[datetime] = None
     chat_status: Optional[str] = "active"
 
 class ChatCreate(ChatBase):
     pass
 
 class ChatRead(ChatBase):
-    chat_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    chat_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+class ChatMessageIn(BaseModel):
+    """Frame a client sends over the chat WebSocket."""
+    chat_to: UUID
+    chat_message: str = Field(min_length=1)
+    # Echoed back in the ack so the client can match it to its pending message
+    ref: Optional[str] = Field(default=None, max_length=64)
 
 
 # -------------------
@@ -136,23 +163,30 @@ class NotificationBase(BaseModel):
     notification_type: str
     notification_message: str
     notification_status: Optional[str] = "unread"
-    notification_from: Optional[str] = None
-    notification_to: Optional[str] = None
-    notification_timestamp: Optional[str] = None
-    notification_read_at: Optional[str] = None
+    notification_from: Optional[UUID] = None
+    notification_to: Optional[UUID] = None
+    notification_timestamp: Optional[datetime] = None
+    notification_read_at: Optional[datetime] = None
     notification_priority: Optional[str] = "normal"
-    company_id: int
+    company_id: Optional[UUID] = None
 
 class NotificationCreate(NotificationBase):
     pass
 
 class NotificationRead(NotificationBase):
-    notification_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    notification_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
 
-    class Config:
-        orm_mode = True
+class NotificationMarkRead(BaseModel):
+    notification_ids: List[UUID] = Field(min_length=1, max_length=500)
+
+class NotificationUnreadSummary(BaseModel):
+    unread: int
+    # Rows changed by a mark-read call; absent on plain badge reads
+    updated: Optional[int] = None
 
 
 # -------------------
@@ -160,17 +194,75 @@ class NotificationRead(NotificationBase):
 # -------------------
 
 class CollaborationBase(BaseModel):
-    collaboration_from: str
-    collaboration_to: str
+    collaboration_from: UUID
+    collaboration_to: UUID
     collaboration_status: Optional[str] = "active"
 
 class CollaborationCreate(CollaborationBase):
     pass
 
 class CollaborationRead(CollaborationBase):
-    collaboration_id: int
-    created_at: Optional[str]
-    updated_at: Optional[str]
+    collaboration_id: UUID
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    model_config = ConfigDict(from_attributes=True)
+
+class CollaborationPartners(BaseModel):
+    company_id: UUID
+    partners: List[UUID]
+
+class CollaborationSuggestion(BaseModel):
+    company_id: UUID
+    # Partners the suggested company shares with the requesting one
+    mutual_count: int
+
+
+# -------------------
+# Filter Schemas
+# -------------------
+
+class CompanyFilters(FilterModelWithFields):
+    country: Optional[List[str]] = None
+    created_at_from: Optional[datetime] = None
+    created_at_to: Optional[datetime] = None
+
+    searchable_fields: ClassVar[List[str]] = ["company_name"]
+    valid_sort_fields: ClassVar[List[str]] = ["created_at", "company_name"]
+    date_range_fields: ClassVar[List[str]] = ["created_at"]
+
+
+class ProjectFilters(FilterModelWithFields):
+    company_id: Optional[UUID] = None
+    status: Optional[List[str]] = None
+    domain: Optional[List[str]] = None
+    start_date_from: Optional[datetime] = None
+    start_date_to: Optional[datetime] = None
+
+    searchable_fields: ClassVar[List[str]] = ["title"]
+    valid_sort_fields: ClassVar[List[str]] = ["created_at"]
+    date_range_fields: ClassVar[List[str]] = ["start_date"]
+    filter_sources: ClassVar[dict] = {"company_id": None}
+
+
+class BlogFilters(FilterModelWithFields):
+    company_id: Optional[UUID] = None
+    created_at_from: Optional[datetime] = None
+    created_at_to: Optional[datetime] = None
+
+    searchable_fields: ClassVar[List[str]] = ["title"]
+    valid_sort_fields: ClassVar[List[str]] = ["created_at"]
+    date_range_fields: ClassVar[List[str]] = ["created_at"]
+    filter_sources: ClassVar[dict] = {"company_id": None}
+
+
+class NotificationFilters(FilterModelWithFields):
+    notification_type: Optional[List[str]] = None
+    notification_status: Optional[List[str]] = None
+    notification_priority: Optional[List[str]] = None
+    notification_timestamp_from: Optional[datetime] = None
+    notification_timestamp_to: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    valid_sort_fields: ClassVar[List[str]] = ["notification_timestamp"]
+    default_sort_field: ClassVar[str] = "notification_timestamp"
+    date_range_fields: ClassVar[List[str]] = ["notification_timestamp"]
@@ -0,0 +1,34 @@
+from enum import Enum
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+
+class SearchEntityType(str, Enum):
+    COMPANY = "company"
+    PROJECT = "project"
+    BLOG = "blog"
+    SERVICE = "service"
+
+
+class SearchQuery(BaseModel):
+    q: str = Field(min_length=1, max_length=200)
+    types: Optional[List[SearchEntityType]] = None
+    limit: int = Field(default=20, ge=1, le=100)
+    cursor: Optional[str] = None
+
+
+class SearchHit(BaseModel):
+    entity_type: SearchEntityType
+    id: UUID
+    title: str
+    # HTML: escaped matching fragments with the query terms wrapped in <b>...</b>
+    headline: str
+    rank: float
+
+
+class TypeaheadMatch(BaseModel):
+    id: UUID
+    name: str
+    # True when found by trigram similarity rather than as a name prefix
+    fuzzy: bool = False
@@ -0,0 +1,185 @@
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import WebSocket
+from sqlalchemy import text
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.pubsub import MAX_NOTIFY_PAYLOAD_BYTES, pg_listener
+from app.models import Chat
+from app.schemas.common import Page
+from app.services.utils import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+CHAT_CHANNEL = "chat_messages"
+PARTITION_MAINTENANCE_SECONDS = 24 * 60 * 60
+
+
+class ChatConnection:
+    """
+    One accepted chat WebSocket.
+
+    Outgoing frames go through a bounded queue drained by ``pump``, so a
+    client that stops reading cannot make the worker buffer without limit.
+    When the queue is full the connection is flagged as a slow consumer and
+    the endpoint closes it.
+    """
+
+    def __init__(self, websocket: WebSocket, company_id: UUID, queue_size: int):
+        self.websocket = websocket
+        self.company_id = company_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = asyncio.Event()
+
+    def offer(self, frame: str) -> bool:
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self.overflowed.set()
+            return False
+
+    async def pump(self) -> None:
+        while True:
+            frame = await self.queue.get()
+            await self.websocket.send_text(frame)
+
+
+class ConnectionRegistry:
+    """Chat connections in this worker, grouped by the company they belong to."""
+
+    def __init__(self):
+        self._by_company: dict[UUID, set[ChatConnection]] = {}
+        self.delivered = 0
+        self.dropped = 0
+
+    def add(self, connection: ChatConnection) -> None:
+        self._by_company.setdefault(connection.company_id, set()).add(connection)
+
+    def remove(self, connection: ChatConnection) -> None:
+        connections = self._by_company.get(connection.company_id)
+        if connections is not None:
+            connections.discard(connection)
+            if not connections:
+                del self._by_company[connection.company_id]
+
+    def deliver(self, company_ids: set[UUID], frame: str) -> None:
+        for company_id in company_ids:
+            for connection in self._by_company.get(company_id, ()):
+                if connection.offer(frame):
+                    self.delivered += 1
+                else:
+                    self.dropped += 1
+
+    def handle_notification(self, payload: str) -> None:
+        message = json.loads(payload)
+        company_ids = {UUID(message["chat_to"]), UUID(message["chat_from"])}
+        self.deliver(company_ids, payload)
+
+    def stats(self) -> dict:
+        return {
+            "companies": len(self._by_company),
+            "connections": sum(len(c) for c in self._by_company.values()),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+chat_registry = ConnectionRegistry()
+pg_listener.subscribe(CHAT_CHANNEL, chat_registry.handle_notification)
+
+
+def message_too_large(message: str) -> bool:
+    return len(message.encode()) > settings.CHAT_MAX_MESSAGE_BYTES
+
+
+async def send_chat_message(session, chat_from: UUID, chat_to: UUID, message: str) -> Chat:
+    """
+    Persist a chat row and publish it to every worker.
+
+    pg_notify runs in the same transaction as the insert, so the message is
+    only fanned out once it is committed. Every worker, including this one,
+    delivers it to its local sockets for both companies.
+    """
+    chat = Chat(
+        chat_from=chat_from,
+        chat_to=chat_to,
+        chat_message=message,
+        chat_timestamp=datetime.now(timezone.utc),
+    )
+    session.add(chat)
+    await session.flush()
+
+    payload = json.dumps(
+        {
+            "type": "message",
+            "chat_id": str(chat.chat_id),
+            "chat_from": str(chat_from),
+            "chat_to": str(chat_to),
+            "conversation_key": conversation_key(chat_from, chat_to),
+            "chat_message": message,
+            "chat_timestamp": chat.chat_timestamp.isoformat(),
+        }
+    )
+    # CHAT_MAX_MESSAGE_BYTES keeps this well under the limit; guard against misconfiguration
+    if len(payload.encode()) > MAX_NOTIFY_PAYLOAD_BYTES:
+        raise ValueError("chat payload exceeds the NOTIFY size limit")
+    await session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHAT_CHANNEL, "payload": payload},
+    )
+    await session.commit()
+    return chat
+
+
+def conversation_key(company_a: UUID, company_b: UUID) -> str:
+    """Same value as the generated chats.conversation_key column."""
+    low, high = sorted((company_a, company_b))
+    return f"{low}:{high}"
+
+
+async def get_conversation_page(
+    session, company_id: UUID, other_company_id: UUID, cursor: str | None, limit: int
+) -> Page:
+    """
+    One page of a conversation, newest first.
+
+    chat_id is UUIDv7, so it orders messages by time. Each page is one range
+    scan of the (conversation_key, chat_id) index, starting below the cursor.
+    """
+    query = select(Chat).where(
+        Chat.conversation_key == conversation_key(company_id, other_company_id)
+    )
+    if cursor:
+        _, before_id = decode_cursor(cursor, "chat_id", Chat)
+        query = query.where(Chat.chat_id < before_id)
+    query = query.order_by(Chat.chat_id.desc()).limit(limit + 1)
+
+    items = list((await session.exec(query)).all())
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor("chat_id", items[-1].chat_id, items[-1].chat_id)
+    return Page(items=items, next_cursor=next_cursor)
+
+
+async def run_chat_partition_maintenance(interval_seconds: float = PARTITION_MAINTENANCE_SECONDS) -> None:
+    """Keep monthly chats partitions created CHAT_PARTITION_MONTHS_AHEAD in advance."""
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await session.execute(
+                    text("SELECT public.ensure_chat_partitions(:months)"),
+                    {"months": settings.CHAT_PARTITION_MONTHS_AHEAD},
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Chat partition maintenance failed: {e}")
+        await asyncio.sleep(interval_seconds)
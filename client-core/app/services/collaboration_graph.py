@@ -0,0 +1,429 @@
+import asyncio
+import json
+import logging
+import time
+from array import array
+from collections import Counter, defaultdict
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import object_session
+from sqlmodel import select
+
+from app.core.database import RoutingSession, async_session_maker
+from app.core.pubsub import MAX_NOTIFY_PAYLOAD_BYTES, pg_listener
+from app.models import Collaboration
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUS = "active"
+# Committed collaboration changes, published so every worker's graph follows writes made elsewhere
+COLLABORATION_CHANNEL = "collaboration_changes"
+# Tags this worker's NOTIFY payloads; its own changes are applied at commit instead
+WORKER_ID = uuid4().hex
+
+# (from, to) of an active collaboration row
+Edge = tuple[UUID, UUID]
+# (collaboration id, edge before, edge after); None while the row is not an active edge
+RowChange = tuple[UUID, Edge | None, Edge | None]
+# Rebuild the CSR arrays once this many pairs have pending overlay changes
+COMPACT_THRESHOLD = 10_000
+
+
+class CollaborationGraph:
+    """
+    Undirected graph of active collaborations in compressed sparse row form.
+
+    Company ids are mapped to dense ints. ``_targets[_offsets[n]:_offsets[n+1]]``
+    are node n's neighbours, sorted, and ``_weights`` holds how many active
+    collaboration rows join each pair (either direction). Committed writes
+    go into a small overlay of per-pair weight deltas. The overlay is folded
+    into fresh arrays on the next rebuild, so lookups stay array slices.
+    """
+
+    def __init__(self):
+        self._ids: list[UUID] = []
+        self._index: dict[UUID, int] = {}
+        self._offsets = array("q", [0])
+        self._targets = array("i")
+        self._weights = array("H")
+        self._delta: dict[int, dict[int, int]] = defaultdict(dict)
+        self._delta_pairs = 0
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._targets) // 2
+
+    @classmethod
+    def build(cls, edges) -> "CollaborationGraph":
+        graph = cls()
+        pair_weights: Counter[tuple[int, int]] = Counter()
+        for source, target in edges:
+            if source == target:
+                continue
+            a, b = graph._node(source), graph._node(target)
+            pair_weights[(a, b) if a < b else (b, a)] += 1
+
+        degree = [0] * len(graph._ids)
+        for a, b in pair_weights:
+            degree[a] += 1
+            degree[b] += 1
+        offsets = array("q", [0]) * (len(degree) + 1)
+        for node, d in enumerate(degree):
+            offsets[node + 1] = offsets[node] + d
+
+        targets = array("i", [0]) * offsets[-1]
+        weights = array("H", [0]) * offsets[-1]
+        cursor = list(offsets[:-1])
+        for (a, b), weight in sorted(pair_weights.items()):
+            for node, other in ((a, b), (b, a)):
+                targets[cursor[node]] = other
+                weights[cursor[node]] = min(weight, 0xFFFF)
+                cursor[node] += 1
+        # Pairs were visited in (a, b) order, so every node's slice is already sorted
+
+        graph._offsets, graph._targets, graph._weights = offsets, targets, weights
+        graph.loaded = True
+        return graph
+
+    def _node(self, company_id: UUID) -> int:
+        node = self._index.get(company_id)
+        if node is None:
+            node = len(self._ids)
+            self._index[company_id] = node
+            self._ids.append(company_id)
+        return node
+
+    def _neighbor_nodes(self, node: int) -> list[int]:
+        if node + 1 < len(self._offsets):
+            start, end = self._offsets[node], self._offsets[node + 1]
+            base = self._targets[start:end]
+        else:
+            base = array("i")
+        delta = self._delta.get(node)
+        if not delta:
+            return base.tolist()
+
+        start = self._offsets[node] if node + 1 < len(self._offsets) else 0
+        result = [
+            other
+            for i, other in enumerate(base)
+            if self._weights[start + i] + delta.get(other, 0) > 0
+        ]
+        base_set = set(base)
+        result.extend(other for other, d in delta.items() if d > 0 and other not in base_set)
+        return result
+
+    def apply(self, changes: list[tuple[UUID, UUID, int]]) -> None:
+        """Apply committed (company, company, +1/-1) changes to the overlay."""
+        for source, target, change in changes:
+            if source == target:
+                continue
+            a, b = self._node(source), self._node(target)
+            for node, other in ((a, b), (b, a)):
+                delta = self._delta[node]
+                if other not in delta:
+                    self._delta_pairs += 1
+                delta[other] = delta.get(other, 0) + change
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self._delta_pairs > COMPACT_THRESHOLD
+
+    def neighbors(self, company_id: UUID) -> list[UUID]:
+        node = self._index.get(company_id)
+        if node is None:
+            return []
+        return [self._ids[other] for other in self._neighbor_nodes(node)]
+
+    def mutual(self, company_a: UUID, company_b: UUID) -> list[UUID]:
+        node_a, node_b = self._index.get(company_a), self._index.get(company_b)
+        if node_a is None or node_b is None:
+            return []
+        common = set(self._neighbor_nodes(node_a)).intersection(self._neighbor_nodes(node_b))
+        return [self._ids[other] for other in sorted(common)]
+
+    def suggestions(self, company_id: UUID, limit: int) -> list[tuple[UUID, int]]:
+        """Companies two hops away, ranked by how many partners they share."""
+        node = self._index.get(company_id)
+        if node is None:
+            return []
+        direct = self._neighbor_nodes(node)
+        excluded = set(direct)
+        excluded.add(node)
+        scores: Counter[int] = Counter()
+        for neighbor in direct:
+            for candidate in self._neighbor_nodes(neighbor):
+                if candidate not in excluded:
+                    scores[candidate] += 1
+        return [(self._ids[candidate], score) for candidate, score in scores.most_common(limit)]
+
+
+class CollaborationGraphIndex:
+    """
+    Holds the current graph and rebuilds it from the collaborations table.
+
+    Changes arrive per collaboration row as (row id, old edge, new edge),
+    where an edge is (from, to) while the row is active and None otherwise.
+    ``_edges`` remembers the edge the graph holds for every row changed since
+    the last rebuild, so a change the graph already reflects (one seen both
+    locally and over NOTIFY, or one a rebuild's snapshot already contains) is
+    skipped instead of counted twice.
+    """
+
+    def __init__(self):
+        self.graph = CollaborationGraph()
+        self._edges: dict[UUID, Edge | None] = {}
+        self._pending: list[RowChange] | None = None
+
+    @staticmethod
+    def _apply(graph: CollaborationGraph, edges: dict[UUID, Edge | None], changes: list[RowChange]) -> None:
+        deltas = []
+        for row_id, old, new in changes:
+            current = edges.get(row_id, old)
+            if current == new:
+                continue
+            if current is not None:
+                deltas.append((*current, -1))
+            if new is not None:
+                deltas.append((*new, 1))
+            edges[row_id] = new
+        graph.apply(deltas)
+
+    def apply(self, changes: list[RowChange]) -> None:
+        self._apply(self.graph, self._edges, changes)
+        # Writes committed while a rebuild reads the table are replayed onto the new graph
+        if self._pending is not None:
+            self._pending.extend(changes)
+
+    async def refresh(self) -> None:
+        self._pending = []
+        try:
+            async with async_session_maker() as session:
+                rows = (
+                    await session.exec(
+                        select(
+                            Collaboration.collaboration_id,
+                            Collaboration.collaboration_from,
+                            Collaboration.collaboration_to,
+                        ).where(
+                            Collaboration.collaboration_status == ACTIVE_STATUS,
+                            Collaboration.collaboration_from.is_not(None),
+                            Collaboration.collaboration_to.is_not(None),
+                        )
+                    )
+                ).all()
+            # Building 1M edges takes seconds of pure Python; keep it off the event loop
+            changed = {row_id for row_id, _, _ in self._pending}
+            graph, edges = await asyncio.to_thread(_build_with_edges, rows, changed)
+            # Rows changed while the graph was being built are rare; look them up here
+            late = {row_id for row_id, _, _ in self._pending} - changed
+            if late:
+                edges.update(_snapshot_edges(rows, late))
+            # The snapshot may or may not hold a pending change; replaying from its edges counts each once
+            self._apply(graph, edges, self._pending)
+            self.graph, self._edges = graph, edges
+        finally:
+            self._pending = None
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Collaboration graph refresh failed: {e}")
+            # Rebuild early once writes have piled up in the overlay
+            deadline = time.monotonic() + interval_seconds
+            while time.monotonic() < deadline and not self.graph.needs_compaction:
+                await asyncio.sleep(min(60, interval_seconds))
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.graph.loaded,
+            "companies": len(self.graph._ids),
+            "pairs": len(self.graph),
+            "pending_pairs": self.graph._delta_pairs,
+        }
+
+
+def _snapshot_edges(rows, row_ids: set[UUID]) -> dict[UUID, Edge | None]:
+    """Edge each of ``row_ids`` has in the loaded rows; None for rows that are not active."""
+    edges: dict[UUID, Edge | None] = dict.fromkeys(row_ids)
+    if row_ids:
+        for row_id, source, target in rows:
+            if row_id in edges:
+                edges[row_id] = (source, target)
+    return edges
+
+
+def _build_with_edges(rows, row_ids: set[UUID]) -> tuple[CollaborationGraph, dict[UUID, Edge | None]]:
+    graph = CollaborationGraph.build((source, target) for _, source, target in rows)
+    return graph, _snapshot_edges(rows, row_ids)
+
+
+collaboration_index = CollaborationGraphIndex()
+
+
+# Recursive-CTE fallbacks, used until the in-memory graph has loaded
+
+EDGES_CTE = """
+    edges AS (
+        SELECT collaboration_from AS a, collaboration_to AS b FROM public.collaborations
+        WHERE collaboration_status = :active AND collaboration_from <> collaboration_to
+        UNION
+        SELECT collaboration_to, collaboration_from FROM public.collaborations
+        WHERE collaboration_status = :active AND collaboration_from <> collaboration_to
+    )
+"""
+
+
+async def neighbors_sql(session, company_id: UUID) -> list[UUID]:
+    rows = await session.execute(
+        text(f"WITH {EDGES_CTE} SELECT b FROM edges WHERE a = :company ORDER BY b"),
+        {"company": company_id, "active": ACTIVE_STATUS},
+    )
+    return [row[0] for row in rows]
+
+
+async def mutual_sql(session, company_a: UUID, company_b: UUID) -> list[UUID]:
+    rows = await session.execute(
+        text(
+            f"WITH {EDGES_CTE} SELECT x.b FROM edges x JOIN edges y ON y.b = x.b "
+            f"WHERE x.a = :company_a AND y.a = :company_b ORDER BY x.b"
+        ),
+        {"company_a": company_a, "company_b": company_b, "active": ACTIVE_STATUS},
+    )
+    return [row[0] for row in rows]
+
+
+async def suggestions_sql(session, company_id: UUID, limit: int) -> list[tuple[UUID, int]]:
+    rows = await session.execute(
+        text(
+            f"""
+            WITH RECURSIVE {EDGES_CTE},
+            walk (node, depth) AS (
+                SELECT b, 1 FROM edges WHERE a = :company
+                UNION ALL
+                SELECT e.b, w.depth + 1 FROM walk w JOIN edges e ON e.a = w.node
+                WHERE w.depth < 2
+            )
+            SELECT node, count(*) AS mutual_count FROM walk
+            WHERE depth = 2 AND node <> :company
+              AND node NOT IN (SELECT b FROM edges WHERE a = :company)
+            GROUP BY node ORDER BY mutual_count DESC, node LIMIT :limit
+            """
+        ),
+        {"company": company_id, "active": ACTIVE_STATUS, "limit": limit},
+    )
+    return [(row[0], row[1]) for row in rows]
+
+
+async def get_partners(session, company_id: UUID) -> list[UUID]:
+    graph = collaboration_index.graph
+    if graph.loaded:
+        return graph.neighbors(company_id)
+    return await neighbors_sql(session, company_id)
+
+
+async def get_mutual_partners(session, company_a: UUID, company_b: UUID) -> list[UUID]:
+    graph = collaboration_index.graph
+    if graph.loaded:
+        return graph.mutual(company_a, company_b)
+    return await mutual_sql(session, company_a, company_b)
+
+
+async def get_suggestions(session, company_id: UUID, limit: int) -> list[tuple[UUID, int]]:
+    graph = collaboration_index.graph
+    if graph.loaded:
+        return graph.suggestions(company_id, limit)
+    return await suggestions_sql(session, company_id, limit)
+
+
+def _edge(target, use_history: bool) -> Edge | None:
+    """Edge of a collaboration before (history) or after a flush; None unless it is active."""
+    state = inspect(target)
+    values = []
+    for attr in ("collaboration_from", "collaboration_to", "collaboration_status"):
+        current = getattr(target, attr)
+        if use_history:
+            history = state.attrs[attr].history
+            if history.has_changes():
+                current = history.deleted[0] if history.deleted else None
+        values.append(current)
+    source, target_id, status = values
+    if status != ACTIVE_STATUS or None in (source, target_id):
+        return None
+    return source, target_id
+
+
+def _record(target, old: Edge | None, new: Edge | None) -> None:
+    if old == new:
+        return
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("collaboration_changes", []).append((target.collaboration_id, old, new))
+
+
+def _payloads(changes: list[RowChange]) -> list[str]:
+    """Pack changes into as few NOTIFY payloads as fit under the size limit."""
+    payloads = []
+    batch: list[str] = []
+    size = 0
+    for change in changes:
+        encoded = json.dumps(change, default=str)
+        # Room for the envelope around the batch
+        if batch and size + len(encoded) + 64 > MAX_NOTIFY_PAYLOAD_BYTES:
+            payloads.append(f'{{"origin": "{WORKER_ID}", "changes": [{", ".join(batch)}]}}')
+            batch, size = [], 0
+        batch.append(encoded)
+        size += len(encoded) + 2
+    if batch:
+        payloads.append(f'{{"origin": "{WORKER_ID}", "changes": [{", ".join(batch)}]}}')
+    return payloads
+
+
+@event.listens_for(Collaboration, "after_insert")
+def _collaboration_inserted(mapper, connection, target):
+    _record(target, None, _edge(target, use_history=False))
+
+
+@event.listens_for(Collaboration, "after_update")
+def _collaboration_updated(mapper, connection, target):
+    _record(target, _edge(target, use_history=True), _edge(target, use_history=False))
+
+
+@event.listens_for(Collaboration, "after_delete")
+def _collaboration_deleted(mapper, connection, target):
+    _record(target, _edge(target, use_history=False), None)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_collaboration_changes(session):
+    changes = session.info.pop("collaboration_changes", None)
+    if changes:
+        collaboration_index.apply(changes)
+        # Sent once the transaction has committed, batched rather than one NOTIFY per row
+        pg_listener.publish(COLLABORATION_CHANNEL, _payloads(changes))
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_collaboration_changes(session):
+    session.info.pop("collaboration_changes", None)
+
+
+def _parse_edge(edge) -> Edge | None:
+    return None if edge is None else (UUID(edge[0]), UUID(edge[1]))
+
+
+def _handle_notification(payload: str) -> None:
+    message = json.loads(payload)
+    if message["origin"] == WORKER_ID:
+        return
+    collaboration_index.apply(
+        [(UUID(row_id), _parse_edge(old), _parse_edge(new)) for row_id, old, new in message["changes"]]
+    )
+
+
+# Writes from other workers show up within the NOTIFY delay. Any lost while
+# the LISTEN connection is down are picked up by the next rebuild.
+pg_listener.subscribe(COLLABORATION_CHANNEL, _handle_notification)
@@ -0,0 +1,91 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlmodel import select
+
+from app.core.cache import cached, invalidate_on_write
+from app.models import Blog, Client, Company, Project, Service
+from app.schemas.company import CompanyProfile
+
+# (relationship, model, primary key) for each collection shown on a profile
+PROFILE_COLLECTIONS = (
+    (Company.services, Service, Service.service_id),
+    (Company.projects, Project, Project.project_id),
+    (Company.blogs, Blog, Blog.blog_id),
+)
+
+
+def _newest_ids(model, pk, company_id: UUID, limit: int):
+    return (
+        select(pk)
+        .where(model.company_id == company_id)
+        .order_by(model.created_at.desc().nulls_last(), pk.desc())
+        .limit(limit)
+    )
+
+
+@cached("company_profile", tags=["company:{company_id}"], schema=CompanyProfile | None)
+async def get_company_profile(session, company_id: UUID, limit: int, version=None) -> CompanyProfile | None:
+    """
+    A company with its owner and its newest ``limit`` services, projects and
+    blogs, always in four queries.
+
+    ``version`` is only part of the cache key: pass the profile version the
+    response's ETag comes from, so a write that skips the ORM listeners still
+    leads to a fresh load instead of an old body under a new ETag.
+
+    The company, its owner (joined) and the collection totals (scalar
+    subqueries) come back in one row. Each collection is then one selectin
+    query, filtered to the newest ids. raiseload("*") turns any other
+    relationship access into an error rather than a hidden extra query.
+    """
+    totals = [
+        select(func.count()).where(model.company_id == Company.company_id).scalar_subquery()
+        for _, model, _ in PROFILE_COLLECTIONS
+    ]
+    query = (
+        select(Company, *totals)
+        .where(Company.company_id == company_id)
+        .options(
+            joinedload(Company.owner),
+            *(
+                selectinload(relationship.and_(pk.in_(_newest_ids(model, pk, company_id, limit))))
+                for relationship, model, pk in PROFILE_COLLECTIONS
+            ),
+            raiseload("*"),
+        )
+    )
+    row = (await session.exec(query)).first()
+    if row is None:
+        return None
+
+    company, services_total, projects_total, blogs_total = row
+    profile = CompanyProfile.model_validate(company)
+    # selectin loads come back unordered; match the newest-first, NULLS LAST order used to pick them
+    for relationship, _, pk in PROFILE_COLLECTIONS:
+        getattr(profile, relationship.key).sort(
+            key=lambda item: (
+                item.created_at is not None,
+                item.created_at or datetime.min,
+                getattr(item, pk.key),
+            ),
+            reverse=True,
+        )
+    profile.services_total = services_total
+    profile.projects_total = projects_total
+    profile.blogs_total = blogs_total
+    return profile
+
+
+# Writes to anything shown on a company page or in a public list drop the cached reads
+invalidate_on_write(Company, lambda company: ("companies", f"company:{company.company_id}"))
+for _model in (Client, Service, Project, Blog):
+    invalidate_on_write(
+        _model,
+        lambda row, table=_model.__tablename__: (
+            table,
+            f"company:{row.company_id}" if row.company_id else None,
+        ),
+    )
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+from collections import defaultdict
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import object_session
+
+from app.core.database import RoutingSession, async_session_maker
+from app.models import Company, Notification, Project
+from app.schemas.company import CompanyFilters, NotificationFilters, ProjectFilters
+
+logger = logging.getLogger(__name__)
+
+# Models whose filter dropdowns are served from the cache. Must match the
+# columns aggregated by the public.facet_counts materialized view.
+FACETED_MODELS = [
+    (Company, CompanyFilters),
+    (Project, ProjectFilters),
+    (Notification, NotificationFilters),
+]
+
+# Arbitrary key for pg_try_advisory_lock so only one worker refreshes the view
+FACET_REFRESH_LOCK_ID = 7_202_611
+
+
+def facet_fields(filter_model_class) -> list[str]:
+    filters = filter_model_class()
+    return [
+        field
+        for field in filters.filterable_fields
+        if filter_model_class.filter_sources.get(field, "sql") == "sql"
+    ]
+
+
+def _apply_deltas(counts: dict[tuple[str, str], dict[str, int]], deltas: dict[tuple[str, str, str], int]) -> None:
+    for (table, column, value), delta in deltas.items():
+        column_counts = counts.setdefault((table, column), {})
+        count = column_counts.get(value, 0) + delta
+        if count > 0:
+            column_counts[value] = count
+        else:
+            column_counts.pop(value, None)
+
+
+class FacetCache:
+    """
+    In-process value -> row count map for every faceted column.
+
+    A periodic refresh reloads it from the ``facet_counts`` materialized view.
+    Only one worker at a time refreshes the view itself, under an advisory
+    lock. Between refreshes, ORM inserts, updates and deletes committed in
+    this worker adjust the counts directly. Facet reads never touch the
+    database.
+    """
+
+    def __init__(self):
+        self._counts: dict[tuple[str, str], dict[str, int]] = {}
+        self._tracked: dict[str, list[str]] = {}
+        self._pending: list[dict[tuple[str, str, str], int]] | None = None
+
+    def track(self, model, fields: list[str]) -> None:
+        self._tracked[model.__tablename__] = fields
+
+    def get(self, table: str, column: str) -> dict[str, int]:
+        return self._counts.get((table, column), {})
+
+    def apply(self, deltas: dict[tuple[str, str, str], int]) -> None:
+        _apply_deltas(self._counts, deltas)
+        # Deltas committed while a reload reads the view are replayed onto the new counts
+        if self._pending is not None:
+            self._pending.append(deltas)
+
+    async def refresh(self) -> None:
+        async with async_session_maker() as session:
+            locked = (
+                await session.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:id)"),
+                    {"id": FACET_REFRESH_LOCK_ID},
+                )
+            ).scalar()
+            # Deltas are not idempotent, so buffering starts just before the
+            # snapshot the new counts are read from
+            self._pending = []
+            try:
+                if locked:
+                    await session.execute(
+                        text("REFRESH MATERIALIZED VIEW CONCURRENTLY public.facet_counts")
+                    )
+                    await session.commit()
+
+                rows = (
+                    await session.execute(
+                        text(
+                            "SELECT table_name, column_name, value, value_count "
+                            "FROM public.facet_counts"
+                        )
+                    )
+                ).all()
+
+                counts: dict[tuple[str, str], dict[str, int]] = defaultdict(dict)
+                for table, column, value, value_count in rows:
+                    counts[(table, column)][value] = value_count
+                counts = dict(counts)
+                for deltas in self._pending:
+                    _apply_deltas(counts, deltas)
+                self._counts = counts
+            finally:
+                self._pending = None
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Facet cache refresh failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+    def record(self, target, sign: int, use_history: bool = False) -> None:
+        table = target.__tablename__
+        fields = self._tracked.get(table)
+        if not fields:
+            return
+        session = object_session(target)
+        if session is None:
+            return
+
+        deltas = session.info.setdefault("facet_deltas", defaultdict(int))
+        state = inspect(target)
+        for field in fields:
+            if use_history:
+                history = state.attrs[field].history
+                if not history.has_changes():
+                    continue
+                for old in history.deleted:
+                    if old is not None:
+                        deltas[(table, field, str(old))] -= 1
+                for new in history.added:
+                    if new is not None:
+                        deltas[(table, field, str(new))] += 1
+            else:
+                value = getattr(target, field)
+                if value is not None:
+                    deltas[(table, field, str(value))] += sign
+
+
+facet_cache = FacetCache()
+
+
+def _register(model, fields: list[str]) -> None:
+    facet_cache.track(model, fields)
+
+    @event.listens_for(model, "after_insert")
+    def after_insert(mapper, connection, target):
+        facet_cache.record(target, 1)
+
+    @event.listens_for(model, "after_update")
+    def after_update(mapper, connection, target):
+        facet_cache.record(target, 0, use_history=True)
+
+    @event.listens_for(model, "after_delete")
+    def after_delete(mapper, connection, target):
+        facet_cache.record(target, -1)
+
+
+for _model, _filter_model_class in FACETED_MODELS:
+    _register(_model, facet_fields(_filter_model_class))
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_facet_deltas(session):
+    deltas = session.info.pop("facet_deltas", None)
+    if deltas:
+        facet_cache.apply(deltas)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_facet_deltas(session):
+    session.info.pop("facet_deltas", None)
@@ -0,0 +1,221 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlmodel import select
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.pubsub import pg_listener
+from app.models import Notification, NotificationUnreadCount
+
+# Channel the notify_notification_insert trigger publishes on
+NOTIFICATION_CHANNEL = "notifications"
+
+
+async def get_unread_count(session, company_id: UUID) -> int:
+    """Badge count: one primary-key lookup on the trigger-maintained counter."""
+    counter = await session.get(NotificationUnreadCount, company_id)
+    return counter.unread_count if counter is not None else 0
+
+
+async def mark_read(
+    session, company_id: UUID, notification_ids: Optional[List[UUID]] = None
+) -> int:
+    """
+    Mark the recipient's unread notifications as read in one UPDATE.
+
+    ``notification_ids`` limits it to those rows; otherwise every unread
+    notification is marked. Returns the number of rows changed. The counter
+    is adjusted by the statement trigger inside the same transaction.
+    """
+    statement = (
+        update(Notification)
+        .where(
+            Notification.notification_to == company_id,
+            Notification.notification_status == "unread",
+        )
+        .values(notification_status="read", notification_read_at=datetime.now(timezone.utc))
+        .execution_options(synchronize_session=False)
+    )
+    if notification_ids is not None:
+        statement = statement.where(Notification.notification_id.in_(notification_ids))
+    result = await session.execute(statement)
+    await session.commit()
+    return result.rowcount
+
+
+class NotificationSubscriber:
+    """One open event stream; a bounded queue of (notification id, JSON payload)."""
+
+    def __init__(self, company_id: UUID, queue_size: int):
+        self.company_id = company_id
+        self.queue: asyncio.Queue[tuple[UUID, str]] = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def offer(self, event_id: UUID, payload: str) -> None:
+        try:
+            self.queue.put_nowait((event_id, payload))
+        except asyncio.QueueFull:
+            # The stream ends and the client resumes from Last-Event-ID
+            self.overflowed = True
+
+
+class NotificationHub:
+    """
+    Fans new notifications out to this worker's open streams.
+
+    Every stream shares the worker's single LISTEN connection, so an idle
+    client costs a queue and a task, never a database connection.
+    """
+
+    def __init__(self):
+        self._by_company: dict[UUID, set[NotificationSubscriber]] = {}
+
+    def subscribe(self, company_id: UUID) -> NotificationSubscriber:
+        subscriber = NotificationSubscriber(company_id, settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+        self._by_company.setdefault(company_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: NotificationSubscriber) -> None:
+        subscribers = self._by_company.get(subscriber.company_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._by_company[subscriber.company_id]
+
+    def handle_notification(self, payload: str) -> None:
+        message = json.loads(payload)
+        subscribers = self._by_company.get(UUID(message["notification_to"]))
+        if subscribers:
+            event_id = UUID(message["notification_id"])
+            for subscriber in subscribers:
+                subscriber.offer(event_id, payload)
+
+    def stats(self) -> dict:
+        return {
+            "companies": len(self._by_company),
+            "streams": sum(len(s) for s in self._by_company.values()),
+        }
+
+
+notification_hub = NotificationHub()
+pg_listener.subscribe(NOTIFICATION_CHANNEL, notification_hub.handle_notification)
+
+
+def _event_payload(notification: Notification) -> str:
+    """Same shape as the trigger's NOTIFY payload."""
+    return json.dumps(
+        {
+            "notification_id": notification.notification_id,
+            "notification_to": notification.notification_to,
+            "notification_from": notification.notification_from,
+            "notification_type": notification.notification_type,
+            "notification_status": notification.notification_status,
+            "notification_priority": notification.notification_priority,
+            "notification_timestamp": notification.notification_timestamp,
+            "notification_message": notification.notification_message,
+            "truncated": False,
+        },
+        default=str,
+    )
+
+
+def _sse_event(event_id: UUID, payload: str) -> str:
+    return f"id: {event_id}\nevent: notification\ndata: {payload}\n\n"
+
+
+def _replay_floor(event_id: UUID) -> UUID:
+    """Smallest UUIDv7 drawn up to the replay grace period before ``event_id``."""
+    timestamp_ms = event_id.int >> 80
+    floor_ms = max(timestamp_ms - settings.NOTIFICATION_STREAM_REPLAY_GRACE_SECONDS * 1000, 0)
+    return UUID(int=floor_ms << 80)
+
+
+async def _missed_notifications(company_id: UUID, last_event_id: UUID) -> tuple[list, bool]:
+    """
+    Rows to replay after ``last_event_id`` and whether the replay was cut short.
+
+    Ids are drawn at insert time, not at commit, so a row with a smaller id
+    can commit after the client saw ``last_event_id``. Rows from the grace
+    period before it are sent again; the client may already have some of
+    them and tells them apart by id.
+    """
+    limit = settings.NOTIFICATION_STREAM_REPLAY_LIMIT
+    for_company = Notification.notification_to == company_id
+    async with async_session_maker() as session:
+        late = (
+            await session.exec(
+                select(Notification)
+                .where(
+                    for_company,
+                    Notification.notification_id > _replay_floor(last_event_id),
+                    Notification.notification_id < last_event_id,
+                )
+                .order_by(Notification.notification_id)
+                .limit(limit)
+            )
+        ).all()
+        newer = (
+            await session.exec(
+                select(Notification)
+                .where(for_company, Notification.notification_id > last_event_id)
+                .order_by(Notification.notification_id)
+                .limit(limit)
+            )
+        ).all()
+    return [*late, *newer], len(newer) == limit
+
+
+async def notification_events(
+    company_id: UUID, last_event_id: Optional[UUID], expires_at: float
+) -> AsyncIterator[str]:
+    """
+    Server-sent events for one company.
+
+    The stream subscribes before replaying rows missed since
+    ``last_event_id``, then skips live events the replay already sent, so
+    nothing is lost across a reconnect. Notification ids are UUIDv7, ordered
+    by insert time rather than commit time, so the replay also covers the
+    grace period before ``last_event_id`` (see ``_missed_notifications``).
+    A comment frame is sent whenever the stream has been quiet for the
+    heartbeat interval. The stream ends when the access token expires or
+    when the client falls too far behind. The client then reconnects with
+    Last-Event-ID.
+    """
+    subscriber = notification_hub.subscribe(company_id)
+    try:
+        yield "retry: 3000\n\n"
+        # Live events are never repeated by NOTIFY, so only replayed ids need skipping
+        replayed: set[UUID] = set()
+        if last_event_id is not None:
+            missed, truncated = await _missed_notifications(company_id, last_event_id)
+            for notification in missed:
+                yield _sse_event(notification.notification_id, _event_payload(notification))
+                replayed.add(notification.notification_id)
+            if truncated:
+                # More may be missed; the client reconnects and keeps replaying from here
+                return
+
+        while not subscriber.overflowed:
+            remaining = expires_at - time.time()
+            if remaining <= 0:
+                break
+            try:
+                event_id, payload = await asyncio.wait_for(
+                    subscriber.queue.get(),
+                    timeout=min(settings.NOTIFICATION_STREAM_HEARTBEAT_SECONDS, remaining),
+                )
+            except TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event_id in replayed:
+                replayed.discard(event_id)
+                continue
+            yield _sse_event(event_id, payload)
+    finally:
+        notification_hub.unsubscribe(subscriber)
@@ -0,0 +1,190 @@
+import math
+import os
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.security import hash_otp, verify_otp
+from app.models import OTPCode
+
+
+class OTPVerifyResult(str, Enum):
+    VALID = "valid"
+    INVALID = "invalid"
+    EXPIRED = "expired"
+    LOCKED = "locked"
+
+
+class OTPStore(ABC):
+    """
+    Keeps at most one active OTP per subject (e.g. an email address).
+
+    Only HMAC digests are stored. A code is discarded once it is used, once it
+    expires, or once ``max_attempts`` wrong guesses have been made.
+    """
+
+    def __init__(self, ttl_seconds: int, max_attempts: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    async def issue(self, subject: str, otp: str) -> None: ...
+
+    @abstractmethod
+    async def verify(self, subject: str, otp: str) -> OTPVerifyResult: ...
+
+
+@dataclass
+class _OTPEntry:
+    digest: str
+    expires_at: float
+    slot: int
+    attempts: int = 0
+
+
+class InMemoryOTPStore(OTPStore):
+    """
+    Per-process OTP store with timer-wheel expiry.
+
+    Entries are bucketed by the tick they expire in. Every call advances the
+    wheel to the current tick and drops the buckets it passes, so expiry costs
+    O(expired entries) and no background task is needed.
+    """
+
+    def __init__(self, ttl_seconds: int, max_attempts: int, tick_seconds: float = 1.0):
+        super().__init__(ttl_seconds, max_attempts)
+        self._tick_seconds = tick_seconds
+        self._slot_count = math.ceil(ttl_seconds / tick_seconds) + 1
+        self._wheel: list[set[str]] = [set() for _ in range(self._slot_count)]
+        self._entries: dict[str, _OTPEntry] = {}
+        self._current_tick = int(time.monotonic() // tick_seconds)
+
+    def _advance(self, now: float) -> None:
+        target_tick = int(now // self._tick_seconds)
+        steps = min(target_tick - self._current_tick, self._slot_count)
+        for offset in range(1, steps + 1):
+            slot = self._wheel[(self._current_tick + offset) % self._slot_count]
+            for subject in list(slot):
+                entry = self._entries.get(subject)
+                if entry is None or entry.expires_at <= now:
+                    self._entries.pop(subject, None)
+                    slot.discard(subject)
+        self._current_tick = max(self._current_tick, target_tick)
+
+    def _discard(self, subject: str) -> None:
+        entry = self._entries.pop(subject, None)
+        if entry is not None:
+            self._wheel[entry.slot].discard(subject)
+
+    async def issue(self, subject: str, otp: str) -> None:
+        now = time.monotonic()
+        self._advance(now)
+        self._discard(subject)
+
+        expires_at = now + self.ttl_seconds
+        slot = math.ceil(expires_at / self._tick_seconds) % self._slot_count
+        self._entries[subject] = _OTPEntry(
+            digest=hash_otp(otp, subject), expires_at=expires_at, slot=slot
+        )
+        self._wheel[slot].add(subject)
+
+    async def verify(self, subject: str, otp: str) -> OTPVerifyResult:
+        now = time.monotonic()
+        self._advance(now)
+
+        entry = self._entries.get(subject)
+        if entry is None or entry.expires_at <= now:
+            self._discard(subject)
+            return OTPVerifyResult.EXPIRED
+
+        if verify_otp(otp, subject, entry.digest):
+            self._discard(subject)
+            return OTPVerifyResult.VALID
+
+        entry.attempts += 1
+        if entry.attempts >= self.max_attempts:
+            self._discard(subject)
+            return OTPVerifyResult.LOCKED
+        return OTPVerifyResult.INVALID
+
+
+class DatabaseOTPStore(OTPStore):
+    """
+    OTP store backed by the ``otp_codes`` table, shared by all workers.
+
+    Verification bumps the attempt counter and reads the digest back in a
+    single ``UPDATE ... RETURNING`` so concurrent guesses are counted exactly.
+    """
+
+    async def issue(self, subject: str, otp: str) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        statement = insert(OTPCode).values(
+            subject=subject,
+            otp_digest=hash_otp(otp, subject),
+            attempts=0,
+            expires_at=expires_at,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[OTPCode.subject],
+            set_={
+                "otp_digest": statement.excluded.otp_digest,
+                "attempts": 0,
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        async with async_session_maker() as session:
+            await session.execute(statement)
+            await session.commit()
+
+    async def verify(self, subject: str, otp: str) -> OTPVerifyResult:
+        async with async_session_maker() as session:
+            row = (
+                await session.execute(
+                    update(OTPCode)
+                    .where(OTPCode.subject == subject)
+                    .values(attempts=OTPCode.attempts + 1)
+                    .returning(OTPCode.otp_digest, OTPCode.attempts, OTPCode.expires_at)
+                )
+            ).first()
+
+            if row is None:
+                await session.commit()
+                return OTPVerifyResult.EXPIRED
+
+            digest, attempts, expires_at = row
+            if expires_at <= datetime.now(timezone.utc):
+                result = OTPVerifyResult.EXPIRED
+            elif attempts > self.max_attempts:
+                result = OTPVerifyResult.LOCKED
+            elif verify_otp(otp, subject, digest):
+                result = OTPVerifyResult.VALID
+            elif attempts >= self.max_attempts:
+                result = OTPVerifyResult.LOCKED
+            else:
+                result = OTPVerifyResult.INVALID
+
+            if result != OTPVerifyResult.INVALID:
+                await session.execute(delete(OTPCode).where(OTPCode.subject == subject))
+            await session.commit()
+            return result
+
+
+def create_otp_store() -> OTPStore:
+    ttl_seconds = settings.OTP_EXPIRE_MINUTES * 60
+    if settings.OTP_STORE_BACKEND == "database":
+        return DatabaseOTPStore(ttl_seconds, settings.OTP_ATTEMPTS)
+    # uvicorn and gunicorn both take their worker count from WEB_CONCURRENCY.
+    # A code issued by one worker could not be verified by another.
+    if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1:
+        raise RuntimeError('OTP_STORE_BACKEND="memory" needs a single worker; use "database"')
+    return InMemoryOTPStore(ttl_seconds, settings.OTP_ATTEMPTS)
+
+
+otp_store = create_otp_store()
@@ -0,0 +1,30 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import update
+
+from app.core.database import async_session_maker
+from app.core.security import get_password_hash_async
+from app.models import Client
+
+logger = logging.getLogger(__name__)
+
+
+async def rehash_password(client_id: UUID, password: str, old_hash: str) -> None:
+    """
+    Re-hash a password at the current cost after a successful login.
+
+    Runs as a background task. The update is guarded on the old hash, so a
+    password change that happens in between is never overwritten.
+    """
+    try:
+        new_hash = await get_password_hash_async(password)
+        async with async_session_maker() as session:
+            await session.execute(
+                update(Client)
+                .where(Client.client_id == client_id, Client.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"Password rehash failed for client {client_id}: {e}")
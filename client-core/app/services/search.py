@@ -0,0 +1,125 @@
+import base64
+import binascii
+import json
+from typing import Any, Tuple
+from uuid import UUID
+
+from sqlalchemy import Float, String, cast, func, literal, tuple_, union_all
+from sqlmodel import select
+
+from app.models import Blog, Company, Project, Service
+from app.models.fields import SEARCH_CONFIG
+from app.schemas.common import Page
+from app.schemas.search import SearchEntityType, SearchHit, SearchQuery
+from app.services.utils import raise_api_error
+
+# entity type -> (model, primary key, title column, columns shown in the headline)
+SEARCH_TARGETS = {
+    SearchEntityType.COMPANY: (
+        Company, Company.company_id, Company.company_name,
+        [Company.bio, Company.about, Company.vision],
+    ),
+    SearchEntityType.PROJECT: (
+        Project, Project.project_id, Project.title,
+        [Project.description, Project.tools],
+    ),
+    SearchEntityType.BLOG: (
+        Blog, Blog.blog_id, Blog.title,
+        [Blog.description, Blog.content],
+    ),
+    SearchEntityType.SERVICE: (
+        Service, Service.service_id, Service.name,
+        [Service.description, Service.domain],
+    ),
+}
+
+HEADLINE_OPTIONS = "MaxFragments=2, MaxWords=20, MinWords=5, StartSel=<b>, StopSel=</b>"
+# Ampersand first, so the entities added for the others are not escaped again
+HTML_ESCAPES = [("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;")]
+
+
+def html_escape(expression):
+    """SQL equivalent of html.escape(), so <b> is the only markup in a headline."""
+    for char, entity in HTML_ESCAPES:
+        expression = func.replace(expression, char, entity)
+    return expression
+
+
+def encode_search_cursor(hit: SearchHit) -> str:
+    payload = json.dumps([hit.rank, hit.entity_type.value, str(hit.id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, str, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, entity_type, pk_value = json.loads(base64.urlsafe_b64decode(padded))
+        return float(rank), SearchEntityType(entity_type).value, UUID(pk_value)
+    except (ValueError, TypeError, json.JSONDecodeError, binascii.Error):
+        raise_api_error(code="INVALID_CURSOR", message="Invalid pagination cursor")
+
+
+def build_search_query(params: SearchQuery) -> Any:
+    """
+    Ranked search across every requested entity type.
+
+    Each branch of the UNION matches ``search_vector @@ query`` through its GIN
+    index. Hits are ordered by (rank, entity type, id), all descending, and the
+    cursor holds the last hit's triple. ts_headline is only computed for the
+    rows of the page, since it re-parses the document text. The document is
+    HTML-escaped first: ts_headline copies markup in user text through
+    untouched, and clients render the headline as HTML.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, params.q)
+    # A repeated type would add a second UNION branch and return every hit twice
+    types = list(dict.fromkeys(params.types)) if params.types else list(SEARCH_TARGETS)
+
+    branches = []
+    for entity_type in types:
+        model, pk_column, title_column, body_columns = SEARCH_TARGETS[entity_type]
+        search_vector = model.__table__.c.search_vector
+        branches.append(
+            select(
+                literal(entity_type.value, String).label("entity_type"),
+                pk_column.label("id"),
+                title_column.label("title"),
+                func.concat_ws(" ... ", title_column, *body_columns).label("document"),
+                cast(func.ts_rank_cd(search_vector, tsquery), Float).label("rank"),
+            ).where(search_vector.op("@@")(tsquery))
+        )
+    hits = union_all(*branches).subquery("hits")
+
+    page = select(hits)
+    if params.cursor:
+        rank, entity_type, pk_value = decode_search_cursor(params.cursor)
+        page = page.where(
+            tuple_(hits.c.rank, hits.c.entity_type, hits.c.id)
+            < tuple_(literal(rank, Float), literal(entity_type, String), literal(pk_value))
+        )
+    page = (
+        page.order_by(hits.c.rank.desc(), hits.c.entity_type.desc(), hits.c.id.desc())
+        .limit(params.limit + 1)
+        .subquery("page")
+    )
+
+    return select(
+        page.c.entity_type,
+        page.c.id,
+        page.c.title,
+        func.ts_headline(SEARCH_CONFIG, html_escape(page.c.document), tsquery, HEADLINE_OPTIONS).label(
+            "headline"
+        ),
+        page.c.rank,
+    ).order_by(page.c.rank.desc(), page.c.entity_type.desc(), page.c.id.desc())
+
+
+async def search(session, params: SearchQuery) -> Page[SearchHit]:
+    rows = (await session.execute(build_search_query(params))).all()
+    hits = [SearchHit(**row._mapping) for row in rows]
+
+    next_cursor = None
+    if len(hits) > params.limit:
+        hits = hits[: params.limit]
+        next_cursor = encode_search_cursor(hits[-1])
+
+    return Page(items=hits, next_cursor=next_cursor)
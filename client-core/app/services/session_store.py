@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy import update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.security import create_access_token, create_refresh_token
+from app.models import Client, ClientSession
+
+logger = logging.getLogger(__name__)
+
+# How far back each incremental sync re-reads, to catch revocations whose
+# transaction committed after a previous sync had already moved past them.
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+class RevokedSessionSet:
+    """
+    In-process set of revoked session ids (the ``sid`` claim).
+
+    Checking a token is a set lookup, so the common "not revoked" case never
+    touches the database. Logouts in this worker are added immediately; logouts
+    in other workers arrive through ``sync``, which only reads rows revoked
+    since the last sync. A revoked sid is dropped once every access token that
+    could carry it has expired.
+    """
+
+    def __init__(self, access_token_ttl: timedelta):
+        self._access_token_ttl = access_token_ttl
+        self._revoked: dict[str, datetime] = {}
+        self._watermark: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, sid: str | None) -> bool:
+        return sid is not None and sid in self._revoked
+
+    def add(self, sid: UUID | str, revoked_at: datetime) -> None:
+        self._revoked[str(sid)] = revoked_at + self._access_token_ttl
+
+    def _prune(self, now: datetime) -> None:
+        expired = [sid for sid, until in self._revoked.items() if until <= now]
+        for sid in expired:
+            del self._revoked[sid]
+
+    async def sync(self) -> None:
+        now = datetime.now(timezone.utc)
+        since = (
+            self._watermark - SYNC_OVERLAP
+            if self._watermark is not None
+            else now - self._access_token_ttl
+        )
+        async with async_session_maker() as session:
+            rows = (
+                await session.exec(
+                    select(ClientSession.session_id, ClientSession.revoked_at).where(
+                        ClientSession.revoked_at >= since
+                    )
+                )
+            ).all()
+
+        for session_id, revoked_at in rows:
+            self.add(session_id, revoked_at)
+            if self._watermark is None or revoked_at > self._watermark:
+                self._watermark = revoked_at
+        if self._watermark is None:
+            self._watermark = since
+        self._prune(now)
+
+    async def run(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Revoked session sync failed: {e}")
+            await asyncio.sleep(interval_seconds)
+
+
+revoked_sessions = RevokedSessionSet(
+    access_token_ttl=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+)
+
+
+def _issue_tokens(
+    client: Client, session_id: UUID, refresh_jti: UUID, expires_at: datetime
+) -> dict:
+    access_token = create_access_token(
+        sub=client.client_email,
+        client_id=client.client_id,
+        role_id=None,
+        jti=uuid4(),
+        sid=session_id,
+        company_id=client.company_id,
+    )
+    refresh_token = create_refresh_token(
+        sub=client.client_email,
+        jti=refresh_jti,
+        expiry=expires_at,
+        client_id=client.client_id,
+        role_id=None,
+        sid=session_id,
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer",
+    }
+
+
+async def create_session(session: AsyncSession, client: Client) -> dict:
+    now = datetime.now(timezone.utc)
+    db_session = ClientSession(
+        client_id=client.client_id,
+        refresh_jti=uuid4(),
+        created_at=now,
+        expires_at=now + timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+    )
+    session.add(db_session)
+    await session.commit()
+    return _issue_tokens(
+        client, db_session.session_id, db_session.refresh_jti, db_session.expires_at
+    )
+
+
+async def rotate_session(session: AsyncSession, payload: dict) -> dict | None:
+    """
+    Swap the session's refresh jti for a new one and mint a new token pair.
+
+    The swap only succeeds if the presented refresh token is the current one.
+    Presenting an already-rotated token is treated as theft and revokes the
+    whole session.
+    """
+    session_id = UUID(payload["sid"])
+    new_jti = uuid4()
+    now = datetime.now(timezone.utc)
+
+    row = (
+        await session.execute(
+            update(ClientSession)
+            .where(
+                ClientSession.session_id == session_id,
+                ClientSession.refresh_jti == UUID(payload["jti"]),
+                ClientSession.revoked_at.is_(None),
+                ClientSession.expires_at > now,
+            )
+            .values(refresh_jti=new_jti)
+            .returning(ClientSession.client_id, ClientSession.expires_at)
+        )
+    ).first()
+
+    if row is None:
+        await session.commit()
+        await revoke_session(session, session_id)
+        return None
+
+    client_id, expires_at = row
+    client = await session.get(Client, client_id)
+    await session.commit()
+    return _issue_tokens(client, session_id, new_jti, expires_at)
+
+
+async def revoke_session(session: AsyncSession, session_id: UUID) -> None:
+    now = datetime.now(timezone.utc)
+    await session.execute(
+        update(ClientSession)
+        .where(
+            ClientSession.session_id == session_id,
+            ClientSession.revoked_at.is_(None),
+        )
+        .values(revoked_at=now)
+    )
+    await session.commit()
+    revoked_sessions.add(session_id, now)
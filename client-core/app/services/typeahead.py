@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import unicodedata
+from bisect import bisect_left, bisect_right
+from uuid import UUID
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import object_session
+from sqlmodel import select
+
+from app.core.database import RoutingSession, async_session_maker
+from app.models import Client, Company
+
+logger = logging.getLogger(__name__)
+
+# Shorter queries match too much for trigram similarity to be useful
+FUZZY_MIN_LENGTH = 3
+
+
+def normalize_name(name: str) -> str:
+    """Case-fold, strip accents and collapse whitespace."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+class PrefixIndex:
+    """
+    Sorted array of normalized names for prefix lookups.
+
+    ``_keys`` and ``_ids`` are parallel lists ordered by key, so a lookup is
+    one binary search plus a scan of at most ``limit`` entries. Display names
+    live in a dict keyed by id, which also gives O(1) access to an entry's
+    current key when it is renamed or deleted.
+    """
+
+    def __init__(self):
+        self._keys: list[str] = []
+        self._ids: list[UUID] = []
+        self._names: dict[UUID, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def load(self, rows) -> None:
+        entries = sorted((normalize_name(name), entity_id, name) for entity_id, name in rows)
+        self._keys = [key for key, _, _ in entries]
+        self._ids = [entity_id for _, entity_id, _ in entries]
+        self._names = {entity_id: name for _, entity_id, name in entries}
+
+    def _position(self, key: str, entity_id: UUID) -> int | None:
+        lo, hi = bisect_left(self._keys, key), bisect_right(self._keys, key)
+        for i in range(lo, hi):
+            if self._ids[i] == entity_id:
+                return i
+        return None
+
+    def remove(self, entity_id: UUID) -> None:
+        name = self._names.pop(entity_id, None)
+        if name is None:
+            return
+        i = self._position(normalize_name(name), entity_id)
+        if i is not None:
+            del self._keys[i]
+            del self._ids[i]
+
+    def upsert(self, entity_id: UUID, name: str) -> None:
+        self.remove(entity_id)
+        key = normalize_name(name)
+        i = bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._ids.insert(i, entity_id)
+        self._names[entity_id] = name
+
+    def apply(self, entity_id: UUID, name: str | None) -> None:
+        """Upsert ``name``, or remove the entry when it is None."""
+        if name is None:
+            self.remove(entity_id)
+        else:
+            self.upsert(entity_id, name)
+
+    def lookup(self, prefix: str, limit: int) -> list[tuple[UUID, str]]:
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        matches = []
+        i = bisect_left(self._keys, prefix)
+        while i < len(self._keys) and len(matches) < limit and self._keys[i].startswith(prefix):
+            entity_id = self._ids[i]
+            matches.append((entity_id, self._names[entity_id]))
+            i += 1
+        return matches
+
+
+class TypeaheadIndex:
+    """
+    Prefix index over one name column, with a pg_trgm fallback for typos.
+
+    The index is loaded in full on startup and every ``refresh`` interval, and
+    ORM writes committed in this worker update it immediately.
+    """
+
+    def __init__(self, model, pk_column, name_column):
+        self.model = model
+        self.pk_column = pk_column
+        self.name_column = name_column
+        self.index = PrefixIndex()
+        self._pending: list[tuple[UUID, str | None]] | None = None
+
+    def apply(self, entity_id: UUID, name: str | None) -> None:
+        self.index.apply(entity_id, name)
+        # Writes committed while a reload reads the table are replayed onto the new index
+        if self._pending is not None:
+            self._pending.append((entity_id, name))
+
+    async def refresh(self) -> None:
+        self._pending = []
+        try:
+            async with async_session_maker() as session:
+                rows = (
+                    await session.exec(select(self.pk_column, self.name_column))
+                ).all()
+            index = PrefixIndex()
+            # Sorting 100k+ names takes long enough to stall the event loop
+            await asyncio.to_thread(index.load, rows)
+            # Upserts and removes are idempotent, so replaying one the snapshot already has is harmless
+            for entity_id, name in self._pending:
+                index.apply(entity_id, name)
+            self.index = index
+        finally:
+            self._pending = None
+
+    async def fuzzy(self, session, query: str, limit: int):
+        # `%` uses the gin_trgm_ops index on lower(name); similarity() only ranks its hits
+        needle = query.lower()
+        lowered = func.lower(self.name_column)
+        statement = (
+            select(self.pk_column, self.name_column)
+            .where(lowered.op("%")(needle))
+            .order_by(func.similarity(lowered, needle).desc())
+            .limit(limit)
+        )
+        return (await session.exec(statement)).all()
+
+    async def suggest(self, session, query: str, limit: int) -> list[tuple[UUID, str, bool]]:
+        """
+        Prefix matches, or fuzzy matches when there are none; the flag marks fuzzy ones.
+
+        Any prefix hit means the user is typing a real name, so the database
+        is only queried for what looks like a typo.
+        """
+        matches = self.index.lookup(query, limit)
+        if matches:
+            return [(entity_id, name, False) for entity_id, name in matches]
+        if len(normalize_name(query)) < FUZZY_MIN_LENGTH:
+            return []
+        return [(entity_id, name, True) for entity_id, name in await self.fuzzy(session, query, limit)]
+
+
+company_typeahead = TypeaheadIndex(Company, Company.company_id, Company.company_name)
+client_typeahead = TypeaheadIndex(Client, Client.client_id, Client.client_name)
+TYPEAHEAD_INDEXES = [company_typeahead, client_typeahead]
+
+
+async def run_typeahead_refresh(interval_seconds: float) -> None:
+    while True:
+        for typeahead in TYPEAHEAD_INDEXES:
+            try:
+                await typeahead.refresh()
+            except Exception as e:
+                logger.warning(f"Typeahead refresh for {typeahead.model.__tablename__} failed: {e}")
+        await asyncio.sleep(interval_seconds)
+
+
+def _register(typeahead: TypeaheadIndex) -> None:
+    pk_name = typeahead.pk_column.key
+    name_attr = typeahead.name_column.key
+
+    def record(target, deleted: bool) -> None:
+        session = object_session(target)
+        if session is None:
+            return
+        changes = session.info.setdefault("typeahead_changes", [])
+        name = None if deleted else getattr(target, name_attr)
+        changes.append((typeahead, getattr(target, pk_name), name))
+
+    @event.listens_for(typeahead.model, "after_insert")
+    def after_insert(mapper, connection, target):
+        record(target, deleted=False)
+
+    @event.listens_for(typeahead.model, "after_update")
+    def after_update(mapper, connection, target):
+        if inspect(target).attrs[name_attr].history.has_changes():
+            record(target, deleted=False)
+
+    @event.listens_for(typeahead.model, "after_delete")
+    def after_delete(mapper, connection, target):
+        record(target, deleted=True)
+
+
+for _typeahead in TYPEAHEAD_INDEXES:
+    _register(_typeahead)
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _apply_typeahead_changes(session):
+    for typeahead, entity_id, name in session.info.pop("typeahead_changes", []):
+        typeahead.apply(entity_id, name)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _discard_typeahead_changes(session):
+    session.info.pop("typeahead_changes", None)
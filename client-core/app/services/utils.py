@@ -1,11 +1,24 @@
+import base64
+import binascii
+import functools
+import json
 from datetime import datetime, timezone
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
+from app.core.cache import app_cache
+from app.core.responses import dumps
+from app.models.fields import SEARCH_CONFIG
+from app.services.facets import facet_cache
 from app.schemas.common import (
     APIError,
+    FilterModelWithFields,
+    FilterOption,
+    FilterType,
+    Page,
+    SortDirection,
 )
-from starlette.status import HTTP_400_BAD_REQUEST
+from starlette.status import HTTP_400_BAD_REQUEST, HTTP_422_UNPROCESSABLE_ENTITY
 from sqlmodel import SQLModel, select
-from sqlalchemy import func, or_, text
+from sqlalchemy import func, literal, or_, text, tuple_
 from fastapi import Query
 from typing import (
     Optional,
@@ -21,14 +34,14 @@ from typing import (
 )
 from enum import Enum
 import inspect
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 
 def raise_api_error(
     code: str | None = "ERROR",
     message: str | None = "Something went wrong",
     status_code: int = HTTP_400_BAD_REQUEST,
-    details: dict | None = None,
+    details: dict | list | None = None,
 ):
     error = APIError(code=code, message=message, details=details)
     raise HTTPException(status_code=status_code, detail=error.model_dump())
@@ -41,211 +54,394 @@ common_error_responses = {
 }
 
 
-# def build_filtered_query(model, filters: FilterModelWithFields):
-#     """
-#     Build a filtered query for a given model and filter model.
-#     """
-#     query = select(model)
-
-#     if filters.search and filters.searchable_fields:
-#         search_clauses = [
-#             getattr(model, field).ilike(f"%{filters.search}%")
-#             for field in filters.searchable_fields
-#         ]
-#         query = query.where(or_(*search_clauses))
-
-#     for field in filters.filterable_fields:
-#         value = getattr(filters, field, None)
-#         if value is not None:
-#             column = getattr(model, field)
-
-#             # Check if value is an iterable
-#             if hasattr(value, "__iter__") and not isinstance(value, (str, bytes)):
-#                 query = query.where(column.in_(value))
-#             else:
-#                 query = query.where(column == value)
-
-#     # Handle date range filters - simple datetime comparison
-#     for field, date_range in filters.date_range_filter_fields.items():
-#         column = getattr(model, field)
-
-#         if date_range.from_date is not None:
-#             query = query.where(column >= date_range.from_date)
-#         if date_range.to_date is not None:
-#             query = query.where(column <= date_range.to_date)
-
-#     if filters.sort_by and filters.sort_by in filters.valid_sort_fields:
-#         column = getattr(model, filters.sort_by)
-#         order = (
-#             column.desc()
-#             if filters.sort_direction == SortDirection.DESC
-#             else column.asc()
-#         )
-#         query = query.order_by(order)
-
-#     return query
-
-
-# def build_paginated_and_filtered_query(
-#     model,
-#     filters: FilterModelWithFields,
-#     custom_where: Optional[List[Any]] = None,
-#     join_options: Optional[List[Any]] = None,
-# ) -> Tuple[Any, Any]:
-#     """
-#     Build a paginated query for a given model and filter model. Return filtered and paginated query.
-#     """
-#     base_query = build_filtered_query(model, filters)
-
-#     if custom_where:
-#         base_query = base_query.where(*custom_where)
-
-#     if join_options:
-#         base_query = base_query.options(*join_options)
-
-#     paginated_query = base_query.offset(filters.skip).limit(filters.limit)
-
-#     # Use a subquery to count only the filtered rows
-#     total_count_query = select(func.count()).select_from(base_query.subquery())
-#     return paginated_query, total_count_query
-
-
-# def get_filter_metadata(
-#     session, model: Type[SQLModel], filter_model_class: Type[FilterModelWithFields]
-# ) -> List[FilterOption]:
-#     meta = {}
-#     sql_fields = []
-
-#     # Instantiate to access property
-#     filter_model = filter_model_class()
-
-#     # Handle regular filter fields
-#     for field in filter_model.filterable_fields:
-#         source = filter_model_class.filter_sources.get(field, "sql")
-
-#         if isinstance(source, list):
-#             meta[field] = source
-#         elif isinstance(source, type) and issubclass(source, Enum):
-#             meta[field] = [e.value for e in source]
-#         elif source == "sql":
-#             sql_fields.append(field)
-
-#     if sql_fields:
-#         table_name = model.__tablename__
-#         schema_name = model.__table__.schema or "public"
-#         full_table_name = f"{schema_name}.{table_name}"
-#         sql_parts = [
-#             f"'{field}', (SELECT ARRAY(SELECT DISTINCT {field} FROM {full_table_name} WHERE {field} IS NOT NULL))"
-#             for field in sql_fields
-#         ]
-#         sql = f"SELECT json_build_object({', '.join(sql_parts)});"
-#         try:
-#             result = session.exec(text(sql)).scalar_one()
-#             if result:
-#                 meta.update(result)
-#         except Exception as e:
-#             print(f"Error getting filter metadata: {str(e)}")
-#             for field in sql_fields:
-#                 meta[field] = []
-
-#     # Create regular filter options with appropriate filter types
-#     filter_options = []
-#     for k, v in meta.items():
-#         # Determine filter type based on field configuration
-#         field_type = filter_model_class.model_fields.get(k)
-#         filter_type = FilterType.SINGLE_SELECT  # Default
-
-#         if field_type and field_type.annotation:
-#             # Check if it's a List type (multi-select)
-#             origin = get_origin(field_type.annotation)
-#             args = get_args(field_type.annotation)
-
-#             # Handle Optional[List[...]] or List[...]
-#             if origin is list or (
-#                 origin is Union and any(get_origin(arg) is list for arg in args)
-#             ):
-#                 filter_type = FilterType.MULTI_SELECT
-
-#         filter_options.append(
-#             FilterOption(
-#                 key=k,
-#                 label=k.replace("_", " ").title(),
-#                 options=v,
-#                 filter_type=filter_type,
-#             )
-#         )
-
-#     # Add date range filter options automatically
-#     date_range_fields = getattr(filter_model_class, "date_range_fields", [])
-#     for field in date_range_fields:
-#         filter_options.append(
-#             FilterOption(
-#                 key=field,
-#                 label=field.replace("_", " ").title(),
-#                 options=[],  # Empty for date ranges
-#                 filter_type=FilterType.DATE_RANGE,
-#             )
-#         )
-
-#     return filter_options
-
-
-# def extract_query_params_from_filter_model(
-#     model_class: Type[FilterModelWithFields],
-# ) -> Dict[str, Any]:
-#     """
-#     Extract query parameters from a filter model to Annotated[T, Query()] in query params.
-#     """
-#     query_params = {}
-
-#     for field_name, field_info in model_class.model_fields.items():
-#         outer_type_ = field_info.annotation
-#         origin = get_origin(outer_type_)
-#         args = get_args(outer_type_)
-
-#         if origin is list or (
-#             origin is Union and any(get_origin(arg) is list for arg in args)
-#         ):
-#             # Handle Optional[List[Enum]] or List[str]
-#             inner = (
-#                 get_args(outer_type_)[0]
-#                 if origin is list
-#                 else next(
-#                     (get_args(arg)[0] for arg in args if get_origin(arg) is list), str
-#                 )
-#             )
-#             query_params[field_name] = Annotated[Optional[List[inner]], Query()]
-#         elif origin is Union and type(None) in args:
-#             base_type = next(arg for arg in args if arg is not type(None))
-#             query_params[field_name] = Annotated[Optional[base_type], Query()]
-#         else:
-#             query_params[field_name] = Annotated[outer_type_, Query()]
-
-#     return query_params
-
-
-# def create_filter_deps(model_class: Type[FilterModelWithFields]):
-#     query_param_defs = extract_query_params_from_filter_model(model_class)
-#     model_fields = model_class.model_fields
-
-#     def _filter_dep(**query_params):
-#         return model_class(**{k: v for k, v in query_params.items() if v is not None})
-
-#     parameters = []
-#     for key, value in query_param_defs.items():
-#         default_val = model_fields[key].default if key in model_fields else None
-
-#         parameters.append(
-#             inspect.Parameter(
-#                 name=key,
-#                 kind=inspect.Parameter.KEYWORD_ONLY,
-#                 default=default_val if default_val is not None else None,
-#                 annotation=value,
-#             )
-#         )
-
-#     _filter_dep.__signature__ = inspect.Signature(parameters=parameters)
-#     return _filter_dep
+def build_filtered_query(model, filters: FilterModelWithFields):
+    """
+    Build a filtered query for a given model and filter model.
+    """
+    query = select(model)
+
+    search_vector = model.__table__.c.get("search_vector")
+    if filters.search and search_vector is not None:
+        # Generated tsvector column behind a GIN index, see add_search_vector
+        query = query.where(
+            search_vector.op("@@")(func.websearch_to_tsquery(SEARCH_CONFIG, filters.search))
+        )
+    elif filters.search and filters.searchable_fields:
+        search_clauses = [
+            getattr(model, field).ilike(f"%{filters.search}%")
+            for field in filters.searchable_fields
+        ]
+        query = query.where(or_(*search_clauses))
+
+    for field in filters.filterable_fields:
+        value = getattr(filters, field, None)
+        if value is not None:
+            column = getattr(model, field)
+
+            # Check if value is an iterable
+            if hasattr(value, "__iter__") and not isinstance(value, (str, bytes)):
+                query = query.where(column.in_(value))
+            else:
+                query = query.where(column == value)
+
+    # Handle date range filters - simple datetime comparison
+    for field, date_range in filters.date_range_filter_fields.items():
+        column = getattr(model, field)
+
+        if date_range.from_date is not None:
+            query = query.where(column >= date_range.from_date)
+        if date_range.to_date is not None:
+            query = query.where(column <= date_range.to_date)
+
+    return query
+
+
+def _primary_key_name(model) -> str:
+    return model.__table__.primary_key.columns[0].name
+
+
+def encode_cursor(sort_field: str, sort_value: Any, pk_value: Any) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_field, sort_value, str(pk_value)], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_field: str, model) -> Tuple[Any, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        field, sort_value, pk_value = json.loads(base64.urlsafe_b64decode(padded))
+        if field != sort_field:
+            raise ValueError("cursor was issued for a different sort")
+
+        if sort_value is None:
+            raise ValueError("sort columns are NOT NULL")
+        sort_type = getattr(model, sort_field).type.python_type
+        if sort_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        # String columns (sqlmodel's AutoString) report ``object`` as their python type
+        elif not isinstance(sort_value, sort_type):
+            sort_value = sort_type(sort_value)
+        pk_type = getattr(model, _primary_key_name(model)).type.python_type
+        return sort_value, pk_type(pk_value)
+    except (ValueError, TypeError, json.JSONDecodeError, binascii.Error):
+        raise_api_error(code="INVALID_CURSOR", message="Invalid pagination cursor")
+
+
+def build_paginated_and_filtered_query(
+    model,
+    filters: FilterModelWithFields,
+    custom_where: Optional[List[Any]] = None,
+    join_options: Optional[List[Any]] = None,
+) -> Tuple[Any, Any]:
+    """
+    Build a keyset-paginated query for a given model and filter model. Return paginated and total count queries.
+
+    Rows are ordered by (sort column, primary key) and the cursor holds the
+    last row's pair, so every page is an index range scan no matter how deep
+    it is. The page query fetches ``limit + 1`` rows to detect a next page.
+    Sort columns are NOT NULL, so the keyset predicate stays a single row
+    comparison that the planner can turn into an index range.
+    """
+    base_query = build_filtered_query(model, filters)
+
+    if custom_where:
+        base_query = base_query.where(*custom_where)
+
+    # Use a subquery to count only the filtered rows
+    total_count_query = select(func.count()).select_from(base_query.subquery())
+
+    if join_options:
+        base_query = base_query.options(*join_options)
+
+    sort_field = filters.effective_sort_field
+    sort_column = getattr(model, sort_field)
+    pk_column = getattr(model, _primary_key_name(model))
+    descending = filters.sort_direction == SortDirection.DESC
+
+    if filters.cursor:
+        sort_value, pk_value = decode_cursor(filters.cursor, sort_field, model)
+        keyset = tuple_(sort_column, pk_column)
+        boundary = tuple_(literal(sort_value, sort_column.type), literal(pk_value, pk_column.type))
+        base_query = base_query.where(keyset < boundary if descending else keyset > boundary)
+
+    # DESC NULLS LAST matches the descending keyset indexes; ASC is already NULLS LAST
+    sort_order = sort_column.desc().nulls_last() if descending else sort_column.asc()
+    base_query = base_query.order_by(sort_order, pk_column.desc() if descending else pk_column.asc())
+
+    paginated_query = base_query.limit(filters.limit + 1)
+    return paginated_query, total_count_query
+
+
+async def estimate_row_count(session, model) -> int:
+    """Planner's row estimate for the whole table; O(1) but ignores filters."""
+    schema_name = model.__table__.schema or "public"
+    result = await session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+        {"table": f"{schema_name}.{model.__tablename__}"},
+    )
+    return max(result.scalar_one_or_none() or 0, 0)
+
+
+async def _finish_page(session, model, filters: FilterModelWithFields, items: list, total_count_query):
+    """Trim the extra lookahead row and work out next_cursor and total for a page."""
+    next_cursor = None
+    if len(items) > filters.limit:
+        items = items[: filters.limit]
+        last = items[-1]
+        sort_field = filters.effective_sort_field
+        next_cursor = encode_cursor(
+            sort_field, getattr(last, sort_field), getattr(last, _primary_key_name(model))
+        )
+
+    total = None
+    if filters.count == "exact":
+        total = (await session.exec(total_count_query)).one()
+    elif filters.count == "estimate":
+        total = await estimate_row_count(session, model)
+    return items, next_cursor, total
+
+
+async def get_paginated_page(
+    session,
+    model,
+    filters: FilterModelWithFields,
+    custom_where: Optional[List[Any]] = None,
+    join_options: Optional[List[Any]] = None,
+) -> Page:
+    paginated_query, total_count_query = build_paginated_and_filtered_query(
+        model, filters, custom_where, join_options
+    )
+    items = list((await session.exec(paginated_query)).all())
+    items, next_cursor, total = await _finish_page(
+        session, model, filters, items, total_count_query
+    )
+
+    return Page(
+        items=items,
+        next_cursor=next_cursor,
+        total=total,
+        total_is_estimate=filters.count == "estimate",
+    )
+
+
+@functools.cache
+def page_adapter(read_schema: Type[Any]) -> TypeAdapter:
+    """TypeAdapter for Page[read_schema], built once per schema."""
+    return TypeAdapter(Page[read_schema])
+
+
+@functools.cache
+def _row_fields(model, read_schema: Type[Any]) -> Optional[Tuple[str, ...]]:
+    """Read schema fields when every one of them is a plain column of the table."""
+    fields = tuple(read_schema.model_fields)
+    columns = model.__table__.c
+    return fields if all(name in columns for name in fields) else None
+
+
+async def get_page_json(
+    session,
+    model,
+    filters: FilterModelWithFields,
+    read_schema: Type[Any],
+) -> bytes:
+    """
+    One page encoded straight to JSON bytes.
+
+    When the read schema is just table columns, the page query selects only
+    those columns and the Core rows go to orjson as is: no ORM identity map,
+    no instances, no pydantic models. Other schemas go through the ORM page
+    and a precompiled TypeAdapter.
+    """
+    fields = _row_fields(model, read_schema)
+    if fields is None:
+        page = await get_paginated_page(session, model, filters)
+        adapter = page_adapter(read_schema)
+        return adapter.dump_json(adapter.validate_python(page))
+
+    paginated_query, total_count_query = build_paginated_and_filtered_query(model, filters)
+    # The cursor needs the sort column and primary key even if the schema leaves them out
+    names = dict.fromkeys([*fields, filters.effective_sort_field, _primary_key_name(model)])
+    columns = [model.__table__.c[name] for name in names]
+    rows = list((await session.execute(paginated_query.with_only_columns(*columns))).all())
+    rows, next_cursor, total = await _finish_page(
+        session, model, filters, rows, total_count_query
+    )
+
+    return dumps(
+        {
+            "items": [dict(zip(fields, row)) for row in rows],
+            "next_cursor": next_cursor,
+            "total": total,
+            "total_is_estimate": filters.count == "estimate",
+        }
+    )
+
+
+async def get_cached_page(
+    request: Request,
+    session,
+    model,
+    filters: FilterModelWithFields,
+    read_schema: Type[Any],
+    version: Any = None,
+) -> bytes:
+    """
+    get_page_json behind app_cache, keyed by the request URL and the table
+    version its ETag was built from, and tagged with the table name.
+
+    The version in the key keeps a body from outliving its validator: a
+    write the tag invalidation misses (Core statements, other services)
+    still bumps the version, so the next request loads a fresh page.
+    """
+    key = f"page:{version!r}:{request.url.path}?{sorted(request.query_params.multi_items())}"
+    return await app_cache.get_or_load(
+        key,
+        lambda: get_page_json(session, model, filters, read_schema),
+        tags=[model.__tablename__],
+        schema=bytes,
+    )
+
+
+def get_filter_metadata(
+    model: Type[SQLModel],
+    filter_model_class: Type[FilterModelWithFields],
+    include_counts: bool = True,
+) -> List[FilterOption]:
+    """
+    Build dropdown options for a filter model.
+
+    "sql" sourced fields are read from the in-process facet cache, ordered by
+    how many rows carry each value, so no request ever scans the table. Counts
+    are table-wide; pass ``include_counts=False`` for tenant-scoped lists.
+    """
+    meta = {}
+    counts = {}
+
+    # Instantiate to access property
+    filter_model = filter_model_class()
+
+    # Handle regular filter fields
+    for field in filter_model.filterable_fields:
+        source = filter_model_class.filter_sources.get(field, "sql")
+
+        if isinstance(source, list):
+            meta[field] = source
+        elif isinstance(source, type) and issubclass(source, Enum):
+            meta[field] = [e.value for e in source]
+        elif source == "sql":
+            field_counts = facet_cache.get(model.__tablename__, field)
+            meta[field] = sorted(field_counts, key=lambda v: (-field_counts[v], v))
+            if include_counts:
+                counts[field] = {value: field_counts[value] for value in meta[field]}
+
+    # Create regular filter options with appropriate filter types
+    filter_options = []
+    for k, v in meta.items():
+        # Determine filter type based on field configuration
+        field_type = filter_model_class.model_fields.get(k)
+        filter_type = FilterType.SINGLE_SELECT  # Default
+
+        if field_type and field_type.annotation:
+            # Check if it's a List type (multi-select)
+            origin = get_origin(field_type.annotation)
+            args = get_args(field_type.annotation)
+
+            # Handle Optional[List[...]] or List[...]
+            if origin is list or (
+                origin is Union and any(get_origin(arg) is list for arg in args)
+            ):
+                filter_type = FilterType.MULTI_SELECT
+
+        filter_options.append(
+            FilterOption(
+                key=k,
+                label=k.replace("_", " ").title(),
+                options=v,
+                filter_type=filter_type,
+                counts=counts.get(k),
+            )
+        )
+
+    # Add date range filter options automatically
+    date_range_fields = getattr(filter_model_class, "date_range_fields", [])
+    for field in date_range_fields:
+        filter_options.append(
+            FilterOption(
+                key=field,
+                label=field.replace("_", " ").title(),
+                options=[],  # Empty for date ranges
+                filter_type=FilterType.DATE_RANGE,
+            )
+        )
+
+    return filter_options
+
+
+def extract_query_params_from_filter_model(
+    model_class: Type[FilterModelWithFields],
+) -> Dict[str, Any]:
+    """
+    Extract query parameters from a filter model to Annotated[T, Query()] in query params.
+    """
+    query_params = {}
+
+    for field_name, field_info in model_class.model_fields.items():
+        outer_type_ = field_info.annotation
+        origin = get_origin(outer_type_)
+        args = get_args(outer_type_)
+
+        if origin is list or (
+            origin is Union and any(get_origin(arg) is list for arg in args)
+        ):
+            # Handle Optional[List[Enum]] or List[str]
+            inner = (
+                get_args(outer_type_)[0]
+                if origin is list
+                else next(
+                    (get_args(arg)[0] for arg in args if get_origin(arg) is list), str
+                )
+            )
+            query_params[field_name] = Annotated[Optional[List[inner]], Query()]
+        elif origin is Union and type(None) in args:
+            base_type = next(arg for arg in args if arg is not type(None))
+            query_params[field_name] = Annotated[Optional[base_type], Query()]
+        else:
+            query_params[field_name] = Annotated[outer_type_, Query()]
+
+    return query_params
+
+
+def create_filter_deps(model_class: Type[FilterModelWithFields]):
+    query_param_defs = extract_query_params_from_filter_model(model_class)
+    model_fields = model_class.model_fields
+
+    def _filter_dep(**query_params):
+        try:
+            return model_class(**{k: v for k, v in query_params.items() if v is not None})
+        except ValidationError as e:
+            raise_api_error(
+                code="VALIDATION_ERROR",
+                message="Invalid filter parameters",
+                status_code=HTTP_422_UNPROCESSABLE_ENTITY,
+                details=beautify_validation_error(e),
+            )
+
+    parameters = []
+    for key, value in query_param_defs.items():
+        default_val = model_fields[key].default if key in model_fields else None
+
+        parameters.append(
+            inspect.Parameter(
+                name=key,
+                kind=inspect.Parameter.KEYWORD_ONLY,
+                default=default_val if default_val is not None else None,
+                annotation=value,
+            )
+        )
+
+    _filter_dep.__signature__ = inspect.Signature(parameters=parameters)
+    return _filter_dep
 
 
 def utc_now():
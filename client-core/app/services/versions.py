@@ -0,0 +1,35 @@
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from app.models import CompanyVersion, TableVersion
+
+
+async def get_table_version(session, model) -> tuple[int, datetime] | None:
+    """(version, modified_at) of a whole table, summed over its shard rows."""
+    row = (
+        await session.exec(
+            select(func.sum(TableVersion.version), func.max(TableVersion.modified_at)).where(
+                TableVersion.table_name == model.__tablename__
+            )
+        )
+    ).first()
+    if row is None or row[0] is None:
+        return None
+    return int(row[0]), row[1]
+
+
+async def get_company_profile_version(session, company_id: UUID) -> tuple[int, datetime | None] | None:
+    """
+    (version, modified_at) of a company profile: one primary-key lookup.
+
+    Triggers bump it on any write to the company or its owner, services,
+    projects and blogs, deletes included, so Last-Modified moves forward
+    when a child is removed.
+    """
+    row = await session.get(CompanyVersion, company_id)
+    if row is None:
+        return None
+    return row.version, row.modified_at
@@ -0,0 +1,70 @@
+"""
+Login lookup throughput through the sync engine (before) and the async
+engine (after) at a given concurrency.
+
+The sync path runs each lookup in Starlette's worker-thread pool, the way a
+plain ``def`` handler used to, so it is capped by the 40 pool threads and
+the sync engine's connection pool. The async path awaits the same query on
+``async_session_maker``, bounded by the configured DB pool instead.
+
+    python -m scripts.auth_engine_load [concurrency] [requests per client]
+"""
+import asyncio
+import sys
+import time
+from uuid import uuid4
+
+import anyio.to_thread
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.core.database import async_session_maker, engine
+from app.models import Client
+
+
+def _lookup_statement():
+    # Same shape as login: the lower(client_email) index, usually a miss
+    return select(Client).where(func.lower(Client.client_email) == f"{uuid4().hex}@example.com")
+
+
+def _sync_lookup() -> None:
+    with Session(engine) as session:
+        session.exec(_lookup_statement()).first()
+
+
+async def sync_request() -> None:
+    await anyio.to_thread.run_sync(_sync_lookup)
+
+
+async def async_request() -> None:
+    async with async_session_maker() as session:
+        (await session.exec(_lookup_statement())).first()
+
+
+async def _run(request, concurrency: int, per_client: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+
+    async def client() -> None:
+        for _ in range(per_client):
+            started = time.perf_counter()
+            await request()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - started, sorted(latencies)
+
+
+async def main(concurrency: int = 200, per_client: int = 50) -> None:
+    for name, request in (("sync engine", sync_request), ("async engine", async_request)):
+        await request()  # open the first connection outside the timing
+        elapsed, latencies = await _run(request, concurrency, per_client)
+        print(
+            f"{name}: {len(latencies) / elapsed:,.0f} req/s at {concurrency} concurrent clients; "
+            f"p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+            f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
@@ -0,0 +1,48 @@
+"""
+Open ``connections`` idle chat sockets as one company, then time how long
+one message takes to reach all of them.
+
+Runs against a live server and needs the ``websockets`` package (also what
+uvicorn uses to serve them).
+
+    python -m scripts.chat_fanout_load ws://localhost:8000/api/v1/chat/ws <access token> [connections]
+"""
+import asyncio
+import base64
+import json
+import sys
+import time
+
+import websockets
+
+
+async def main(url: str, token: str, connections: int = 5000) -> None:
+    started = time.perf_counter()
+    sockets = [
+        await websockets.connect(f"{url}?token={token}", max_queue=None)
+        for _ in range(connections)
+    ]
+    print(f"{connections} sockets open in {time.perf_counter() - started:.1f} s")
+
+    await asyncio.sleep(5)  # let them sit idle
+    sender = sockets[0]
+    started = time.perf_counter()
+    claims = json.loads(base64.urlsafe_b64decode(token.split(".")[1] + "=="))
+    await sender.send(json.dumps({"chat_to": claims["company_id"], "chat_message": "ping"}))
+
+    async def wait_for_message(ws) -> float:
+        while True:
+            frame = json.loads(await ws.recv())
+            if frame.get("type") == "message":
+                return time.perf_counter() - started
+
+    latencies = sorted(await asyncio.gather(*(wait_for_message(ws) for ws in sockets)))
+    print(
+        f"fan-out to {connections} sockets: p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms"
+    )
+    await asyncio.gather(*(ws.close() for ws in sockets))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1], sys.argv[2], *(int(arg) for arg in sys.argv[3:4])))
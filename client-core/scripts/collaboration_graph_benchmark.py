@@ -0,0 +1,47 @@
+"""
+Build time and query latency of the in-memory collaboration graph on a
+synthetic graph with a skewed degree distribution. No database is needed.
+
+    python -m scripts.collaboration_graph_benchmark [companies] [edges] [queries]
+"""
+import random
+import sys
+import time
+from uuid import UUID, uuid4
+
+from app.services.collaboration_graph import CollaborationGraph
+
+
+def main(companies: int = 100_000, edges: int = 1_000_000, queries: int = 5_000) -> None:
+    rng = random.Random(11)
+    ids = [uuid4() for _ in range(companies)]
+
+    def pick() -> UUID:
+        # Squaring a uniform sample skews picks toward low indexes, giving hub companies
+        return ids[int(rng.random() ** 2 * companies)]
+
+    edge_list = [(pick(), pick()) for _ in range(edges)]
+    started = time.perf_counter()
+    graph = CollaborationGraph.build(edge_list)
+    print(f"built {len(graph)} pairs over {companies} companies in {time.perf_counter() - started:.1f} s")
+
+    def measure(name, fn) -> None:
+        samples = []
+        for _ in range(queries):
+            a, b = rng.choice(ids), rng.choice(ids)
+            started = time.perf_counter()
+            fn(a, b)
+            samples.append((time.perf_counter() - started) * 1000)
+        samples.sort()
+        print(
+            f"{name}: p50 {samples[len(samples) // 2]:.3f} ms, "
+            f"p99 {samples[int(len(samples) * 0.99)]:.3f} ms"
+        )
+
+    measure("neighbors", lambda a, b: graph.neighbors(a))
+    measure("mutual", lambda a, b: graph.mutual(a, b))
+    measure("suggestions", lambda a, b: graph.suggestions(a, 10))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:4]))
@@ -0,0 +1,19 @@
+"""
+bcrypt throughput at each allowed cost on this host, to size login capacity
+and choose PASSWORD_HASH_ROUNDS.
+
+    python -m scripts.password_hashing_benchmark [samples per cost]
+"""
+import sys
+
+from app.core.config import settings
+from app.core.security import benchmark_password_hashing
+
+
+def main(samples: int = 3) -> None:
+    for rounds in range(settings.PASSWORD_HASH_MIN_ROUNDS, settings.PASSWORD_HASH_MAX_ROUNDS + 1):
+        print(benchmark_password_hashing(rounds, samples))
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
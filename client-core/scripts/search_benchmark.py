@@ -0,0 +1,67 @@
+"""
+Full-text search latency with the tsvector index versus the old ILIKE scan.
+
+Seeds ``rows`` blogs inside a transaction that is rolled back afterwards,
+so nothing is left behind, then reports the p50 of each query.
+
+    python -m scripts.search_benchmark [rows] [runs]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import text
+
+from app.core.database import async_session_maker
+from app.schemas.search import SearchEntityType, SearchQuery
+from app.services.search import build_search_query
+
+WORDS = [
+    "cloud", "platform", "design", "mobile", "analytics", "security",
+    "payments", "logistics", "health", "retail", "marketing", "automation",
+    "python", "react", "kubernetes", "postgres", "startup", "consulting",
+]
+
+
+async def _p50(session, statement, params: dict, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await session.execute(statement, params)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def main(rows: int = 1_000_000, runs: int = 20) -> None:
+    async with async_session_maker() as session:
+        await session.execute(
+            text(
+                "INSERT INTO public.blogs (blog_id, title, description, content) "
+                "SELECT gen_random_uuid(), "
+                "(CAST(:words AS text[]))[1 + (i * 7) % :n] || ' ' || (CAST(:words AS text[]))[1 + (i * 13) % :n], "
+                "'post ' || i || ' about ' || (CAST(:words AS text[]))[1 + (i * 3) % :n], "
+                "repeat((CAST(:words AS text[]))[1 + (i * 11) % :n] || ' ' || (CAST(:words AS text[]))[1 + (i * 5) % :n] || ' ', 40) "
+                "FROM generate_series(1, :rows) AS i"
+            ),
+            {"words": WORDS, "n": len(WORDS), "rows": rows},
+        )
+        await session.execute(text("ANALYZE public.blogs"))
+
+        query = SearchQuery(q="kubernetes analytics", types=[SearchEntityType.BLOG])
+        fts_ms = await _p50(session, build_search_query(query), {}, runs)
+        ilike_ms = await _p50(
+            session,
+            text(
+                "SELECT blog_id FROM public.blogs WHERE title ILIKE :q OR "
+                "description ILIKE :q OR content ILIKE :q LIMIT 21"
+            ),
+            {"q": "%kubernetes analytics%"},
+            runs,
+        )
+        print(f"{rows} blogs: tsvector search p50 {fts_ms:.1f} ms, ILIKE p50 {ilike_ms:.1f} ms")
+        await session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
@@ -0,0 +1,93 @@
+"""
+Fetch and serialize ``items`` companies through each response path, on an
+in-memory SQLite copy of the table so only the Python side is measured.
+
+    python -m scripts.serialization_benchmark [items] [runs]
+"""
+import json
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import List
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import MetaData, Table, create_engine, event, select
+from sqlalchemy.orm import Session
+
+from app.core.responses import dumps
+from app.models import Company
+from app.schemas.company import CompanyRead
+
+
+def _seed(items: int):
+    engine = create_engine("sqlite://")
+    event.listen(
+        engine, "connect", lambda conn, _: conn.execute("ATTACH DATABASE ':memory:' AS public")
+    )
+    # The generated tsvector column is Postgres-only
+    table = Table(
+        "companies",
+        MetaData(),
+        *(c._copy() for c in Company.__table__.c if c.name != "search_vector"),
+        schema="public",
+    )
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        table.create(conn)
+        conn.execute(
+            table.insert(),
+            [
+                {
+                    "company_id": uuid4(),
+                    "company_name": f"Company {i}",
+                    "company_email": f"team{i}@example.com",
+                    "country": "IN",
+                    "bio": "Product studio. " * 8,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(items)
+            ],
+        )
+    return engine, table
+
+
+def main(items: int = 1_000, runs: int = 200) -> None:
+    engine, table = _seed(items)
+    fields = tuple(CompanyRead.model_fields)
+    columns = [table.c[name] for name in fields]
+    list_adapter = TypeAdapter(List[CompanyRead])
+
+    def orm_rows(session):
+        return session.execute(select(Company)).scalars().all()
+
+    def core_rows(session):
+        return session.execute(select(*columns)).all()
+
+    paths = {
+        "ORM + jsonable_encoder + json.dumps": lambda s: json.dumps(
+            jsonable_encoder([CompanyRead.model_validate(c) for c in orm_rows(s)])
+        ).encode(),
+        "ORM + TypeAdapter (response_model)": lambda s: list_adapter.dump_json(
+            list_adapter.validate_python(orm_rows(s))
+        ),
+        "Core rows + TypeAdapter": lambda s: list_adapter.dump_json(
+            list_adapter.validate_python(core_rows(s))
+        ),
+        "Core rows + orjson": lambda s: dumps([dict(zip(fields, row)) for row in core_rows(s)]),
+    }
+    for name, path in paths.items():
+        samples = []
+        for _ in range(runs):
+            with Session(engine) as session:
+                started = time.perf_counter()
+                path(session)
+                samples.append((time.perf_counter() - started) * 1000)
+        print(f"{name:40} median {statistics.median(samples):6.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,44 @@
+"""
+Load time and lookup latency of the in-process typeahead prefix index over
+synthetic company names. No database is needed.
+
+    python -m scripts.typeahead_benchmark [names] [lookups]
+"""
+import random
+import string
+import sys
+import time
+from uuid import uuid4
+
+from app.services.typeahead import PrefixIndex
+
+SYLLABLES = ["an", "bel", "cor", "dra", "en", "fin", "gro", "hex", "io", "jun", "kor", "lum"]
+SUFFIXES = ["Labs", "Systems", "Technologies", "Solutions", "Studio", "Group", ""]
+
+
+def _fake_name(rng: random.Random) -> str:
+    stem = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return f"{stem.title()} {rng.choice(SUFFIXES)}".strip()
+
+
+def main(size: int = 100_000, lookups: int = 20_000) -> None:
+    rng = random.Random(7)
+    index = PrefixIndex()
+    started = time.perf_counter()
+    index.load((uuid4(), _fake_name(rng)) for _ in range(size))
+    load_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for _ in range(lookups):
+        prefix = _fake_name(rng)[: rng.randint(1, 6)] if rng.random() < 0.9 else rng.choice(string.ascii_lowercase)
+        started = time.perf_counter()
+        index.lookup(prefix, 10)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"{size} names loaded in {load_ms:.0f} ms; lookup p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,59 @@
+"""
+Insert throughput and primary-key index size with UUIDv4 versus UUIDv7 keys.
+
+Each variant fills its own table inside a transaction that is rolled back,
+so nothing is left behind. v4 keys land on random leaf pages of the
+primary key index; v7 keys append to the right-most page, so the index
+should stay denser and later batches should not slow down.
+
+    python -m scripts.uuid_key_benchmark [rows] [batch size]
+"""
+import asyncio
+import sys
+import time
+from uuid import uuid4
+
+from sqlalchemy import text
+
+from app.core.database import async_session_maker
+from app.models.fields import uuid7
+
+
+async def _fill(session, table: str, new_id, rows: int, batch: int) -> tuple[float, float, int, int]:
+    await session.execute(
+        text(f"CREATE TABLE {table} (id uuid PRIMARY KEY, created_at timestamptz DEFAULT now(), payload text)")
+    )
+    insert = text(f"INSERT INTO {table} (id, payload) VALUES (:id, :payload)")
+    started = time.perf_counter()
+    last_batch = 0.0
+    for offset in range(0, rows, batch):
+        batch_started = time.perf_counter()
+        await session.execute(
+            insert, [{"id": new_id(), "payload": "x" * 64} for _ in range(min(batch, rows - offset))]
+        )
+        last_batch = time.perf_counter() - batch_started
+    elapsed = time.perf_counter() - started
+    sizes = (
+        await session.execute(
+            text("SELECT pg_relation_size(:table), pg_relation_size(:index)"),
+            {"table": table, "index": f"{table}_pkey"},
+        )
+    ).one()
+    return elapsed, last_batch, sizes[0], sizes[1]
+
+
+async def main(rows: int = 10_000_000, batch: int = 10_000) -> None:
+    for name, new_id in (("uuid_v4", uuid4), ("uuid_v7", uuid7)):
+        async with async_session_maker() as session:
+            elapsed, last_batch, table_bytes, index_bytes = await _fill(
+                session, f"bench_{name}", new_id, rows, batch
+            )
+            await session.rollback()
+        print(
+            f"{name}: {rows / elapsed:,.0f} rows/s overall, last batch {batch / last_batch:,.0f} rows/s; "
+            f"table {table_bytes / 2**20:,.0f} MiB, pk index {index_bytes / 2**20:,.0f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(*(int(arg) for arg in sys.argv[1:3])))
@@ -0,0 +1,93 @@
+import asyncio
+import os
+
+# Settings are read at import time; give the required ones harmless values
+os.environ.setdefault("PROJECT_NAME", "collaborator-tests")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("DATABASE_URL", "postgresql+asyncpg://postgres@localhost/collaborator")
+
+import pytest
+from sqlalchemy import Column, DefaultClause, MetaData, Table, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core import database
+from app.core.cache import app_cache
+
+
+@pytest.fixture
+def make_engine():
+    """Factory for in-memory SQLite engines with ``public`` attached as a schema."""
+    engines = []
+
+    def make():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def attach_public_schema(connection, _):
+            connection.execute("ATTACH DATABASE ':memory:' AS public")
+            # Write listeners publish with pg_notify; there is no LISTEN side here
+            connection.create_function("pg_notify", 2, lambda channel, payload: None)
+
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def engine(make_engine, monkeypatch):
+    """The primary: RoutingSession binds everything that is not a replica read to it."""
+    primary = make_engine()
+    monkeypatch.setattr(database, "async_engine", primary)
+    return primary
+
+
+@pytest.fixture
+def session_maker(engine):
+    return async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        sync_session_class=database.RoutingSession,
+        expire_on_commit=False,
+    )
+
+
+@pytest.fixture
+def create_tables():
+    """
+    Create bare copies of the models' tables: columns, primary keys and server
+    defaults only, since SQLite has no tsvector columns or trigram indexes.
+    """
+
+    async def create(engine, *models):
+        metadata = MetaData()
+        for model in models:
+            table = model.__table__
+            columns = (
+                Column(
+                    c.name,
+                    c.type,
+                    primary_key=c.primary_key,
+                    server_default=DefaultClause(c.server_default.arg) if c.server_default is not None else None,
+                )
+                for c in table.columns
+                if c.computed is None
+            )
+            Table(table.name, metadata, *columns, schema=table.schema)
+        async with engine.begin() as connection:
+            await connection.run_sync(metadata.create_all)
+
+    return create
+
+
+@pytest.fixture
+def no_app_cache():
+    app_cache.enabled = False
+    yield
+    app_cache.enabled = True
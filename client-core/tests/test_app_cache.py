@@ -0,0 +1,119 @@
+import asyncio
+
+from app.core import cache as cache_module
+from app.core.cache import AppCache, app_cache
+from app.models import Company
+from app.schemas.company import CompanyProfile
+
+
+class _MemoryBackend:
+    """Stands in for RedisBackend: same interface, values kept as the bytes Redis would hold."""
+
+    def __init__(self):
+        self.values: dict[str, bytes] = {}
+
+    async def generations(self, tags):
+        return tuple(0 for _ in tags)
+
+    async def get(self, key, generations):
+        return self.values.get(key)
+
+    async def set(self, key, generations, value, ttl):
+        assert isinstance(value, bytes)
+        self.values[key] = value
+
+    async def invalidate(self, tags):
+        pass
+
+
+def test_concurrent_misses_share_one_load():
+    cache = AppCache(max_entries=10, default_ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load("key", loader) for _ in range(20)))
+
+    assert asyncio.run(run()) == [1] * 20
+    assert (calls, cache.loads, cache.misses, cache.coalesced) == (1, 1, 1, 19)
+
+
+def test_tag_invalidation_drops_entries_and_racing_loads():
+    cache = AppCache(max_entries=10, default_ttl=60)
+
+    async def run():
+        first = await cache.get_or_load("a", lambda: "a1", tags=["companies"])
+        other = await cache.get_or_load("b", lambda: "b1", tags=["projects"])
+        cache.invalidate(["companies"])
+        reloaded = await cache.get_or_load("a", lambda: "a2", tags=["companies"])
+        kept = await cache.get_or_load("b", lambda: "b2", tags=["projects"])
+
+        async def racing_loader():
+            # A write lands while the load is still reading
+            cache.invalidate(["companies"])
+            return "stale"
+
+        raced = await cache.get_or_load("c", racing_loader, tags=["companies"])
+        after_race = await cache.get_or_load("c", lambda: "fresh", tags=["companies"])
+        return first, other, reloaded, kept, raced, after_race
+
+    assert asyncio.run(run()) == ("a1", "b1", "a2", "b1", "stale", "fresh")
+
+
+def test_shared_tier_stores_json_and_decodes_by_schema():
+    backend = _MemoryBackend()
+    profile = CompanyProfile.model_validate(Company(company_name="Acme", company_email="hello@acme.test"))
+
+    async def run():
+        writer = AppCache(max_entries=10, default_ttl=60, backend=backend)
+        await writer.get_or_load("profile", lambda: profile, schema=CompanyProfile | None)
+        await writer.get_or_load("page", lambda: b'{"items": []}', schema=bytes)
+        await writer.get_or_load("local", lambda: object())
+        # A second worker finds both in the shared tier without loading
+        reader = AppCache(max_entries=10, default_ttl=60, backend=backend)
+        shared_profile = await reader.get_or_load("profile", lambda: None, schema=CompanyProfile | None)
+        shared_page = await reader.get_or_load("page", lambda: b"", schema=bytes)
+        return reader, shared_profile, shared_page
+
+    reader, shared_profile, shared_page = asyncio.run(run())
+
+    assert set(backend.values) == {"profile", "page"}
+    assert backend.values["profile"].startswith(b"{")
+    assert shared_profile == profile
+    assert shared_page == b'{"items": []}'
+    assert (reader.backend_hits, reader.loads) == (2, 0)
+
+
+def test_committed_writes_send_one_notify_per_tag(engine, session_maker, create_tables, monkeypatch):
+    published = []
+    monkeypatch.setattr(
+        cache_module.pg_listener, "publish", lambda channel, tags: published.append((channel, tags))
+    )
+
+    async def run():
+        await create_tables(engine, Company)
+        async with session_maker() as session:
+            companies = [Company(company_name=f"c{i}", company_email=f"c{i}@db.test") for i in range(3)]
+            session.add_all(companies)
+            await session.flush()
+            for company in companies:
+                company.country = "IN"
+            await session.commit()
+        async with session_maker() as session:
+            session.add(Company(company_name="rolled back", company_email="rb@db.test"))
+            await session.flush()
+            await session.rollback()
+        return companies
+
+    generation = app_cache._generations.get("companies", 0)
+    companies = asyncio.run(run())
+
+    expected = sorted(["companies", *(f"company:{c.company_id}" for c in companies)])
+    # Six row writes over two flushes, one commit: each tag goes out once, and nothing for the rollback
+    assert published == [(cache_module.CACHE_CHANNEL, expected)]
+    assert app_cache._generations["companies"] == generation + 1
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.models import Collaboration
+from app.services import collaboration_graph as graph_module
+from app.services.collaboration_graph import CollaborationGraphIndex, collaboration_index
+
+
+def test_replayed_changes_are_counted_once():
+    index = CollaborationGraphIndex()
+    a, b, row_id = uuid4(), uuid4(), uuid4()
+    added = (row_id, None, (a, b))
+
+    # Seen once locally after commit and once more over NOTIFY
+    index.apply([added])
+    index.apply([added])
+    assert index.graph.neighbors(a) == [b]
+
+    index.apply([(row_id, (a, b), None)])
+    assert index.graph.neighbors(a) == []
+
+
+def test_changes_committed_during_a_rebuild_are_replayed_once(engine, session_maker, create_tables, monkeypatch):
+    monkeypatch.setattr(graph_module, "async_session_maker", session_maker)
+    index = CollaborationGraphIndex()
+    a, b, c = uuid4(), uuid4(), uuid4()
+    late_row = uuid4()
+
+    async def run():
+        await create_tables(engine, Collaboration)
+        async with session_maker() as session:
+            existing = Collaboration(collaboration_from=a, collaboration_to=b)
+            session.add(existing)
+            await session.commit()
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def write_while_loading(conn, cursor, statement, parameters, context, executemany):
+            if "public.collaborations" in statement:
+                # Already in the snapshot, and arriving again as a change
+                index.apply([(existing.collaboration_id, None, (a, b))])
+                # Committed after the snapshot was taken
+                index.apply([(late_row, None, (a, c))])
+
+        await index.refresh()
+        event.remove(engine.sync_engine, "before_cursor_execute", write_while_loading)
+        index.apply([(existing.collaboration_id, (a, b), None)])
+
+    asyncio.run(run())
+
+    # a-b was removed once and is gone, so it was only ever counted once; a-c survived the swap
+    assert index.graph.neighbors(a) == [c]
+
+
+def test_commit_publishes_its_changes_in_one_batch(engine, session_maker, create_tables, monkeypatch):
+    published = []
+    monkeypatch.setattr(
+        graph_module.pg_listener, "publish", lambda channel, payloads: published.append((channel, payloads))
+    )
+    monkeypatch.setattr(collaboration_index, "graph", graph_module.CollaborationGraph())
+    monkeypatch.setattr(collaboration_index, "_edges", {})
+    hub = uuid4()
+    partners = [uuid4() for _ in range(5)]
+
+    async def run():
+        await create_tables(engine, Collaboration)
+        async with session_maker() as session:
+            session.add_all(Collaboration(collaboration_from=hub, collaboration_to=p) for p in partners)
+            await session.commit()
+
+    asyncio.run(run())
+
+    [(channel, payloads)] = published
+    assert channel == graph_module.COLLABORATION_CHANNEL
+    assert len(payloads) == 1
+    assert len(json.loads(payloads[0])["changes"]) == 5
+    assert sorted(collaboration_index.graph.neighbors(hub)) == sorted(partners)
+
+    # Another worker applies the same batch to its own graph
+    other = CollaborationGraphIndex()
+    monkeypatch.setattr(graph_module, "collaboration_index", other)
+    monkeypatch.setattr(graph_module, "WORKER_ID", "another worker")
+    graph_module._handle_notification(payloads[0])
+    assert sorted(other.graph.neighbors(hub)) == sorted(partners)
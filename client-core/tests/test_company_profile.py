@@ -0,0 +1,63 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import update
+
+from app.core.query_stats import QueryStats, _current_stats, instrument_engine
+from app.models import Blog, Client, Company, Project, Service
+from app.services.companies import get_company_profile
+
+async def _seed(maker):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    async with maker() as session:
+        company = Company(company_name="Acme", company_email="hello@acme.test")
+        session.add(company)
+        await session.flush()
+        session.add(
+            Client(
+                client_name="Owner",
+                client_username="owner",
+                client_email="owner@acme.test",
+                hashed_password="x",
+                company_id=company.company_id,
+            )
+        )
+        for i in range(4):
+            created_at = base + timedelta(days=i)
+            session.add(Service(name=f"s{i}", company_id=company.company_id, created_at=created_at))
+            session.add(Project(title=f"p{i}", company_id=company.company_id, created_at=created_at))
+            session.add(Blog(title=f"b{i}", content="-", company_id=company.company_id, created_at=created_at))
+        await session.commit()
+        # Service.created_at is nullable; such rows must sort last, not break the sort
+        await session.exec(update(Service).where(Service.created_at == base).values(created_at=None))
+        await session.commit()
+        return company.company_id
+
+
+def test_company_profile_runs_four_statements(engine, session_maker, create_tables, no_app_cache):
+    instrument_engine(engine.sync_engine)
+
+    async def run():
+        await create_tables(engine, Company, Client, Service, Project, Blog)
+        company_id = await _seed(session_maker)
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        try:
+            async with session_maker() as session:
+                profile = await get_company_profile(session, company_id, 3, version="test")
+        finally:
+            _current_stats.reset(token)
+        async with session_maker() as session:
+            everything = await get_company_profile(session, company_id, 10, version="test")
+        return profile, everything, stats
+
+    profile, everything, stats = asyncio.run(run())
+
+    assert stats.count == 4
+    assert profile.owner.client_name == "Owner"
+    assert (profile.services_total, profile.projects_total, profile.blogs_total) == (4, 4, 4)
+    assert [s.name for s in profile.services] == ["s3", "s2", "s1"]
+    assert [p.title for p in profile.projects] == ["p3", "p2", "p1"]
+    assert [b.title for b in profile.blogs] == ["b3", "b2", "b1"]
+    assert [s.name for s in everything.services] == ["s3", "s2", "s1", "s0"]
+    assert everything.services[-1].created_at is None
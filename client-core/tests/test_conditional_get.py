@@ -0,0 +1,101 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Request, Response
+from sqlalchemy import update
+
+from app.models import Blog, Client, Company, CompanyVersion, Project, Service, TableVersion
+from app.routers.companies import get_profile, list_companies
+from app.schemas.company import CompanyFilters
+
+MODIFIED_AT = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _request(path: str, **headers: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+        }
+    )
+
+
+async def _seed(maker) -> Company:
+    async with maker() as session:
+        company = Company(company_name="Acme", company_email="hello@acme.test")
+        session.add(company)
+        # Triggers keep these current in Postgres; the shards of one table are summed
+        session.add(TableVersion(table_name="companies", shard=0, version=3, modified_at=MODIFIED_AT))
+        session.add(TableVersion(table_name="companies", shard=5, version=4, modified_at=MODIFIED_AT))
+        session.add(CompanyVersion(company_id=company.company_id, version=1, modified_at=MODIFIED_AT))
+        await session.commit()
+        return company
+
+
+async def _list(maker, **headers):
+    async with maker() as session:
+        return await list_companies(_request("/api/v1/companies", **headers), CompanyFilters(), session)
+
+
+async def _profile(maker, company_id, **headers):
+    """The route's result and the response whose headers it set."""
+    response = Response()
+    async with maker() as session:
+        path = f"/api/v1/companies/{company_id}/profile"
+        return await get_profile(_request(path, **headers), response, company_id, 10, session), response
+
+
+def test_list_answers_304_until_the_table_version_moves(engine, session_maker, create_tables, no_app_cache):
+    async def run():
+        await create_tables(engine, Company, TableVersion, CompanyVersion)
+        await _seed(session_maker)
+        fresh = await _list(session_maker)
+        etag = fresh.headers["etag"]
+        revalidated = await _list(session_maker, if_none_match=f'W/"x", {etag}')
+        since = await _list(session_maker, if_modified_since=fresh.headers["last-modified"])
+        async with session_maker() as session:
+            await session.exec(
+                update(TableVersion).where(TableVersion.shard == 5).values(version=TableVersion.version + 1)
+            )
+            await session.commit()
+        after_write = await _list(session_maker, if_none_match=etag)
+        return fresh, revalidated, since, after_write
+
+    fresh, revalidated, since, after_write = asyncio.run(run())
+
+    assert fresh.status_code == 200
+    assert fresh.headers["last-modified"] == "Sun, 01 Mar 2026 12:00:00 GMT"
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == fresh.headers["etag"]
+    assert since.status_code == 304
+    assert after_write.status_code == 200
+    assert after_write.headers["etag"] != fresh.headers["etag"]
+
+
+def test_profile_last_modified_follows_the_company_version(engine, session_maker, create_tables, no_app_cache):
+    async def run():
+        await create_tables(engine, Company, Client, Service, Project, Blog, TableVersion, CompanyVersion)
+        company = await _seed(session_maker)
+        _, fresh = await _profile(session_maker, company.company_id)
+        last_modified = fresh.headers["last-modified"]
+        since, _ = await _profile(session_maker, company.company_id, if_modified_since=last_modified)
+        # What the triggers do when a child row is deleted: no updated_at is left behind, but the version moves
+        async with session_maker() as session:
+            await session.exec(
+                update(CompanyVersion).values(
+                    version=CompanyVersion.version + 1, modified_at=MODIFIED_AT + timedelta(minutes=5)
+                )
+            )
+            await session.commit()
+        after_delete, _ = await _profile(session_maker, company.company_id, if_modified_since=last_modified)
+        return last_modified, since, after_delete
+
+    last_modified, since, after_delete = asyncio.run(run())
+
+    assert last_modified == "Sun, 01 Mar 2026 12:00:00 GMT"
+    assert since.status_code == 304
+    assert not isinstance(after_delete, Response)
+    assert after_delete.company_name == "Acme"
@@ -0,0 +1,87 @@
+import asyncio
+
+from sqlalchemy import event, text
+
+from app.models import Project
+from app.routers.companies import get_company_facets
+from app.services import facets as facets_module
+from app.services.facets import facet_cache
+
+
+def _countries() -> dict[str, int]:
+    return facet_cache.get("companies", "country")
+
+
+def _statuses() -> dict[str, int]:
+    return facet_cache.get("projects", "status")
+
+
+def test_committed_writes_adjust_the_counts(engine, session_maker, create_tables, monkeypatch):
+    monkeypatch.setattr(facet_cache, "_counts", {("projects", "status"): {"open": 2}})
+
+    async def run():
+        await create_tables(engine, Project)
+        async with session_maker() as session:
+            first = Project(title="first", status="open")
+            second = Project(title="second", status="closed")
+            session.add_all([first, second])
+            await session.commit()
+            after_insert = dict(_statuses())
+
+            first.status = "closed"
+            await session.commit()
+            after_update = dict(_statuses())
+
+            await session.delete(second)
+            session.add(Project(title="gone", status="draft"))
+            await session.flush()
+            await session.rollback()
+            after_rollback = dict(_statuses())
+
+            await session.delete(second)
+            await session.commit()
+        return after_insert, after_update, after_rollback
+
+    after_insert, after_update, after_rollback = asyncio.run(run())
+
+    assert after_insert == {"open": 3, "closed": 1}
+    assert after_update == {"open": 2, "closed": 2}
+    assert after_rollback == after_update
+    assert _statuses() == {"open": 2, "closed": 1}
+
+
+def test_deltas_applied_during_a_refresh_are_replayed(engine, session_maker, monkeypatch):
+    monkeypatch.setattr(facets_module, "async_session_maker", session_maker)
+    monkeypatch.setattr(facet_cache, "_counts", {})
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def postgres_functions(connection, _):
+        # Another worker holds the refresh lock, so this one only reads the view
+        connection.create_function("pg_try_advisory_xact_lock", 1, lambda lock_id: 0)
+
+    async def run():
+        async with engine.begin() as connection:
+            await connection.execute(
+                text("CREATE TABLE public.facet_counts (table_name, column_name, value, value_count)")
+            )
+            await connection.execute(
+                text("INSERT INTO public.facet_counts VALUES ('companies', 'country', 'IN', 5)")
+            )
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def write_while_loading(conn, cursor, statement, parameters, context, executemany):
+            # A commit lands after the lock check, while the view is being read
+            if "FROM public.facet_counts" in statement:
+                facet_cache.apply({("companies", "country", "IN"): 1, ("companies", "country", "DE"): 1})
+
+        await facet_cache.refresh()
+        event.remove(engine.sync_engine, "before_cursor_execute", write_while_loading)
+        return await get_company_facets()
+
+    options = asyncio.run(run())
+
+    assert _countries() == {"IN": 6, "DE": 1}
+    assert facet_cache._pending is None
+    [country] = [option for option in options if option.key == "country"]
+    assert country.options == ["IN", "DE"]
+    assert country.counts == {"IN": 6, "DE": 1}
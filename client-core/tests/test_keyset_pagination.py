@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.models import Company
+from app.schemas.company import CompanyFilters, CompanyRead
+from app.services.utils import decode_cursor, encode_cursor, get_page_json, get_paginated_page
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def _seed(maker):
+    async with maker() as session:
+        for i in range(7):
+            session.add(
+                Company(
+                    # Pairs of rows share a created_at and a name, so the id has to break the tie
+                    company_name=f"company {i // 2}",
+                    company_email=f"c{i}@db.test",
+                    created_at=BASE + timedelta(days=i // 2),
+                )
+            )
+        await session.commit()
+
+
+async def _walk(maker, page, **filters) -> list:
+    items, cursor = [], None
+    async with maker() as session:
+        while True:
+            batch, cursor = await page(session, CompanyFilters(limit=2, cursor=cursor, **filters))
+            items.extend(batch)
+            if cursor is None:
+                return items
+
+
+async def _orm_page(session, filters):
+    page = await get_paginated_page(session, Company, filters)
+    return [(getattr(c, filters.effective_sort_field), c.company_id) for c in page.items], page.next_cursor
+
+
+async def _json_page(session, filters):
+    page = orjson.loads(await get_page_json(session, Company, filters, CompanyRead))
+    field = filters.effective_sort_field
+    return [(item[field], item["company_id"]) for item in page["items"]], page["next_cursor"]
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "company_name"])
+@pytest.mark.parametrize("sort_direction", ["asc", "desc"])
+def test_cursor_walk_visits_every_row_once_in_order(engine, session_maker, create_tables, sort_by, sort_direction):
+    async def run():
+        await create_tables(engine, Company)
+        await _seed(session_maker)
+        filters = {"sort_by": sort_by, "sort_direction": sort_direction}
+        return await _walk(session_maker, _orm_page, **filters), await _walk(session_maker, _json_page, **filters)
+
+    orm_keys, json_keys = asyncio.run(run())
+
+    expected = sorted(orm_keys, reverse=sort_direction == "desc")
+    assert len(orm_keys) == 7
+    assert orm_keys == expected
+    # The Core/orjson path pages through the same rows in the same order
+    assert [str(pk) for _, pk in orm_keys] == [pk for _, pk in json_keys]
+
+
+def test_cursor_round_trips_its_sort_value_and_key():
+    company_id = Company(company_name="x", company_email="x@db.test").company_id
+    created_at = BASE + timedelta(hours=5, microseconds=7)
+
+    cursor = encode_cursor("created_at", created_at, company_id)
+
+    assert decode_cursor(cursor, "created_at", Company) == (created_at, company_id)
+    assert decode_cursor(encode_cursor("company_name", "Acme", company_id), "company_name", Company) == (
+        "Acme",
+        company_id,
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        # A NULL sort value cannot come from a NOT NULL column
+        encode_cursor("created_at", None, "00000000-0000-0000-0000-000000000000"),
+        # Issued for another sort
+        encode_cursor("company_name", "Acme", "00000000-0000-0000-0000-000000000000"),
+        "not a cursor",
+    ],
+)
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, "created_at", Company)
+    assert error.value.status_code == 400
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.core.security import hash_otp, verify_otp
+from app.services import otp_store as otp_store_module
+from app.services.otp_store import InMemoryOTPStore, OTPVerifyResult
+
+
+def test_otp_digest_is_an_hmac_bound_to_the_subject():
+    digest = hash_otp("123456", "a@example.com")
+
+    assert len(digest) == 64 and "123456" not in digest
+    assert verify_otp("123456", "a@example.com", digest)
+    assert not verify_otp("123456", "b@example.com", digest)
+    assert not verify_otp("654321", "a@example.com", digest)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_memory_store_expires_codes_and_uses_them_once(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(otp_store_module, "time", clock)
+    store = InMemoryOTPStore(ttl_seconds=60, max_attempts=3)
+
+    async def run():
+        await store.issue("a@example.com", "111111")
+        await store.issue("b@example.com", "222222")
+        clock.now += 30
+        used = await store.verify("a@example.com", "111111")
+        reused = await store.verify("a@example.com", "111111")
+        clock.now += 31
+        expired = await store.verify("b@example.com", "222222")
+        return used, reused, expired
+
+    assert asyncio.run(run()) == (OTPVerifyResult.VALID, OTPVerifyResult.EXPIRED, OTPVerifyResult.EXPIRED)
+    # The wheel dropped the expired entry instead of keeping it around
+    assert store._entries == {}
+
+
+def test_memory_store_locks_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(otp_store_module, "time", _Clock())
+    store = InMemoryOTPStore(ttl_seconds=60, max_attempts=2)
+
+    async def run():
+        await store.issue("a@example.com", "111111")
+        return [await store.verify("a@example.com", otp) for otp in ("000000", "000000", "111111")]
+
+    assert asyncio.run(run()) == [OTPVerifyResult.INVALID, OTPVerifyResult.LOCKED, OTPVerifyResult.EXPIRED]
+
+
+def test_memory_store_refuses_several_workers(monkeypatch):
+    monkeypatch.setattr(otp_store_module.settings, "OTP_STORE_BACKEND", "memory")
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+
+    with pytest.raises(RuntimeError):
+        otp_store_module.create_otp_store()
@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+from sqlalchemy import insert
+from sqlmodel import select
+
+from app.core.database import ReplicaRouter
+from app.models import Company
+
+
+async def _seed(engine, name: str) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(insert(Company).values(company_name=name, company_email=f"{name}@db.test"))
+
+
+async def _names(session) -> list[str]:
+    return list((await session.exec(select(Company.company_name).order_by(Company.company_name))).all())
+
+
+def test_reads_go_to_the_replica_and_writes_stay_on_the_primary(engine, make_engine, session_maker, create_tables):
+    replica = make_engine()
+
+    async def run():
+        for db, name in ((engine, "primary"), (replica, "replica")):
+            await create_tables(db, Company)
+            await _seed(db, name)
+
+        async with session_maker() as session:
+            session.sync_session.info["replica"] = replica
+            read = await _names(session)
+            # A write moves the session to the primary, so it reads its own row back
+            session.add(Company(company_name="written", company_email="written@db.test"))
+            await session.flush()
+            after_write = await _names(session)
+            await session.commit()
+            after_commit = await _names(session)
+
+        async with session_maker() as session:
+            without_replica = await _names(session)
+        return read, after_write, after_commit, without_replica
+
+    read, after_write, after_commit, without_replica = asyncio.run(run())
+
+    assert read == ["replica"]
+    assert after_write == ["primary", "written"]
+    assert after_commit == ["primary", "written"]
+    assert without_replica == ["primary", "written"]
+
+
+def test_select_for_update_goes_to_the_primary(engine, make_engine, session_maker, create_tables):
+    replica = make_engine()
+
+    async def run():
+        for db, name in ((engine, "primary"), (replica, "replica")):
+            await create_tables(db, Company)
+            await _seed(db, name)
+        async with session_maker() as session:
+            session.sync_session.info["replica"] = replica
+            # SQLite drops FOR UPDATE when compiling, but routing still sees it
+            locked = await session.exec(select(Company.company_name).with_for_update())
+            return list(locked.all())
+
+    assert asyncio.run(run()) == ["primary"]
+
+
+def test_router_keeps_recent_writers_on_the_primary(make_engine):
+    replicas = [make_engine(), make_engine()]
+    router = ReplicaRouter(replicas, strategy="round_robin", window_seconds=5)
+
+    assert [router.choose("reader") for _ in range(3)] == [replicas[0], replicas[1], replicas[0]]
+
+    router.record_write("writer")
+    assert router.choose("writer") is None
+    assert router.choose("reader") is not None
+    assert router.choose(None) is not None
+
+    # Once the window has passed the writer reads from replicas again
+    router._recent_writers["writer"] = time.monotonic() - 1
+    assert router.choose("writer") in replicas
+
+
+def test_router_without_replicas_always_uses_the_primary():
+    router = ReplicaRouter([], strategy="round_robin", window_seconds=5)
+    assert router.choose("reader") is None
@@ -0,0 +1,47 @@
+import asyncio
+
+from sqlmodel import select
+
+from app.models import Client, ClientSession
+from app.services.session_store import create_session, revoked_sessions, rotate_session
+
+
+async def _login(maker):
+    async with maker() as session:
+        client = Client(
+            client_name="Owner",
+            client_username="owner",
+            client_email="owner@acme.test",
+            hashed_password="x",
+        )
+        session.add(client)
+        await session.commit()
+        await create_session(session, client)
+        return (await session.exec(select(ClientSession))).one()
+
+
+def test_refresh_rotates_and_reuse_revokes_the_session(engine, session_maker, create_tables):
+    async def run():
+        await create_tables(engine, Client, ClientSession)
+        row = await _login(session_maker)
+        first = {"sid": str(row.session_id), "jti": str(row.refresh_jti)}
+
+        async with session_maker() as session:
+            rotated = await rotate_session(session, first)
+            current = await session.get(ClientSession, row.session_id)
+            second = {"sid": str(row.session_id), "jti": str(current.refresh_jti)}
+            # The first refresh token was already spent: presenting it again looks like theft
+            replayed = await rotate_session(session, first)
+            await session.refresh(current)
+            after_revoke = await rotate_session(session, second)
+        return row, rotated, second, replayed, current, after_revoke
+
+    row, rotated, second, replayed, current, after_revoke = asyncio.run(run())
+
+    assert set(rotated) == {"access_token", "refresh_token", "token_type"}
+    assert second["jti"] != str(row.refresh_jti)
+    assert replayed is None
+    assert current.revoked_at is not None
+    assert revoked_sessions.is_revoked(str(row.session_id))
+    # Revocation takes the whole session down, including the newest token
+    assert after_revoke is None
@@ -0,0 +1,57 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.models import Company
+from app.services import typeahead as typeahead_module
+from app.services.typeahead import PrefixIndex, company_typeahead
+
+
+def _names(index: PrefixIndex, prefix: str) -> list[str]:
+    return [name for _, name in index.lookup(prefix, 10)]
+
+
+def test_prefix_lookup_folds_case_and_accents():
+    index = PrefixIndex()
+    index.load([(uuid4(), "Émile Labs"), (uuid4(), "emerald"), (uuid4(), "Acme")])
+    entity_id = uuid4()
+    index.apply(entity_id, "Embers")
+    index.apply(entity_id, "Cinders")
+
+    assert _names(index, "EM") == ["emerald", "Émile Labs"]
+    assert _names(index, "ci") == ["Cinders"]
+    index.apply(entity_id, None)
+    assert _names(index, "ci") == []
+
+
+def test_writes_committed_during_a_refresh_are_replayed(engine, session_maker, create_tables, monkeypatch):
+    monkeypatch.setattr(typeahead_module, "async_session_maker", session_maker)
+    monkeypatch.setattr(company_typeahead, "index", PrefixIndex())
+    written_id = uuid4()
+
+    async def run():
+        await create_tables(engine, Company)
+        async with session_maker() as session:
+            acme = Company(company_name="Acme", company_email="hello@acme.test")
+            session.add(acme)
+            await session.commit()
+            # Committed ORM writes reach the index without waiting for a refresh
+            committed = _names(company_typeahead.index, "ac")
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def write_while_loading(conn, cursor, statement, parameters, context, executemany):
+            # Another request commits after the reload has taken its snapshot
+            if "public.companies" in statement:
+                company_typeahead.apply(written_id, "Acorn")
+                company_typeahead.apply(acme.company_id, None)
+
+        await company_typeahead.refresh()
+        event.remove(engine.sync_engine, "before_cursor_execute", write_while_loading)
+        return committed
+
+    committed = asyncio.run(run())
+
+    assert committed == ["Acme"]
+    assert _names(company_typeahead.index, "ac") == ["Acorn"]
+    assert company_typeahead._pending is None